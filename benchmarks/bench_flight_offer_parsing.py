@@ -0,0 +1,92 @@
+"""
+Microbenchmark for FlightOffer parsing and derived-property access.
+
+Builds a large Amadeus-shaped flight-offers payload and reports, per offer, the
+parse time (model_validate) and the time to read every derived property the way
+the old uncached properties did (recomputed on each read, linear fare-detail scan)
+against the cached properties (first read computes, later reads are lookups).
+
+Usage:
+    python -m benchmarks.bench_flight_offer_parsing [--offers 250] [--segments 2] [--reads 3] [--repeat 5]
+"""
+import argparse
+import time
+
+from benchmarks.flight_offer_payload import make_payload
+from src.models.amadeus_models import FlightOffer
+
+DERIVED = ("origin", "destination", "departure_date", "arrival_date", "duration", "segments_info")
+
+
+def _legacy_segments_info(offer: FlightOffer):
+    # segments_info as it was before the index: a linear scan of fareDetailsBySegment per segment
+    info = []
+    pricing = offer.travelerPricings[0] if offer.travelerPricings else None
+    for segment in offer.itineraries[0].segments:
+        details = {
+            "departure": segment.departure.iataCode,
+            "arrival": segment.arrival.iataCode,
+            "carrierCode": segment.carrierCode,
+            "number": segment.number,
+            "operating_carrier_code": segment.operating_carrier_code,
+            "duration_segment": segment.duration,
+        }
+        fare = next((d for d in pricing.fareDetailsBySegment if d.segmentId == segment.id), None) if pricing else None
+        details["cabin"] = fare.cabin if fare else "N/A"
+        details["includedCheckedBags"] = fare.includedCheckedBags.quantity if fare and fare.includedCheckedBags else 0
+        details["includedCabinBags"] = fare.includedCabinBags.quantity if fare and fare.includedCabinBags else 0
+        details["amenities"] = [{"description": a.description, "isChargeable": a.isChargeable} for a in fare.amenities] if fare else []
+        info.append(details)
+    return info
+
+
+def _read_uncached(offers, reads):
+    for offer in offers:
+        for _ in range(reads):
+            for name in DERIVED[:-1]:
+                getattr(FlightOffer, name).func(offer)
+            _legacy_segments_info(offer)
+
+
+def _read_cached(offers, reads):
+    for offer in offers:
+        for _ in range(reads):
+            for name in DERIVED:
+                getattr(offer, name)
+
+
+def _best(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--offers", type=int, default=250)
+    parser.add_argument("--segments", type=int, default=2, help="Segments per leg of each round trip")
+    parser.add_argument("--reads", type=int, default=3, help="Times each derived property is read per offer")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_payload(args.offers, args.segments)
+
+    parse_time, offers = _best(lambda: [FlightOffer.model_validate(o) for o in payload], args.repeat)
+    assert all(_legacy_segments_info(o) == o.segments_info for o in offers)
+    uncached_time, _ = _best(lambda: _read_uncached(offers, args.reads), args.repeat)
+    # Fresh instances each round so the first (computing) read is included
+    fresh = iter([[FlightOffer.model_validate(o) for o in payload] for _ in range(args.repeat)])
+    cached_time, _ = _best(lambda: _read_cached(next(fresh), args.reads), args.repeat)
+
+    per_offer = lambda seconds: seconds / args.offers * 1e6
+    print(f"offers={args.offers} segments/leg={args.segments} reads={args.reads}")
+    print(f"parse   model_validate: {per_offer(parse_time):8.1f} us/offer")
+    print(f"access  uncached:       {per_offer(uncached_time):8.1f} us/offer")
+    print(f"access  cached:         {per_offer(cached_time):8.1f} us/offer  ({uncached_time / cached_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cold-start import time and memory of the app's entry points.
+
+Imports each module in a fresh interpreter with `python -X importtime`, several times, and
+reports the median total import time, the interpreter's peak resident memory after the
+import, and the slowest modules it pulled in (by cumulative time). With --budget-ms, exits non-zero if any module's median exceeds the budget, so a
+heavy import creeping back into a tool module shows up in CI.
+
+Usage:
+    python -m benchmarks.bench_import_time [--modules src.main src.tools.maps_tools ...] [--repeat 5] [--top 8] [--budget-ms 1500]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "src.config.clients",
+    "src.tools.amadeus_tools",
+    "src.tools.arithmetic_tools",
+    "src.tools.context_tools",
+    "src.tools.exchange_rate_tools",
+    "src.tools.maps_tools",
+    "src.tools.serpapi_tools",
+    "src.tools.util_tools",
+    "src.tools.weather_tools",
+    "src.main",
+]
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def import_profile(module: str) -> tuple:
+    """Returns (peak RSS in MB, [(cumulative_us, depth, name)]) for one cold import of module."""
+    code = f"import resource, {module}; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            rows.append((int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+    # ru_maxrss is in kilobytes on Linux
+    return int(result.stdout.split()[-1]) / 1024, rows
+
+
+def measure(module: str, repeat: int) -> tuple:
+    """Median total import time (ms) and peak RSS (MB) over repeat runs, and the profile of the last run."""
+    totals, memory, rows = [], [], []
+    for _ in range(repeat):
+        rss_mb, rows = import_profile(module)
+        # Top-level entries (depth 0) are everything the import statement loaded
+        totals.append(sum(cumulative for cumulative, depth, _ in rows if depth == 0) / 1000)
+        memory.append(rss_mb)
+    return statistics.median(totals), statistics.median(memory), rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest third-party imports to list per module")
+    parser.add_argument("--budget-ms", type=float, help="Fail if any module's median import time exceeds this")
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        median_ms, rss_mb, rows = measure(module, args.repeat)
+        print(f"{module:<32} {median_ms:8.1f} ms {rss_mb:8.1f} MB")
+        slowest = sorted((row for row in rows if row[1] <= 1 and not row[2].startswith("src")), reverse=True)[:args.top]
+        for cumulative, _, name in slowest:
+            print(f"    {cumulative / 1000:8.1f} ms  {name}")
+        if args.budget_ms is not None and median_ms > args.budget_ms:
+            over_budget.append(module)
+
+    if over_budget:
+        print(f"Over the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
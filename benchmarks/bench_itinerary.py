@@ -0,0 +1,54 @@
+"""
+Benchmark for the itinerary scheduler.
+
+Plans a synthetic trip (attractions and restaurants scattered over a city, travel time
+proportional to straight-line distance) and reports the planning time, the travel minutes
+and how many attractions fit, for a few time budgets.
+
+Usage:
+    python -m benchmarks.bench_itinerary [--attractions 60] [--restaurants 35] [--days 15]
+"""
+import argparse
+import random
+import time
+
+from src.agents.itinerary_scheduler import plan_days
+from src.models.place_models import ItineraryPlace
+
+
+def synthetic_trip(num_attractions: int, num_restaurants: int, seed: int = 7):
+    rng = random.Random(seed)
+    points = [(rng.random() * 10, rng.random() * 10) for _ in range(num_attractions + num_restaurants + 1)]
+    # Transit-like: 4 minutes per km plus 5 minutes of waiting, the first point being the hotel
+    matrix = [[0 if a == b else (((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5 * 4 + 5) * 60 for b in points] for a in points]
+    places = [
+        ItineraryPlace(name=f"Attraction {i}", location=f"{x:.3f},{y:.3f}", visit_hours=rng.choice([1, 1.5, 2, 3]),
+                       opens=rng.choice([None, "09:00", "10:00"]), closes=rng.choice([None, "17:00", "21:00"]))
+        for i, (x, y) in enumerate(points[1:num_attractions + 1])
+    ]
+    places += [
+        ItineraryPlace(name=f"Restaurant {i}", location=f"{x:.3f},{y:.3f}", kind="restaurant", opens="11:00", closes="23:00")
+        for i, (x, y) in enumerate(points[num_attractions + 1:])
+    ]
+    return places, matrix
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--attractions", type=int, default=60)
+    parser.add_argument("--restaurants", type=int, default=35)
+    parser.add_argument("--days", type=int, default=15)
+    args = parser.parse_args()
+
+    places, matrix = synthetic_trip(args.attractions, args.restaurants)
+    for budget in (0.0, 0.1, 0.5):
+        start = time.perf_counter()
+        plan = plan_days(places, matrix, args.days, has_start=True, time_budget=budget)
+        elapsed = time.perf_counter() - start
+        travel = sum(day["travel_minutes"] for day in plan["days"])
+        scheduled = args.attractions - len(plan["unscheduled"])
+        print(f"budget {budget:.1f}s: {elapsed * 1000:7.1f} ms, {travel:7.0f} travel minutes, {scheduled}/{args.attractions} attractions")
+
+
+if __name__ == "__main__":
+    main()
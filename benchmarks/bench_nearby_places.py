@@ -0,0 +1,81 @@
+"""
+Benchmark for get_nearby_places place-details enrichment.
+
+Runs get_nearby_places against a stubbed Google Maps client that sleeps for a
+fixed latency on every request, once with a single worker (the old sequential
+behaviour) and once with the configured worker pool.
+
+Usage:
+    python -m benchmarks.bench_nearby_places [--places 20] [--latency 0.15] [--workers 8]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import settings
+from src.tools import maps_tools
+from src.utils.response_cache import ResponseCache
+
+
+class StubGmapsClient:
+    """Mimics the googlemaps client methods used by get_nearby_places, with injected latency."""
+
+    def __init__(self, num_places: int, latency: float):
+        self.num_places = num_places
+        self.latency = latency
+
+    def places_nearby(self, **kwargs):
+        time.sleep(self.latency)
+        return {
+            "results": [
+                {
+                    "place_id": f"bench-{i}",
+                    "name": f"Place {i}",
+                    "geometry": {"location": {"lat": 35.0 + i / 1000, "lng": 139.0 + i / 1000}},
+                    "rating": 4.0 + (i % 10) / 10,
+                    "price_level": i % 4,
+                }
+                for i in range(self.num_places)
+            ]
+        }
+
+    def place(self, place_id):
+        time.sleep(self.latency)
+        return {"result": {"name": place_id, "formatted_address": f"{place_id} street"}}
+
+
+def run(num_places: int, latency: float, workers: int) -> float:
+    stub = StubGmapsClient(num_places, latency)
+    maps_tools.get_gmaps_client = lambda: stub
+    # Measure the network fan-out, not the response cache
+    maps_tools.RESPONSE_CACHE = ResponseCache(":memory:", bypass=True)
+    maps_tools._GMAPS_EXECUTOR = ThreadPoolExecutor(max_workers=workers)
+    settings.VISITED_PLACES.clear()
+
+    start = time.perf_counter()
+    places = maps_tools.get_nearby_places.invoke({"lat": 35.0, "long": 139.0, "place_type": "museum"})
+    elapsed = time.perf_counter() - start
+
+    maps_tools._GMAPS_EXECUTOR.shutdown()
+    assert len(places) == num_places and all(p["place_details"] for p in places)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--places", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.15, help="Injected latency per Google call, in seconds")
+    parser.add_argument("--workers", type=int, default=settings.GMAPS_MAX_WORKERS)
+    args = parser.parse_args()
+
+    sequential = run(args.places, args.latency, workers=1)
+    concurrent = run(args.places, args.latency, workers=args.workers)
+
+    print(f"places={args.places} latency={args.latency * 1000:.0f}ms workers={args.workers}")
+    print(f"sequential: {sequential:.3f}s")
+    print(f"concurrent: {concurrent:.3f}s")
+    print(f"speedup:    {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
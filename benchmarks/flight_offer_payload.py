@@ -0,0 +1,71 @@
+"""Builds realistic Amadeus flight-offers payloads for benchmarks and tests."""
+from typing import Any, Dict, List
+
+_AIRPORTS = ["DFW", "ORD", "LAX", "SFO", "SEA", "NRT", "HND", "ICN", "PEK", "SIN"]
+_CARRIERS = ["JL", "NH", "AA", "UA", "DL", "KE", "OZ", "SQ"]
+
+
+def _segment(segment_id: str, origin: str, destination: str, day: int, hour: int, carrier: str) -> Dict[str, Any]:
+    return {
+        "departure": {"iataCode": origin, "terminal": "1", "at": f"2025-07-{day:02d}T{hour:02d}:15:00"},
+        "arrival": {"iataCode": destination, "terminal": "2", "at": f"2025-07-{day:02d}T{(hour + 6) % 24:02d}:40:00"},
+        "carrierCode": carrier,
+        "number": str(100 + int(segment_id)),
+        "aircraft": {"code": "789"},
+        "operating": {"carrierCode": carrier},
+        "duration": "PT6H25M",
+        "id": segment_id,
+        "numberOfStops": 0,
+        "blacklistedInEU": False,
+    }
+
+
+def _fare_details(segment_id: str) -> Dict[str, Any]:
+    return {
+        "segmentId": segment_id,
+        "cabin": "ECONOMY",
+        "fareBasis": "KLX7C1",
+        "class": "K",
+        "includedCheckedBags": {"quantity": 2},
+        "includedCabinBags": {"quantity": 1},
+        "amenities": [
+            {"description": "PRE RESERVED SEAT ASSIGNMENT", "isChargeable": False, "amenityType": "PRE_RESERVED_SEAT"},
+            {"description": "MEAL SERVICES", "isChargeable": False, "amenityType": "MEAL"},
+            {"description": "CHANGEABLE TICKET", "isChargeable": True, "amenityType": "BRANDED_FARES"},
+        ],
+    }
+
+
+def make_offer(index: int, segments_per_leg: int = 2, travelers: int = 2) -> Dict[str, Any]:
+    """One round-trip offer with segments_per_leg segments each way, shaped like an Amadeus v2 offer."""
+    carrier = _CARRIERS[index % len(_CARRIERS)]
+    itineraries, segment_ids = [], []
+    for leg, day in enumerate((1, 15)):
+        stops = [_AIRPORTS[(index + leg + n) % len(_AIRPORTS)] for n in range(segments_per_leg + 1)]
+        segments = []
+        for n in range(segments_per_leg):
+            segment_id = str(leg * segments_per_leg + n + 1)
+            segment_ids.append(segment_id)
+            segments.append(_segment(segment_id, stops[n], stops[n + 1], day, (6 + 7 * n + index) % 24, carrier))
+        itineraries.append({"duration": f"PT{6 * segments_per_leg + index % 5}H{index % 60}M", "segments": segments})
+    # Amadeus does not guarantee fare details in segment order
+    fare_details = [_fare_details(segment_id) for segment_id in reversed(segment_ids)]
+    return {
+        "type": "flight-offer",
+        "id": str(index + 1),
+        "source": "GDS",
+        "lastTicketingDate": "2025-06-20",
+        "numberOfBookableSeats": 9,
+        "itineraries": itineraries,
+        "price": {"currency": "USD", "total": f"{900 + index * 7.5:.2f}", "base": "700.00", "grandTotal": f"{900 + index * 7.5:.2f}"},
+        "validatingAirlineCodes": [carrier],
+        "travelerPricings": [
+            {"travelerId": str(t + 1), "fareOption": "STANDARD", "travelerType": "ADULT", "fareDetailsBySegment": fare_details}
+            for t in range(travelers)
+        ],
+    }
+
+
+def make_payload(num_offers: int = 250, segments_per_leg: int = 2) -> List[Dict[str, Any]]:
+    """A flight-offers `data` list; 250 is the most Amadeus returns for one search."""
+    return [make_offer(i, segments_per_leg) for i in range(num_offers)]
@@ -0,0 +1,130 @@
+"""
+Load test for the HTTP serving mode (src/server.py).
+
+Runs many concurrent sessions against the app, each sending a number of turns one after
+another. The LLM and Google Maps are stubbed with fixed latencies: every turn is one model
+step that calls get_nearby_places, the tool call itself, then a second model step with the
+answer - so the numbers measure the server, the agent graph and the checkpointer, not the
+providers. By default the app is served in-process (ASGI); pass --url to load a running server.
+
+Usage:
+    python -m benchmarks.load_test_server [--sessions 50] [--turns 3] [--llm-latency 0.2] [--tool-latency 0.1] [--url http://127.0.0.1:8000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import tempfile
+import time
+
+_SCRATCH = tempfile.mkdtemp()
+os.environ.setdefault("CHECKPOINT_DB_PATH", os.path.join(_SCRATCH, "checkpoints.sqlite3"))
+os.environ.setdefault("TRANSCRIPT_DIR", os.path.join(_SCRATCH, "transcripts"))
+
+import httpx
+import numpy as np
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from src import main
+from src.server import create_app
+from src.tools import maps_tools
+from src.utils.response_cache import ResponseCache
+from benchmarks.bench_nearby_places import StubGmapsClient
+
+
+class StubChatModel(BaseChatModel):
+    """Asks for nearby places once per turn, then answers; every call waits `latency` seconds."""
+
+    latency: float = 0.2
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _reply(self, messages) -> AIMessage:
+        last_human = max(i for i, m in enumerate(messages) if isinstance(m, HumanMessage))
+        results = [m for m in messages[last_human:] if isinstance(m, ToolMessage)]
+        if results:
+            return AIMessage(content=f"Here are some ideas based on {len(results[-1].content)} characters of results.")
+        return AIMessage(content="", tool_calls=[{
+            "id": f"call-{time.perf_counter_ns()}",
+            "name": "get_nearby_places",
+            "args": {"lat": 35.0, "long": 139.0, "place_type": "museum"},
+        }])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+
+async def run_session(client: httpx.AsyncClient, turns: int, latencies: list, by_turn: list, errors: list) -> None:
+    session_id = (await client.post("/sessions")).json()["session_id"]
+    for turn in range(turns):
+        start = time.perf_counter()
+        async with client.stream("POST", f"/sessions/{session_id}/messages", json={"content": f"Museums to visit, take {turn}"}) as response:
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: ") and event == "error":
+                    errors.append(json.loads(line[len("data: "):])["detail"])
+        latencies.append(time.perf_counter() - start)
+        by_turn[turn].append(latencies[-1])
+    await client.delete(f"/sessions/{session_id}")
+
+
+async def run(args) -> None:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=None)
+    else:
+        llm = StubChatModel(latency=args.llm_latency)
+        main.SUMMARIZER.llm = llm
+        maps_tools.get_gmaps_client = lambda: StubGmapsClient(args.places, args.tool_latency)
+        # Measure the serving path, not the response cache
+        maps_tools.RESPONSE_CACHE = ResponseCache(":memory:", bypass=True)
+        app = create_app(agent=main.build_agent(llm=llm), max_sessions=args.sessions)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=None)
+
+    latencies, by_turn, errors = [], [[] for _ in range(args.turns)], []
+    async with client:
+        start = time.perf_counter()
+        await asyncio.gather(*(run_session(client, args.turns, latencies, by_turn, errors) for _ in range(args.sessions)))
+        elapsed = time.perf_counter() - start
+
+    turn_ms = np.array(latencies) * 1000
+    print(f"sessions={args.sessions} turns/session={args.turns} llm_latency={args.llm_latency * 1000:.0f}ms "
+          f"tool_latency={args.tool_latency * 1000:.0f}ms target={args.url or 'in-process'}")
+    print(f"turns:      {len(latencies)} in {elapsed:.2f}s ({len(errors)} errors)")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency:    p50 {np.percentile(turn_ms, 50):.0f}ms  p99 {np.percentile(turn_ms, 99):.0f}ms  max {turn_ms.max():.0f}ms")
+    # Later turns carry a longer history: their latency shows what each turn's state costs
+    print("by turn:    " + "  ".join(f"{i + 1}: p50 {np.percentile(np.array(t) * 1000, 50):.0f}ms" for i, t in enumerate(by_turn) if t))
+    if not args.url:
+        print(f"memory:     peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    if errors:
+        print(f"first error: {errors[0]}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50, help="Concurrent sessions")
+    parser.add_argument("--turns", type=int, default=3, help="Turns per session, sent one after another")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Injected latency per model call, in seconds")
+    parser.add_argument("--tool-latency", type=float, default=0.1, help="Injected latency per Google call, in seconds")
+    parser.add_argument("--places", type=int, default=5, help="Places returned by the stub nearby search")
+    parser.add_argument("--url", help="Base URL of a running server (python -m src.server) instead of the in-process app")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,166 @@
+import json
+from typing import Any, Callable, Dict, List, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.config.settings import CHARS_PER_TOKEN
+from src.utils.tokens import content_text, estimate_message_tokens, estimate_text_tokens
+from src.utils.ttl_cache import TTLCache
+
+# Digest previews keep scalar fields and cut long strings to this many characters
+DIGEST_STRING_CHARS = 80
+
+# Drop order once digests are not enough: old tool-call exchanges go before old conversation turns
+DROP_TOOL_EXCHANGE, DROP_TURN = 0, 1
+
+
+def _preview(value: Any) -> Any:
+    if isinstance(value, str):
+        return value if len(value) <= DIGEST_STRING_CHARS else value[:DIGEST_STRING_CHARS] + "..."
+    if isinstance(value, list):
+        return f"<list of {len(value)}>"
+    if isinstance(value, dict):
+        return {key: _preview(item) for key, item in value.items() if not isinstance(item, (dict, list))} or f"<object with {len(value)} keys>"
+    return value
+
+
+def digest_text(content: str, max_tokens: int) -> str:
+    """
+    Shrinks a tool result to about max_tokens. JSON lists keep their length and a preview of
+    as many items as fit (scalar fields only); JSON objects keep their scalar fields; anything
+    else keeps its beginning.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    try:
+        data = json.loads(content)
+    except ValueError:
+        data = None
+
+    if isinstance(data, list):
+        lines, used = [f"{len(data)} items:"], 0
+        for position, item in enumerate(data):
+            line = json.dumps(_preview(item), ensure_ascii=False, default=str)
+            if used + len(line) > max_chars:
+                lines.append(f"... and {len(data) - position} more")
+                break
+            lines.append(line)
+            used += len(line)
+        return "\n".join(lines)
+    if isinstance(data, dict):
+        preview = json.dumps({key: _preview(item) for key, item in data.items()}, ensure_ascii=False, default=str)
+        return preview if len(preview) <= max_chars else preview[:max_chars] + "..."
+    return content[:max_chars] + "..."
+
+
+class ContextAssembler:
+    """
+    Bounds what the agent sends to the model on every step, for use as create_react_agent's
+    pre_model_hook (only the model input changes; the checkpointed history keeps everything).
+
+    1. Tool results above tool_output_max_tokens are stored in `store` and replaced by a digest
+       with a handle the model can pass to fetch_tool_output.
+    2. If the context is still over token_budget, every other tool result before the current
+       turn is digested too.
+    3. If it is still over budget, older messages are dropped: tool-call exchanges (the call and
+       its results, kept together) before plain turns, oldest first.
+
+    System messages (the prompt and the running summary) and the current turn - everything from
+    the last user message on - are never dropped. Messages keep the order they are given in.
+    """
+
+    def __init__(self, store: TTLCache, store_output: Callable[[str], str], token_budget: int, tool_output_max_tokens: int,
+                 digest_tokens: int, exempt_tools: Sequence[str] = ("fetch_tool_output",)):
+        self.store = store
+        self.store_output = store_output
+        self.token_budget = token_budget
+        self.tool_output_max_tokens = tool_output_max_tokens
+        self.digest_tokens = digest_tokens
+        self.exempt_tools = set(exempt_tools)
+        # Digests by tool_call_id, so a result is digested once rather than on every agent step
+        self._digests = TTLCache(max_size=store.max_size, ttl=store.ttl)
+        self.last_report: Dict[str, int] = {}
+
+    def digest(self, message: ToolMessage) -> ToolMessage:
+        hit, digested = self._digests.get(message.tool_call_id)
+        if hit and self.store.get(digested.artifact)[0]:
+            return digested
+        content = content_text(message.content)
+        handle = self.store_output(content)
+        header = (f"[Digest of {message.name or 'tool'} output ({estimate_text_tokens(content)} tokens). "
+                  f"Full result: fetch_tool_output(handle=\"{handle}\")]\n")
+        digested = ToolMessage(
+            content=header + digest_text(content, self.digest_tokens),
+            tool_call_id=message.tool_call_id,
+            name=message.name,
+            id=message.id,
+            status=message.status,
+            artifact=handle,
+        )
+        self._digests.set(message.tool_call_id, digested)
+        return digested
+
+    def _digestible(self, message: BaseMessage, tokens: int, limit: int) -> bool:
+        return isinstance(message, ToolMessage) and message.name not in self.exempt_tools and tokens > limit
+
+    def assemble(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        messages = list(messages)
+        tokens = [estimate_message_tokens(m) for m in messages]
+        input_tokens = sum(tokens)
+        current_turn = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=0)
+        digested = 0
+
+        def shrink(i):
+            nonlocal digested
+            messages[i] = self.digest(messages[i])
+            tokens[i] = estimate_message_tokens(messages[i])
+            digested += 1
+
+        for i, message in enumerate(messages):
+            if self._digestible(message, tokens[i], self.tool_output_max_tokens):
+                shrink(i)
+        if sum(tokens) > self.token_budget:
+            for i in range(current_turn):
+                # Only where the digest is a real saving
+                if self._digestible(messages[i], tokens[i], 2 * self.digest_tokens):
+                    shrink(i)
+
+        keep = [True] * len(messages)
+        total = sum(tokens)
+        if total > self.token_budget:
+            for _, _, unit in sorted(self._drop_units(messages, current_turn)):
+                for i in unit:
+                    keep[i] = False
+                    total -= tokens[i]
+                if total <= self.token_budget:
+                    break
+
+        self.last_report = {
+            "input_tokens": input_tokens,
+            "output_tokens": total,
+            "digested": digested,
+            "dropped": keep.count(False),
+        }
+        return [message for message, kept in zip(messages, keep) if kept]
+
+    @staticmethod
+    def _drop_units(messages: List[BaseMessage], current_turn: int) -> List[tuple]:
+        """Groups droppable messages before the current turn into (priority, position, indices) units."""
+        units, claimed = [], set()
+        for i in range(current_turn):
+            message = messages[i]
+            if i in claimed or isinstance(message, SystemMessage):
+                continue
+            if isinstance(message, AIMessage) and message.tool_calls:
+                call_ids = {call["id"] for call in message.tool_calls}
+                unit = [i] + [j for j in range(i + 1, current_turn)
+                              if isinstance(messages[j], ToolMessage) and messages[j].tool_call_id in call_ids]
+                claimed.update(unit)
+                units.append((DROP_TOOL_EXCHANGE, i, unit))
+            elif isinstance(message, ToolMessage):
+                units.append((DROP_TOOL_EXCHANGE, i, [i]))
+            else:
+                units.append((DROP_TURN, i, [i]))
+        return units
+
+    def __call__(self, state: Dict[str, Any]) -> Dict[str, List[BaseMessage]]:
+        return {"llm_input_messages": self.assemble(state["messages"])}
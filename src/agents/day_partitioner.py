@@ -0,0 +1,201 @@
+"""
+Geographic day partitioning: splits candidate places into one compact cluster per trip day.
+
+Attractions are clustered over their coordinates with capacity-constrained k-means: every
+day holds at most its available hours of visits. Centers are seeded with scikit-learn's
+k-means (weighted by visit hours); places are then assigned in order of regret (how much
+worse their second-nearest day is), each to the nearest day with room left, and the centers
+are moved to their members' weighted mean until the assignment settles; while places are
+left out, the least used day is moved onto them. Restaurants are spread over the days the
+same way, each day taking at least one per meal. Days are finally ordered so that
+consecutive days are close to each other, which keeps multi-city trips city by city.
+"""
+import math
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..models.place_models import ItineraryPlace
+from .itinerary_scheduler import DAILY_TIMETABLE, DEFAULT_VISIT_MINUTES, to_minutes
+
+_KM_PER_DEGREE = 111.2
+
+
+def available_hours(timetable: Sequence[Dict[str, str]] = DAILY_TIMETABLE, fill: float = 1.0) -> float:
+    """Hours of the timetable's tour slots, times fill (the share left once travel is taken out)."""
+    minutes = sum(to_minutes(slot["end"]) - to_minutes(slot["start"]) for slot in timetable if slot["kind"] == "tour")
+    return minutes / 60 * fill
+
+
+def _project(places: Sequence[ItineraryPlace]) -> Tuple[np.ndarray, float]:
+    """
+    Coordinates in km on a plane tangent at the places' mean latitude (good enough within a
+    country), and the km per degree of longitude there.
+    """
+    lat = np.array([p.lat for p in places], dtype=float)
+    lng = np.array([p.lng for p in places], dtype=float)
+    km_per_lng = _KM_PER_DEGREE * (math.cos(math.radians(float(lat.mean()))) if len(lat) else 1.0)
+    return np.column_stack([lng * km_per_lng, lat * _KM_PER_DEGREE]), km_per_lng
+
+
+def _assign(distances: np.ndarray, weights: np.ndarray, capacity: np.ndarray, max_detour_km: float) -> np.ndarray:
+    """
+    Regret-ordered greedy assignment to the nearest cluster with room; -1 where none within
+    max_detour_km of the place's nearest cluster has any (better left out than sent across town).
+    """
+    labels = np.full(len(weights), -1)
+    load = np.zeros(len(capacity))
+    ranked = np.argsort(distances, axis=1)
+    if distances.shape[1] > 1:
+        best = np.take_along_axis(distances, ranked[:, :2], axis=1)
+        regret = best[:, 1] - best[:, 0]
+    else:
+        regret = np.zeros(len(weights))
+    for place in np.argsort(-regret, kind="stable"):
+        for cluster in ranked[place]:
+            if distances[place, cluster] > distances[place, ranked[place][0]] + max_detour_km:
+                break
+            if load[cluster] + weights[place] <= capacity[cluster] + 1e-9:
+                labels[place], load[cluster] = cluster, load[cluster] + weights[place]
+                break
+    return labels
+
+
+def _cost(distances: np.ndarray, labels: np.ndarray, weights: np.ndarray) -> float:
+    assigned = labels >= 0
+    # Leaving an hour of visits out costs more than any detour
+    return float((distances[assigned, labels[assigned]] * weights[assigned]).sum() + 1e6 * weights[~assigned].sum())
+
+
+def _lloyd(points: np.ndarray, weights: np.ndarray, capacity: np.ndarray, max_detour_km: float,
+           centers: np.ndarray, max_iter: int):
+    """Alternates capacitated assignment and weighted-mean center updates until the labels settle."""
+    from scipy.spatial.distance import cdist
+
+    centers, labels = centers.copy(), None
+    for _ in range(max_iter):
+        new_labels = _assign(cdist(points, centers), weights, capacity, max_detour_km)
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        for cluster in range(len(centers)):
+            members = labels == cluster
+            if members.any():
+                centers[cluster] = np.average(points[members], axis=0, weights=weights[members])
+    return labels, centers, _cost(cdist(points, centers), labels, weights)
+
+
+def _capacitated_kmeans(points: np.ndarray, weights: np.ndarray, capacity: np.ndarray, max_detour_km: float,
+                        n_init: int, max_iter: int, seed: int):
+    from sklearn.cluster import KMeans
+
+    k = len(capacity)
+    distinct = len(np.unique(points, axis=0))
+    best = None
+    for attempt in range(n_init):
+        if distinct >= k:
+            kmeans = KMeans(n_clusters=k, n_init=1, random_state=seed + attempt).fit(points, sample_weight=weights)
+            centers = kmeans.cluster_centers_
+        else:
+            # Fewer distinct spots than days: some days stay empty
+            rng = np.random.default_rng(seed + attempt)
+            centers = points[rng.choice(len(points), size=k, replace=True)]
+        labels, centers, cost = _lloyd(points, weights, capacity, max_detour_km, centers, max_iter)
+        # k-means seeds days by where places are, not by how many hours each area needs: while
+        # places are left out, try moving the least used day onto them
+        for cluster in np.argsort([weights[labels == c].sum() for c in range(k)], kind="stable"):
+            left_out = np.flatnonzero(labels < 0)
+            if not len(left_out):
+                break
+            trial = centers.copy()
+            trial[cluster] = points[left_out[np.argmax(weights[left_out])]]
+            trial_labels, trial_centers, trial_cost = _lloyd(points, weights, capacity, max_detour_km, trial, max_iter)
+            if trial_cost < cost - 1e-9:
+                labels, centers, cost = trial_labels, trial_centers, trial_cost
+        if best is None or cost < best[0]:
+            best = (cost, labels, centers)
+    return best[1], best[2]
+
+
+def _day_order(centers: np.ndarray, loads: np.ndarray, first: int) -> List[int]:
+    """Nearest-neighbour chain over the day centers, from the first day's; empty days go last."""
+    used = [day for day in range(len(centers)) if loads[day] > 0]
+    if not used:
+        return list(range(len(centers)))
+    current = first if first in used else used[0]
+    order, remaining = [current], set(used) - {current}
+    while remaining:
+        current = min(remaining, key=lambda day: (float(np.linalg.norm(centers[day] - centers[current])), day))
+        remaining.discard(current)
+        order.append(current)
+    return order + [day for day in range(len(centers)) if day not in used]
+
+
+def partition_days(places: Sequence[ItineraryPlace], num_days: int, day_hours: Union[float, Sequence[float], None] = None,
+                   max_detour_km: float = 15.0, n_init: int = 4, max_iter: int = 50, seed: int = 0) -> Dict[str, Any]:
+    """
+    Groups places into one geographic cluster per day.
+    Args:
+        places (Sequence[ItineraryPlace]): Candidate attractions and restaurants, with lat/lng.
+        num_days (int): Number of days (clusters).
+        day_hours: Hours of visits each day can hold: one value for every day, or one per day.
+                   Defaults to the timetable's tour hours.
+        max_detour_km (float): How much farther than its nearest day's center a place may be
+                               sent when that day is full; farther places are left out.
+        n_init (int): Number of k-means restarts; the cheapest assignment is kept.
+        max_iter (int): Assignment/update rounds per restart.
+        seed (int): Random seed, so the same places always give the same days.
+    Returns:
+        Dict[str, Any]: days (in visiting order, each with places: indices into places,
+                        visit_hours and center: {lat, lng}) and unassigned (indices of places
+                        without coordinates or that fit no day).
+    """
+    if num_days <= 0:
+        return {"days": [], "unassigned": list(range(len(places)))}
+    if day_hours is None:
+        day_hours = available_hours()
+    capacity = np.array([day_hours] * num_days if np.isscalar(day_hours) else list(day_hours)[:num_days], dtype=float)
+    if len(capacity) < num_days:
+        raise ValueError(f"day_hours has {len(capacity)} values for {num_days} days")
+
+    located = [i for i, p in enumerate(places) if p.lat is not None and p.lng is not None]
+    unassigned = sorted(set(range(len(places))) - set(located))
+    attractions = [i for i in located if places[i].kind != "restaurant"]
+    restaurants = [i for i in located if places[i].kind == "restaurant"]
+    points, km_per_lng = _project([places[i] for i in located])
+    position = {index: row for row, index in enumerate(located)}
+
+    hours = np.array([
+        (places[i].visit_hours if places[i].visit_hours is not None else DEFAULT_VISIT_MINUTES.get(places[i].kind, 120) / 60)
+        for i in attractions
+    ], dtype=float)
+    if attractions:
+        labels, centers = _capacitated_kmeans(points[[position[i] for i in attractions]], hours, capacity, max_detour_km,
+                                              n_init, max_iter, seed)
+    else:
+        labels = np.array([], dtype=int)
+        centers = np.repeat(points.mean(axis=0, keepdims=True), num_days, axis=0) if len(points) else np.zeros((num_days, 2))
+
+    restaurant_labels = np.array([], dtype=int)
+    if restaurants:
+        from scipy.spatial.distance import cdist
+        meals = sum(slot["kind"] == "meal" for slot in DAILY_TIMETABLE)
+        per_day = np.full(num_days, max(math.ceil(len(restaurants) / num_days), meals), dtype=float)
+        restaurant_points = points[[position[i] for i in restaurants]]
+        restaurant_labels = _assign(cdist(restaurant_points, centers), np.ones(len(restaurants)), per_day, max_detour_km)
+
+    loads = np.array([hours[labels == day].sum() for day in range(num_days)])
+    first = int(labels[0]) if len(labels) and labels[0] >= 0 else 0
+    days = []
+    for day in _day_order(centers, loads, first):
+        members = [i for i, label in zip(attractions, labels) if label == day]
+        members += [i for i, label in zip(restaurants, restaurant_labels) if label == day]
+        days.append({
+            "places": members,
+            "visit_hours": round(float(loads[day]), 2),
+            "center": {"lat": round(float(centers[day][1] / _KM_PER_DEGREE), 6),
+                       "lng": round(float(centers[day][0] / km_per_lng), 6)},
+        })
+    unassigned += [i for i, label in zip(attractions, labels) if label < 0]
+    unassigned += [i for i, label in zip(restaurants, restaurant_labels) if label < 0]
+    return {"days": days, "unassigned": sorted(unassigned)}
@@ -0,0 +1,298 @@
+"""
+Deterministic day planning: fits candidate places into the daily timetable.
+
+Attractions go into the tour slots and restaurants into the meal slots, in an order that keeps
+travel short and respects every place's opening hours and visit duration. Attractions are first
+chained into one route (nearest neighbour, then 2-opt), the route is cut into days by filling
+each day's tour slots, and each day's order is then improved with 2-opt and or-opt moves,
+every candidate order being checked by simulating the day. Meals go to the nearest open,
+not yet used restaurant. Everything runs within a time budget.
+"""
+import datetime
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..models.place_models import ItineraryPlace
+
+# The structure of every full day. Tour slots take attractions, meal slots one restaurant each.
+DAILY_TIMETABLE = [
+    {"slot_name": "Wake up / Get ready", "start": "07:00", "end": "08:00", "kind": "fixed"},
+    {"slot_name": "Hotel Breakfast", "start": "08:00", "end": "09:00", "kind": "fixed"},
+    {"slot_name": "Morning Tour", "start": "09:00", "end": "13:00", "kind": "tour"},
+    {"slot_name": "Lunch at nearby place", "start": "13:00", "end": "15:00", "kind": "meal"},
+    {"slot_name": "Afternoon Tour", "start": "15:00", "end": "20:00", "kind": "tour"},
+    {"slot_name": "Dinner at nearby place", "start": "20:00", "end": "22:00", "kind": "meal"},
+    {"slot_name": "Explore / Take a walk", "start": "22:00", "end": "23:00", "kind": "fixed"},
+    {"slot_name": "Sleep", "start": "23:00", "end": "23:00", "kind": "fixed"},
+]
+
+DEFAULT_VISIT_MINUTES = {"attraction": 120, "restaurant": 60}
+UNKNOWN_TRAVEL_SECONDS = 60 * 60   # Assumed for pairs the travel-time matrix has no value for
+_UNSCHEDULED_PENALTY = 10 ** 6     # Cost of leaving a place out, in minutes of travel: worse than any detour
+_INSERTION_LOOKAHEAD = 3           # Places past the day's last one on the route that may fail to fit before a day is closed
+
+
+def to_minutes(clock: str) -> int:
+    """'HH:MM' -> minutes after midnight."""
+    hours, _, minutes = clock.strip().partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def to_clock(minutes: float) -> str:
+    minutes = int(round(minutes))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_timetable(timetable: Sequence[Dict[str, str]] = DAILY_TIMETABLE) -> str:
+    """Renders the timetable for the system prompt, one slot per line."""
+    def twelve_hour(clock: str) -> str:
+        return datetime.datetime.strptime(clock, "%H:%M").strftime("%I:%M %p").lstrip("0")
+
+    lines = []
+    for slot in timetable:
+        hours = (to_minutes(slot["end"]) - to_minutes(slot["start"])) / 60
+        when = twelve_hour(slot["start"]) if not hours else f"{twelve_hour(slot['start'])} - {twelve_hour(slot['end'])}"
+        lines.append(f'{{"time": "{when}", "slot_name": "{slot["slot_name"]}", "duration_hours": {hours:g}}}')
+    return "\n".join(lines)
+
+
+class _Problem:
+    """Places, travel times and timetable in the form the search works on (indices and minutes)."""
+
+    def __init__(self, places: Sequence[ItineraryPlace], travel_seconds: Sequence[Sequence[Optional[float]]],
+                 has_start: bool, timetable: Sequence[Dict[str, str]]):
+        self.places = list(places)
+        self.offset = 1 if has_start else 0
+        self.start = 0 if has_start else None
+        self.travel = [[UNKNOWN_TRAVEL_SECONDS / 60 if value is None else value / 60 for value in row] for row in travel_seconds]
+        self.visit = [p.visit_hours * 60 if p.visit_hours is not None else DEFAULT_VISIT_MINUTES.get(p.kind, 120) for p in self.places]
+        self.window = [(to_minutes(p.opens) if p.opens else 0, to_minutes(p.closes) if p.closes else 24 * 60) for p in self.places]
+        self.slots = [(slot, to_minutes(slot["start"]), to_minutes(slot["end"])) for slot in timetable]
+
+    def minutes(self, origin: Optional[int], place: int) -> float:
+        """Travel minutes from a node (None: nowhere yet) to a place."""
+        if origin is None:
+            return 0.0
+        return self.travel[origin][place + self.offset]
+
+    def node(self, place: int) -> int:
+        return place + self.offset
+
+    def fits(self, place: int, ready: float, origin: Optional[int], slot_end: float) -> Optional[Tuple[float, float, float, float]]:
+        """(travel, arrive, start, end) if place can be visited within the slot after `ready`, else None."""
+        travel = self.minutes(origin, place)
+        opens, closes = self.window[place]
+        start = max(ready + travel, opens)
+        end = start + self.visit[place]
+        if end > slot_end or end > closes:
+            return None
+        return travel, ready + travel, start, end
+
+    def simulate(self, order: Sequence[int], restaurants: Sequence[int]) -> Dict[str, Any]:
+        """
+        Walks one day through the timetable, visiting attractions in order and picking the
+        nearest fitting restaurant for each meal. Returns the visits, the attractions that did
+        not fit, the restaurants used, the travel minutes and the cost (travel plus a penalty
+        per left-out place).
+        """
+        visits, skipped, used = [], [], []
+        location, clock, travel = self.start, 0.0, 0.0
+        pending = list(order)
+        for index, (slot, slot_start, slot_end) in enumerate(self.slots):
+            ready = max(clock, slot_start)
+            if slot["kind"] == "tour":
+                while pending:
+                    timing = self.fits(pending[0], ready, location, slot_end)
+                    if timing is None:
+                        # Leave it for the next tour slot, or out of the day if no later slot could hold it
+                        if self._fits_later(pending[0], index):
+                            break
+                        skipped.append(pending.pop(0))
+                        continue
+                    place = pending.pop(0)
+                    visits.append((index, place, *timing))
+                    travel += timing[0]
+                    ready, location = timing[3], self.node(place)
+                clock = ready
+            elif slot["kind"] == "meal":
+                options = [(place, self.fits(place, ready, location, slot_end)) for place in restaurants if place not in used]
+                options = [(timing[0], place, timing) for place, timing in options if timing is not None]
+                if options:
+                    _, place, timing = min(options)
+                    used.append(place)
+                    visits.append((index, place, *timing))
+                    travel += timing[0]
+                    clock, location = timing[3], self.node(place)
+                else:
+                    clock = ready
+        skipped += pending
+        return {"visits": visits, "skipped": skipped, "used": used, "travel": travel,
+                "cost": travel + _UNSCHEDULED_PENALTY * len(skipped)}
+
+    def _fits_later(self, place: int, slot_index: int) -> bool:
+        """Whether a later tour slot could hold the place at all (ignoring travel)."""
+        for slot, slot_start, slot_end in self.slots[slot_index + 1:]:
+            if slot["kind"] == "tour" and self.fits(place, slot_start, None, slot_end) is not None:
+                return True
+        return False
+
+
+def _path_minutes(problem: _Problem, order: Sequence[int]) -> float:
+    total, previous = 0.0, problem.start
+    for place in order:
+        total += problem.minutes(previous, place)
+        previous = problem.node(place)
+    return total
+
+
+def _nearest_neighbour(problem: _Problem, places: Sequence[int]) -> List[int]:
+    remaining, order, previous = set(places), [], problem.start
+    while remaining:
+        place = min(remaining, key=lambda p: (problem.minutes(previous, p), p))
+        remaining.discard(place)
+        order.append(place)
+        previous = problem.node(place)
+    return order
+
+
+def _two_opt_path(problem: _Problem, order: List[int], deadline: float) -> List[int]:
+    """2-opt on the open path from the start, by travel time only."""
+    def edge(a: Optional[int], b: int) -> float:
+        return problem.minutes(a, b)
+
+    best = _path_minutes(problem, order)
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for i in range(len(order) - 1):
+            before = problem.start if i == 0 else problem.node(order[i - 1])
+            for j in range(i + 2, len(order) + 1):
+                # Screen with the change of the two boundary edges (exact for symmetric matrices) ...
+                after = order[j] if j < len(order) else None
+                delta = edge(before, order[j - 1]) - edge(before, order[i])
+                if after is not None:
+                    delta += edge(problem.node(order[i]), after) - edge(problem.node(order[j - 1]), after)
+                if delta >= -1e-9:
+                    continue
+                # ... and confirm on the whole path, since transit and traffic times are not
+                candidate = order[:i] + order[i:j][::-1] + order[j:]
+                length = _path_minutes(problem, candidate)
+                if length < best - 1e-9:
+                    order, best, improved = candidate, length, True
+                    before = problem.start if i == 0 else problem.node(order[i - 1])
+            if time.perf_counter() >= deadline:
+                break
+    return order
+
+
+def _day_moves(order: List[int]):
+    """Neighbouring orders of one day: 2-opt reversals, then or-opt moves of runs of 1-3 places."""
+    for i in range(len(order) - 1):
+        for j in range(i + 2, len(order) + 1):
+            yield order[:i] + order[i:j][::-1] + order[j:]
+    for length in (1, 2, 3):
+        for i in range(len(order) - length + 1):
+            run, rest = order[i:i + length], order[:i] + order[i + length:]
+            for j in range(len(rest) + 1):
+                if j != i:
+                    yield rest[:j] + run + rest[j:]
+
+
+def _improve_day(problem: _Problem, order: List[int], restaurants: Sequence[int], deadline: float) -> List[int]:
+    """First-improvement local search over _day_moves, judged by simulating the day."""
+    best = problem.simulate(order, restaurants)["cost"]
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for candidate in _day_moves(order):
+            cost = problem.simulate(candidate, restaurants)["cost"]
+            if cost < best - 1e-9:
+                order, best, improved = candidate, cost, True
+                break
+            if time.perf_counter() >= deadline:
+                break
+    return order
+
+
+def plan_days(places: Sequence[ItineraryPlace], travel_seconds: Sequence[Sequence[Optional[float]]], num_days: int,
+              start_date: Optional[str] = None, has_start: bool = False,
+              timetable: Sequence[Dict[str, str]] = DAILY_TIMETABLE, time_budget: float = 0.5) -> Dict[str, Any]:
+    """
+    Orders places into feasible day plans.
+    Args:
+        places (Sequence[ItineraryPlace]): Candidate attractions and restaurants.
+        travel_seconds: Square travel-time matrix over ([start] if has_start) + places; None for unknown pairs.
+        num_days (int): Number of full days to plan.
+        start_date (str): Date of the first day, YYYY-MM-DD, to label the days.
+        has_start (bool): Whether the matrix's first row is the hotel each day starts from.
+        timetable: The daily slots (DAILY_TIMETABLE by default).
+        time_budget (float): Seconds the improvement heuristics may run.
+    Returns:
+        Dict[str, Any]: days (one entry per day with its slots, stops and travel minutes) and
+                        unscheduled (names of the attractions that did not fit).
+    """
+    started = time.perf_counter()
+    problem = _Problem(places, travel_seconds, has_start, timetable)
+    attractions = [i for i, p in enumerate(problem.places) if p.kind != "restaurant"]
+    restaurants = [i for i, p in enumerate(problem.places) if p.kind == "restaurant"]
+
+    # One route through every attraction, cut into days in route order
+    route = _two_opt_path(problem, _nearest_neighbour(problem, attractions), started + time_budget / 2)
+    days, remaining, available = [], route, list(restaurants)
+    for number in range(max(num_days, 0)):
+        # Each day may use an equal share of what is left of the budget
+        deadline = time.perf_counter() + max(started + time_budget - time.perf_counter(), 0) / (num_days - number)
+        filled = problem.simulate(remaining, available)
+        order = [place for _, place, *_ in filled["visits"] if place not in filled["used"]]
+        order = _improve_day(problem, order, available, deadline)
+        # Places the day passed over, and the next ones on the route, may fit once it is reordered
+        last = max((remaining.index(p) for p in order), default=-1)
+        misses = 0
+        for position_on_route, place in enumerate(remaining):
+            if position_on_route > last and misses >= _INSERTION_LOOKAHEAD:
+                break
+            if place in order:
+                continue
+            for position in range(len(order) + 1):
+                candidate = order[:position] + [place] + order[position:]
+                if not problem.simulate(candidate, available)["skipped"]:
+                    order = candidate
+                    break
+            else:
+                misses += position_on_route > last
+        day = problem.simulate(order, available)
+        kept = set(order) - set(day["skipped"])
+        days.append(day)
+        remaining = [p for p in remaining if p not in kept]
+        available = [r for r in available if r not in day["used"]]
+
+    first_day = datetime.date.fromisoformat(start_date) if start_date else None
+    return {
+        "days": [_render_day(problem, number, day, first_day) for number, day in enumerate(days, start=1)],
+        "unscheduled": [problem.places[p].name for p in remaining],
+    }
+
+
+def _render_day(problem: _Problem, number: int, day: Dict[str, Any], first_day: Optional[datetime.date]) -> Dict[str, Any]:
+    slots = []
+    for index, (slot, _, _) in enumerate(problem.slots):
+        stops = []
+        for slot_index, place, travel, arrive, start, end in day["visits"]:
+            if slot_index == index:
+                details = problem.places[place]
+                stops.append({
+                    "name": details.name,
+                    "kind": details.kind,
+                    "place_id": details.place_id,
+                    "location": details.location,
+                    "travel_minutes": round(travel, 1),
+                    "arrive": to_clock(arrive),
+                    "start": to_clock(start),
+                    "end": to_clock(end),
+                })
+        slots.append({"slot_name": slot["slot_name"], "start": slot["start"], "end": slot["end"], "stops": stops})
+    entry = {"day": number, "slots": slots, "travel_minutes": round(day["travel"], 1)}
+    if first_day is not None:
+        date = first_day + datetime.timedelta(days=number - 1)
+        entry.update(date=date.isoformat(), weekday=date.strftime("%A"))
+    return entry
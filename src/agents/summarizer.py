@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from src.utils.tokens import estimate_text_tokens
+
+ROLLING_SUMMARY_PROMPT = (
+    "Above are the newest messages of a travel-planning conversation. "
+    "Here is the summary of everything before them:\n\n{summary}\n\n"
+    "Rewrite the summary so it also covers the new messages, as a single summary. "
+    "Include as many specific details as you can (places, dates, prices, preferences, decisions)."
+)
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+
+
+def estimate_tokens(messages: List[dict]) -> int:
+    """Cheap token estimate for role/content messages, without calling the model's tokenizer API."""
+    return sum(estimate_text_tokens(str(m["content"])) for m in messages)
+
+
+def to_langchain_message(message: dict) -> BaseMessage:
+    if message["role"] == "user":
+        return HumanMessage(content=message["content"])
+    if message["role"] == "assistant":
+        return AIMessage(content=message["content"])
+    # A content-derived id makes the checkpointer replace a re-sent system prompt in place instead of appending a copy
+    digest = hashlib.sha1(str(message["content"]).encode("utf-8")).hexdigest()[:16]
+    return SystemMessage(content=message["content"], id=f"system-{digest}")
+
+
+class _ConversationSummary:
+    def __init__(self):
+        self.summary: Optional[str] = None
+        self.summarized_upto = 0   # messages[:summarized_upto] are covered by summary (or are the system prompt)
+        self.pending = False       # A compaction is running
+
+
+class RollingSummarizer:
+    """
+    Keeps a running summary per conversation and folds older messages into it in the background.
+
+    A conversation is its full role/content message list, which only grows. context() returns
+    what the agent should see: the leading system prompt, the summary so far and the messages
+    not yet summarized. It never calls the LLM. After a turn, compact_in_background() (or
+    acompact_in_background() on an event loop) checks whether the unsummarized messages exceed
+    token_threshold; if so, it asks the LLM to merge them - minus the keep_recent_messages
+    newest, which stay verbatim - into the previous summary. The LLM input is only the new
+    messages plus the old summary, and the next turn picks up the result if it is ready.
+    """
+
+    def __init__(self, llm: BaseChatModel, token_threshold: int, keep_recent_messages: int = 4, max_sessions: int = 1000):
+        self.llm = llm
+        self.token_threshold = token_threshold
+        self.keep_recent_messages = keep_recent_messages
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, _ConversationSummary]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._tasks = set()  # Strong references to running async compactions
+
+    def _session(self, session_id: str) -> _ConversationSummary:
+        # Caller holds self._lock
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _ConversationSummary()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(session_id)
+        return session
+
+    @staticmethod
+    def _prompt_length(messages: List[dict]) -> int:
+        head = 0
+        while head < len(messages) and messages[head]["role"] == "system":
+            head += 1
+        return head
+
+    def context(self, session_id: str, messages: List[dict]) -> List[dict]:
+        """Returns the messages to send for this turn: system prompt, summary, unsummarized tail."""
+        with self._lock:
+            session = self._session(session_id)
+            summary, upto = session.summary, session.summarized_upto
+        head = self._prompt_length(messages)
+        context = list(messages[:head])
+        if summary:
+            context.append({"role": "system", "content": SUMMARY_HEADER + summary})
+        context.extend(messages[max(upto, head):])
+        return context
+
+    def model_context(self, session_id: str, prompt: List[dict], history: Sequence[BaseMessage]) -> List[BaseMessage]:
+        """
+        Returns the model input for a checkpointed conversation: the system prompt, the summary so
+        far and the part of history it does not cover. history is the graph's own message list
+        (user messages, tool exchanges and replies), while the summary covers role/content
+        messages - one user message and one reply per turn - so the cut is found by counting
+        those, then moved on to the next user message to keep each turn's tool calls with it.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            summary, upto = (session.summary, session.summarized_upto) if session else (None, 0)
+        context = [to_langchain_message(m) for m in prompt]
+        if not summary:
+            return context + list(history)
+        context.append(to_langchain_message({"role": "system", "content": SUMMARY_HEADER + summary}))
+        covered, cut = upto - self._prompt_length(prompt), 0
+        while cut < len(history) and covered > 0:
+            message = history[cut]
+            if isinstance(message, HumanMessage) or (isinstance(message, AIMessage) and not message.tool_calls):
+                covered -= 1
+            cut += 1
+        while cut < len(history) and not isinstance(history[cut], HumanMessage):
+            cut += 1
+        return context + list(history[cut:])
+
+    def summary(self, session_id: str) -> Optional[str]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session.summary if session else None
+
+    def _plan(self, session_id: str, messages: List[dict]) -> Optional[Tuple[_ConversationSummary, int, List[BaseMessage]]]:
+        """Decides whether to compact; if so, marks the session pending and returns (session, new upto, LLM input)."""
+        with self._lock:
+            session = self._session(session_id)
+            if session.pending:
+                return None
+            start = max(session.summarized_upto, self._prompt_length(messages))
+            end = len(messages) - self.keep_recent_messages
+            if end <= start or estimate_tokens(messages[start:]) < self.token_threshold:
+                return None
+            llm_input = [to_langchain_message(m) for m in messages[start:end]]
+            llm_input.append(HumanMessage(content=ROLLING_SUMMARY_PROMPT.format(summary=session.summary or "(nothing yet)")))
+            session.pending = True
+            return session, end, llm_input
+
+    def _finish(self, session: _ConversationSummary, upto: int, summary: Optional[str]) -> None:
+        with self._lock:
+            if summary and upto > session.summarized_upto:
+                session.summary = summary
+                session.summarized_upto = upto
+            session.pending = False
+
+    def _compact(self, session: _ConversationSummary, upto: int, llm_input: List[BaseMessage]) -> None:
+        summary = None
+        try:
+            summary = self.llm.invoke(llm_input).content
+        except Exception as e:
+            print(f"Error summarizing conversation: {e}")
+        finally:
+            self._finish(session, upto, summary)
+
+    async def _acompact(self, session: _ConversationSummary, upto: int, llm_input: List[BaseMessage]) -> None:
+        summary = None
+        try:
+            summary = (await self.llm.ainvoke(llm_input)).content
+        except Exception as e:
+            print(f"Error summarizing conversation: {e}")
+        finally:
+            self._finish(session, upto, summary)
+
+    def compact_in_background(self, session_id: str, messages: List[dict]):
+        """Starts a compaction on a worker thread if one is due. Returns its Future, or None."""
+        plan = self._plan(session_id, list(messages))
+        if plan is None:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="summarizer")
+        return self._executor.submit(self._compact, *plan)
+
+    def acompact_in_background(self, session_id: str, messages: List[dict]) -> Optional[asyncio.Task]:
+        """Starts a compaction task on the running loop if one is due. Returns the Task, or None."""
+        plan = self._plan(session_id, list(messages))
+        if plan is None:
+            return None
+        task = asyncio.get_running_loop().create_task(self._acompact(*plan))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "summarized_sessions": sum(1 for s in self._sessions.values() if s.summary),
+                "pending": sum(1 for s in self._sessions.values() if s.pending),
+            }
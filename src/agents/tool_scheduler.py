@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Dict, Optional, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import ToolNode
+
+from src.config.settings import PROVIDER_CONCURRENCY_LIMITS
+
+# Upstream provider each tool talks to. "local" tools (pure computation) have no entry in the
+# provider limits and are never throttled. Every registered tool is listed.
+TOOL_PROVIDERS: Dict[str, str] = {
+    "get_airport_name": "amadeus",
+    "get_airline_name": "amadeus",
+    "get_airport_names": "amadeus",
+    "get_airline_names": "amadeus",
+    "get_flight_details": "amadeus",
+    "find_best_flights": "amadeus",
+    "get_flight_offer_details": "amadeus",
+    "get_exchange_rate": "exchangerate",
+    "convert_currency_batch": "exchangerate",
+    "get_nearby_places": "google",
+    "get_directions": "google",
+    "get_travel_time_matrix": "google",
+    "get_place_details": "google",
+    "get_geocode_tool": "google",
+    "reverse_geocode_tool": "google",
+    "reverse_geocode_batch": "google",
+    "plan_itinerary": "google",  # One Distance Matrix fetch per planned day
+    "hotel_search_tool": "serpapi",
+    "get_weather_and_forecast": "openweather",
+    "calculate_estimated_route_price": "llm",
+    "calculate_average_time_spent_at_an_address": "llm",
+    "group_places_by_day": "local",  # Clusters the coordinates it is given; no API calls
+    "convert_unix_to_mmddyyyy": "local",
+    "convert_unix_to_yyyymmdd": "local",
+    "travel_budget_allocator": "local",
+    "add": "local",
+    "multiply": "local",
+    "estimate_hotel_cost": "local",
+    "fetch_tool_output": "local",
+}
+
+
+class ProviderLimitedToolNode(ToolNode):
+    """
+    ToolNode that runs all tool calls of one agent step concurrently, while capping the
+    number of in-flight calls per upstream provider (Google, Amadeus, SerpAPI, ...).
+
+    Results keep the order of the model's tool calls. Each ToolMessage gets a `timing`
+    entry in response_metadata with the provider, how long the call queued for a provider
+    slot and how long it ran, so a step costs roughly its slowest call rather than the sum.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[BaseTool],
+        *,
+        provider_limits: Optional[Dict[str, int]] = None,
+        tool_providers: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(tools, **kwargs)
+        self.provider_limits = dict(PROVIDER_CONCURRENCY_LIMITS if provider_limits is None else provider_limits)
+        self.tool_providers = dict(TOOL_PROVIDERS if tool_providers is None else tool_providers)
+        self._thread_limits = {provider: threading.BoundedSemaphore(limit) for provider, limit in self.provider_limits.items()}
+        self._async_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+    def _provider(self, tool_name: str) -> Optional[str]:
+        provider = self.tool_providers.get(tool_name)
+        return provider if provider in self.provider_limits else None
+
+    def _async_limit(self, provider: str) -> asyncio.Semaphore:
+        limits = self._async_limits.setdefault(asyncio.get_running_loop(), {})
+        if provider not in limits:
+            limits[provider] = asyncio.Semaphore(self.provider_limits[provider])
+        return limits[provider]
+
+    @staticmethod
+    def _with_timing(output, provider: Optional[str], requested: float, started: float, finished: float):
+        if isinstance(output, ToolMessage):
+            output.response_metadata["timing"] = {
+                "provider": provider,
+                "queued_ms": round((started - requested) * 1000, 1),
+                "duration_ms": round((finished - started) * 1000, 1),
+            }
+        return output
+
+    def _run_one(self, call, input_type, config: RunnableConfig):
+        provider = self._provider(call["name"])
+        requested = time.perf_counter()
+        if provider is None:
+            started = requested
+            output = super()._run_one(call, input_type, config)
+        else:
+            with self._thread_limits[provider]:
+                started = time.perf_counter()
+                output = super()._run_one(call, input_type, config)
+        return self._with_timing(output, provider, requested, started, time.perf_counter())
+
+    async def _arun_one(self, call, input_type, config: RunnableConfig):
+        provider = self._provider(call["name"])
+        requested = time.perf_counter()
+        if provider is None:
+            started = requested
+            output = await super()._arun_one(call, input_type, config)
+        else:
+            async with self._async_limit(provider):
+                started = time.perf_counter()
+                output = await super()._arun_one(call, input_type, config)
+        return self._with_timing(output, provider, requested, started, time.perf_counter())
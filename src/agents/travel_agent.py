@@ -1,7 +1,9 @@
 from src.models.openweather_models import OpenWeatherResponse
 from src.models.amadeus_models import FlightOffer
+from src.models.place_models import ItineraryPlace
 from typing import List, Optional, Dict, Any, TypedDict
 from langchain_core.messages import BaseMessage
+import datetime
 
 class TravelAgentState(TypedDict):
     """
@@ -32,3 +34,37 @@ class TravelAgentState(TypedDict):
 
     # For conversational flow and debugging
     messages: List[BaseMessage] # A history of messages, including LLM responses and tool calls/outputs
+
+
+def to_itinerary_place(place: Dict[str, Any], kind: str) -> ItineraryPlace:
+    """Converts a place as returned by get_nearby_places (or stored in the state) for the scheduler."""
+    details = place.get('place_details') or {}
+    lat, lng = place.get('latitude', place.get('lat')), place.get('longitude', place.get('lng'))
+    location = place.get('address') or details.get('address') or (f"{lat},{lng}" if lat is not None and lng is not None else place['name'])
+    return ItineraryPlace(
+        name=place['name'],
+        location=location,
+        kind=kind,
+        visit_hours=place.get('visit_hours'),
+        opens=place.get('opens'),
+        closes=place.get('closes'),
+        place_id=place.get('place_id'),
+        lat=lat,
+        lng=lng,
+    )
+
+
+def draft_itinerary(state: TravelAgentState, mode: str = 'transit') -> Dict[str, Any]:
+    """
+    Graph node: schedules the state's attractions, activities and restaurants into day plans
+    (one travel-time matrix, then the itinerary scheduler) and returns the itinerary_draft update.
+    """
+    from src.tools.itinerary_tools import schedule_places
+
+    places = [to_itinerary_place(p, 'attraction') for p in state.get('attractions', []) + state.get('activities', [])]
+    places += [to_itinerary_place(p, 'restaurant') for p in state.get('restaurants', [])]
+    start, end = state.get('start_date'), state.get('end_date')
+    num_days = (datetime.date.fromisoformat(end) - datetime.date.fromisoformat(start)).days + 1 if start and end else 1
+    hotel = state.get('selected_hotel') or {}
+    plan = schedule_places(places, num_days, start_date=start, hotel=hotel.get('address'), mode=mode)
+    return {'itinerary_draft': plan['days']}
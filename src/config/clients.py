@@ -1,8 +1,5 @@
 import os
-import googlemaps
-import amadeus
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+import threading
 
 # Import settings to get API keys and default values
 from .settings import (
@@ -13,47 +10,126 @@ from .settings import (
     AMADEUS_CLIENT_SECRET,
     BASE_CURRENCY,
     UNITS,
+    GMAPS_CALL_TIMEOUT,
     LAT,
     LONG,
+    LLM_CACHE_PATH,
+    LLM_CACHE_BYPASS,
+    LLM_CACHE_TTL,
+    LLM_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_DIR,
+    SEMANTIC_CACHE_MODEL,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_ROUTE_PRICE_THRESHOLD,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_BATCH_SIZE,
+    SEMANTIC_CACHE_BATCH_WINDOW,
 )
+from ..utils.llm_cache import LLMCache
+from ..utils.response_cache import ResponseCache
+from ..utils.semantic_cache import BatchingEmbedder, SemanticCache
 
-# --- 1. Initialize API Clients and URLs ---
-
-# Initialize the Google Maps client
-GMAPS = None
-if GOOGLECLOUD_API_KEY is None:
-    print("Error: GOOGLECLOUD_API_KEY environment variable not set. Google Maps client will not be initialized.")
-else:
-    GMAPS = googlemaps.Client(key=GOOGLECLOUD_API_KEY)
-
-# Initialize The OpenWeather API URL
-OPENWEATHER_BASEURL = None
-if OPENWEATHER_API_KEY is None:
-    print("Error: OPENWEATHER_API_KEY environment variable not set. OpenWeather API URL will not be initialized.")
-else:
-    # Note: The original notebook had a typo 'exchangerate_baseurl' for OpenWeather. Correcting it here.
-    OPENWEATHER_BASEURL = f'https://api.openweathermap.org/data/3.0/onecall?lat={LAT}&lon={LONG}&appid={OPENWEATHER_API_KEY}&units={UNITS}'
-
-# Initialize the Exchange Rate API URL
-EXCHANGERATE_BASERURL = None
-if EXCHANGERATE_API_KEY is None:
-    print("Error: EXCHANGERATE_API_KEY environment variable not set. ExchangeRate API URL will not be initialized.")
-else:
-    EXCHANGERATE_BASERURL = f'https://v6.exchangerate-api.com/v6/{EXCHANGERATE_API_KEY}/latest/{BASE_CURRENCY}'
-
-# Initialize the Amadeus client
-AMADEUS_CLIENT = None
-if AMADEUS_CLIENT_ID is None or AMADEUS_CLIENT_SECRET is None:
-    print("Error: AMADEUS_CLIENT_ID & AMADEUS_CLIENT_SECRET environment variables not set. Amadeus client will not be initialized.")
-else:
-    AMADEUS_CLIENT = amadeus.Client(client_id=AMADEUS_CLIENT_ID, client_secret=AMADEUS_CLIENT_SECRET)
-    
-# Initialize the OpenAI client
-if os.getenv('OPENAI_API_KEY') is None:
-    print("Error: OPENAI_API_KEY environment variable not set.")
-    
-#LLM = ChatOpenAI(model_name="gpt-4o", temperature=0.2)
-LLM = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    temperature=0.7
+# --- 1. API URLs (plain strings, checked where they are used) ---
+
+# Note: The original notebook had a typo 'exchangerate_baseurl' for OpenWeather. Correcting it here.
+# lat, lon, appid and units are passed as request params so they are not duplicated in the query string.
+OPENWEATHER_BASEURL = 'https://api.openweathermap.org/data/3.0/onecall' if OPENWEATHER_API_KEY else None
+
+EXCHANGERATE_BASERURL = f'https://v6.exchangerate-api.com/v6/{EXCHANGERATE_API_KEY}/latest/{BASE_CURRENCY}' if EXCHANGERATE_API_KEY else None
+
+# --- 2. API clients, built on first use ---
+# Importing this module is cheap: the client SDKs (and the LLM provider package, the slowest
+# import in the app) are only imported when a client is first requested.
+
+LLM_MODEL = "gemini-2.5-flash"
+
+_lock = threading.Lock()
+_clients = {}
+
+
+def _get_or_create(name: str, factory):
+    if name not in _clients:
+        with _lock:
+            if name not in _clients:
+                _clients[name] = factory()
+    return _clients[name]
+
+
+def _create_gmaps_client():
+    if GOOGLECLOUD_API_KEY is None:
+        print("Error: GOOGLECLOUD_API_KEY environment variable not set. Google Maps client will not be initialized.")
+        return None
+    import googlemaps
+    from ..utils.http_transport import get_http_session
+    # Reuse the shared keep-alive pool instead of googlemaps' private session
+    # A per-request timeout, so a hung request frees its worker for the lookups queued behind it
+    return googlemaps.Client(key=GOOGLECLOUD_API_KEY, timeout=GMAPS_CALL_TIMEOUT, requests_session=get_http_session())
+
+
+def _create_amadeus_client():
+    if AMADEUS_CLIENT_ID is None or AMADEUS_CLIENT_SECRET is None:
+        print("Error: AMADEUS_CLIENT_ID & AMADEUS_CLIENT_SECRET environment variables not set. Amadeus client will not be initialized.")
+        return None
+    import amadeus
+    return amadeus.Client(client_id=AMADEUS_CLIENT_ID, client_secret=AMADEUS_CLIENT_SECRET)
+
+
+def _create_llm():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    #from langchain_openai import ChatOpenAI
+    #return ChatOpenAI(model_name="gpt-4o", temperature=0.2)
+    return ChatGoogleGenerativeAI(
+        model=LLM_MODEL,
+        temperature=0.7
+    )
+
+
+def get_gmaps_client():
+    """The shared Google Maps client, or None if GOOGLECLOUD_API_KEY is not set."""
+    return _get_or_create("gmaps", _create_gmaps_client)
+
+
+def get_amadeus_client():
+    """The shared Amadeus client, or None if the Amadeus credentials are not set."""
+    return _get_or_create("amadeus", _create_amadeus_client)
+
+
+def get_llm():
+    """The shared chat model."""
+    return _get_or_create("llm", _create_llm)
+
+
+class _LazyLLM:
+    """Stands in for the chat model until it is used; attribute access builds it via get_llm()."""
+
+    # Known without building the model, so cached answers can be looked up by model id
+    # (model_id() reads model_name first, which would otherwise go through __getattr__)
+    model = model_name = LLM_MODEL
+
+    def __getattr__(self, name: str):
+        return getattr(get_llm(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy {_clients['llm']!r}>" if "llm" in _clients else "<lazy chat model, not built yet>"
+
+
+# Tool modules call LLM.invoke / LLM.ainvoke; the model is built on the first call
+LLM = _LazyLLM()
+
+# Answers of LLM-backed helper tools, memoized across runs (see src/utils/llm_cache.py), and
+# matched by meaning through the semantic cache (faiss and the embedding model load on first use)
+SEMANTIC_CACHE = SemanticCache(
+    SEMANTIC_CACHE_DIR,
+    BatchingEmbedder(SEMANTIC_CACHE_MODEL, batch_size=SEMANTIC_CACHE_BATCH_SIZE, batch_window=SEMANTIC_CACHE_BATCH_WINDOW),
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    thresholds={"route_price": SEMANTIC_CACHE_ROUTE_PRICE_THRESHOLD},
+    ttl=LLM_CACHE_TTL,
+    max_entries=SEMANTIC_CACHE_MAX_ENTRIES,
+) if SEMANTIC_CACHE_ENABLED else None
+LLM_CACHE = LLMCache(
+    ResponseCache(LLM_CACHE_PATH, bypass=LLM_CACHE_BYPASS),
+    ttl=LLM_CACHE_TTL,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    semantic=SEMANTIC_CACHE,
 )
@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from ..utils.visited_places import VisitedPlacesRegistry
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,5 +23,133 @@ UNITS = os.getenv('UNITS', 'IMPERIAL')             # Units system for weather an
 LAT = float(os.getenv('DEFAULT_LAT', 33.0217))
 LONG = float(os.getenv('DEFAULT_LONG', -96.6980))
 
-# Global lists/variables that might need to persist state or track data
-PLACES_VISITED = [] # To keep track of places already suggested/visited to avoid repetition
\ No newline at end of file
+# Concurrency settings for fanned-out Google Maps lookups (place details, batch reverse geocoding)
+GMAPS_MAX_WORKERS = int(os.getenv('GMAPS_MAX_WORKERS', 8))            # Max concurrent Google Maps requests
+GMAPS_CALL_TIMEOUT = float(os.getenv('GMAPS_CALL_TIMEOUT', 10.0))     # Seconds each Google Maps request may take before it is given up on
+
+# Shared HTTP connection pool
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', 10))  # Concurrent keep-alive connections allowed per API host
+HTTP_MAX_HOSTS = int(os.getenv('HTTP_MAX_HOSTS', 10))                                # Number of hosts to keep connection pools for
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 30.0))                                # Seconds before an HTTP request is abandoned
+ASYNC_BLOCKING_MAX_WORKERS = int(os.getenv('ASYNC_BLOCKING_MAX_WORKERS', 16))         # Threads used by async tools that wrap blocking SDKs
+
+# Max concurrent tool calls per upstream provider when the agent runs several tool calls in one step
+PROVIDER_CONCURRENCY_LIMITS = {
+    'google': int(os.getenv('GOOGLE_MAX_CONCURRENT_CALLS', 8)),
+    'amadeus': int(os.getenv('AMADEUS_MAX_CONCURRENT_CALLS', 2)),
+    'serpapi': int(os.getenv('SERPAPI_MAX_CONCURRENT_CALLS', 2)),
+    'openweather': int(os.getenv('OPENWEATHER_MAX_CONCURRENT_CALLS', 4)),
+    'exchangerate': int(os.getenv('EXCHANGERATE_MAX_CONCURRENT_CALLS', 2)),
+    'llm': int(os.getenv('LLM_MAX_CONCURRENT_CALLS', 4)),
+}
+
+# Tools offered to the agent: comma-separated tool names or groups (amadeus, maps, serpapi, weather,
+# exchange_rate, util, arithmetic, context). Empty ENABLED_TOOLS means every registered tool; an unknown
+# name in either list stops startup rather than being ignored.
+ENABLED_TOOLS = [t for t in os.getenv('ENABLED_TOOLS', '').split(',') if t.strip()]
+DISABLED_TOOLS = [t for t in os.getenv('DISABLED_TOOLS', '').split(',') if t.strip()]
+
+# Rolling conversation summary. Older messages are folded into the summary in the background
+# once the not-yet-summarized messages exceed the threshold; the newest ones always stay verbatim.
+SUMMARY_TOKEN_THRESHOLD = int(os.getenv('SUMMARY_TOKEN_THRESHOLD', 3000))
+SUMMARY_KEEP_RECENT_MESSAGES = int(os.getenv('SUMMARY_KEEP_RECENT_MESSAGES', 4))
+SUMMARY_MAX_SESSIONS = int(os.getenv('SUMMARY_MAX_SESSIONS', 1000))
+
+# Token budget for what is sent to the model on each agent step (token counts are estimated locally)
+CHARS_PER_TOKEN = int(os.getenv('CHARS_PER_TOKEN', 4))                                # Used to estimate token counts without a tokenizer call
+CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', 24000))                  # The planner system prompt alone is ~6k tokens
+TOOL_OUTPUT_MAX_TOKENS = int(os.getenv('TOOL_OUTPUT_MAX_TOKENS', 1500))               # Larger tool results are replaced by a digest and a handle
+TOOL_OUTPUT_DIGEST_TOKENS = int(os.getenv('TOOL_OUTPUT_DIGEST_TOKENS', 400))          # Target size of a digest
+TOOL_OUTPUT_STORE_MAX_ENTRIES = int(os.getenv('TOOL_OUTPUT_STORE_MAX_ENTRIES', 2048))
+TOOL_OUTPUT_STORE_TTL = float(os.getenv('TOOL_OUTPUT_STORE_TTL', 6 * 60 * 60))        # Full tool results stay re-fetchable for this long
+
+# Durable conversation checkpoints (LangGraph state), kept in SQLite so conversations survive restarts
+CHECKPOINT_DB_PATH = os.getenv('CHECKPOINT_DB_PATH', os.path.join('.cache', 'checkpoints.sqlite3'))
+CHECKPOINT_KEEP_LAST = int(os.getenv('CHECKPOINT_KEEP_LAST', 20))                     # Checkpoints kept per conversation; older ones are compacted away
+CHECKPOINT_THREAD_TTL = float(os.getenv('CHECKPOINT_THREAD_TTL', 30 * 24 * 60 * 60))  # Conversations idle for this long are deleted
+CHECKPOINT_COMPRESS_MIN_BYTES = int(os.getenv('CHECKPOINT_COMPRESS_MIN_BYTES', 1024)) # Larger serialized values are zlib-compressed
+
+# Conversation transcripts: one JSON Lines file per conversation, written on a background thread
+TRANSCRIPT_DIR = os.getenv('TRANSCRIPT_DIR', os.path.join('.cache', 'transcripts'))
+TRANSCRIPT_MAX_BYTES = int(os.getenv('TRANSCRIPT_MAX_BYTES', 1024 * 1024))               # A conversation's file is rotated beyond this size...
+TRANSCRIPT_MAX_AGE = float(os.getenv('TRANSCRIPT_MAX_AGE', 24 * 60 * 60))                # ...or once its first record is this old (seconds)
+TRANSCRIPT_BACKUP_COUNT = int(os.getenv('TRANSCRIPT_BACKUP_COUNT', 5))                    # Rotated files kept per conversation
+TRANSCRIPT_COMPRESS = os.getenv('TRANSCRIPT_COMPRESS', 'true').lower() in ('1', 'true', 'yes')  # gzip rotated files
+TRANSCRIPT_FLUSH_INTERVAL = float(os.getenv('TRANSCRIPT_FLUSH_INTERVAL', 1.0))           # Seconds between flushes to disk
+
+# HTTP serving mode (python -m src.server): one conversation per session, replies streamed as server-sent events
+SERVER_HOST = os.getenv('SERVER_HOST', '127.0.0.1')
+SERVER_PORT = int(os.getenv('SERVER_PORT', 8000))
+SERVER_MAX_SESSIONS = int(os.getenv('SERVER_MAX_SESSIONS', 1000))  # Least recently used sessions are evicted first (their checkpoints stay resumable)
+
+# Persistent cache for Google Maps responses (TTLs in seconds, per endpoint)
+RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', os.path.join('.cache', 'responses.sqlite3'))
+RESPONSE_CACHE_BYPASS = os.getenv('RESPONSE_CACHE_BYPASS', 'false').lower() in ('1', 'true', 'yes')  # Always hit the API (results still refresh the cache)
+GEOCODE_CACHE_TTL = float(os.getenv('GEOCODE_CACHE_TTL', 30 * 24 * 60 * 60))
+REVERSE_GEOCODE_CACHE_TTL = float(os.getenv('REVERSE_GEOCODE_CACHE_TTL', 30 * 24 * 60 * 60))
+PLACE_DETAILS_CACHE_TTL = float(os.getenv('PLACE_DETAILS_CACHE_TTL', 7 * 24 * 60 * 60))
+DIRECTIONS_CACHE_TTL = float(os.getenv('DIRECTIONS_CACHE_TTL', 24 * 60 * 60))
+DISTANCE_MATRIX_CACHE_TTL = float(os.getenv('DISTANCE_MATRIX_CACHE_TTL', 24 * 60 * 60))  # Per origin/destination/mode cell
+
+# Distance Matrix API request limits: origins and destinations per request, and elements (origins x destinations) per request
+DISTANCE_MATRIX_MAX_DIMENSION = int(os.getenv('DISTANCE_MATRIX_MAX_DIMENSION', 25))
+DISTANCE_MATRIX_MAX_ELEMENTS = int(os.getenv('DISTANCE_MATRIX_MAX_ELEMENTS', 100))
+
+# Persistent memoization of LLM-backed helper tools (average visit time, route price), keyed on model id and prompt
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join('.cache', 'llm_answers.sqlite3'))
+LLM_CACHE_BYPASS = os.getenv('LLM_CACHE_BYPASS', 'false').lower() in ('1', 'true', 'yes')  # Always ask the model (answers still refresh the cache)
+LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', 7 * 24 * 60 * 60))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 2000))  # Per tool; the oldest answers are evicted first
+
+# Semantic cache in front of the model for the same tools: similar questions ("National Museum Tokyo") reuse earlier answers
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+SEMANTIC_CACHE_DIR = os.getenv('SEMANTIC_CACHE_DIR', os.path.join('.cache', 'semantic'))
+SEMANTIC_CACHE_MODEL = os.getenv('SEMANTIC_CACHE_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.9))                        # Minimum cosine similarity for a hit
+SEMANTIC_CACHE_ROUTE_PRICE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_ROUTE_PRICE_THRESHOLD', 0.97))  # Routes differing only in distance embed closely
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', 2000))  # Per tool; the oldest questions are evicted first
+SEMANTIC_CACHE_BATCH_SIZE = int(os.getenv('SEMANTIC_CACHE_BATCH_SIZE', 64))
+SEMANTIC_CACHE_BATCH_WINDOW = float(os.getenv('SEMANTIC_CACHE_BATCH_WINDOW', 0.005))  # Seconds to wait for concurrent questions to embed together
+
+# Exchange rate table caching (seconds). ExchangeRate-API refreshes its rates once a day.
+EXCHANGE_RATE_TTL = float(os.getenv('EXCHANGE_RATE_TTL', 60 * 60))                  # Table is served as fresh for this long
+EXCHANGE_RATE_STALE_TTL = float(os.getenv('EXCHANGE_RATE_STALE_TTL', 24 * 60 * 60))   # After that, stale rates are served for this long while refreshing in the background
+
+# Weather forecast caching. OpenWeather refreshes One Call data every 10 minutes.
+WEATHER_CACHE_INTERVAL = int(os.getenv('WEATHER_CACHE_INTERVAL', 10 * 60))            # Entries expire at the next multiple of this many seconds
+WEATHER_CACHE_COORD_PRECISION = int(os.getenv('WEATHER_CACHE_COORD_PRECISION', 1))  # Decimal places kept from lat/long (1 ~ 11 km, so one entry per city area)
+WEATHER_CACHE_MAX_ENTRIES = int(os.getenv('WEATHER_CACHE_MAX_ENTRIES', 512))
+
+# Flight offer search caching. Fares move quickly, so results are only reused for a few minutes.
+FLIGHT_CACHE_TTL = float(os.getenv('FLIGHT_CACHE_TTL', 5 * 60))
+FLIGHT_CACHE_MAX_ENTRIES = int(os.getenv('FLIGHT_CACHE_MAX_ENTRIES', 256))
+
+# Bundled IATA reference data (tab-separated code and name) used before falling back to Amadeus
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+IATA_AIRPORTS_PATH = os.getenv('IATA_AIRPORTS_PATH', os.path.join(_DATA_DIR, 'airports.tsv'))
+IATA_AIRLINES_PATH = os.getenv('IATA_AIRLINES_PATH', os.path.join(_DATA_DIR, 'airlines.tsv'))
+IATA_NAME_CACHE_TTL = float(os.getenv('IATA_NAME_CACHE_TTL', 24 * 60 * 60))    # Names (and misses) fetched from Amadeus are reused for this long
+IATA_NAME_CACHE_MAX_ENTRIES = int(os.getenv('IATA_NAME_CACHE_MAX_ENTRIES', 1024))
+
+# Taxi and transit tariffs per region used to price routes locally (see src/utils/route_costs.py)
+ROUTE_TARIFFS_PATH = os.getenv('ROUTE_TARIFFS_PATH', os.path.join(_DATA_DIR, 'route_tariffs.json'))
+
+# Seconds the itinerary scheduler may spend improving day plans (src/agents/itinerary_scheduler.py)
+ITINERARY_TIME_BUDGET = float(os.getenv('ITINERARY_TIME_BUDGET', 0.5))
+# Share of each day's tour hours the day partitioner fills with visits (the rest is left for travel),
+# and how much farther (km) than its nearest day a place may be sent when that day is full
+DAY_PARTITION_FILL = float(os.getenv('DAY_PARTITION_FILL', 0.8))
+DAY_PARTITION_MAX_DETOUR_KM = float(os.getenv('DAY_PARTITION_MAX_DETOUR_KM', 15))
+
+# Bounds for the per-conversation registry of places already suggested
+VISITED_PLACES_MAX_PER_SESSION = int(os.getenv('VISITED_PLACES_MAX_PER_SESSION', 500))   # Oldest places are evicted first
+VISITED_PLACES_MAX_SESSIONS = int(os.getenv('VISITED_PLACES_MAX_SESSIONS', 1000))        # Least recently used sessions are evicted first
+VISITED_PLACES_TTL_SECONDS = float(os.getenv('VISITED_PLACES_TTL_SECONDS', 6 * 60 * 60)) # Places not seen for this long can be suggested again
+
+# Global state shared across tool calls
+# To keep track of places already suggested/visited to avoid repetition, keyed by conversation thread_id
+VISITED_PLACES = VisitedPlacesRegistry(
+    max_places_per_session=VISITED_PLACES_MAX_PER_SESSION,
+    max_sessions=VISITED_PLACES_MAX_SESSIONS,
+    ttl_seconds=VISITED_PLACES_TTL_SECONDS,
+)
@@ -1,47 +1,89 @@
-from langchain.chat_models import init_chat_model
-from langgraph.checkpoint.memory import MemorySaver
+import argparse
+import asyncio
+import threading
+import uuid
+
 from langgraph.prebuilt import create_react_agent
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import MessagesState
-from langchain_groq import ChatGroq 
-from langchain_openai import ChatOpenAI
-
-from src.config.clients import LLM
-from src.tools.util_tools import *
-from src.tools.amadeus_tools import *
-from src.tools.maps_tools import *
-from src.tools.serpapi_tools import *
-from src.tools.weather_tools import *
-from src.tools.arithmetic_tools import *
-from src.tools.exchange_rate_tools import *
-
-
-memory = MemorySaver()
-
-tools = [
-        get_airport_name,
-        get_airline_name,
-        get_flight_details,
-        get_exchange_rate,
-        get_nearby_places,
-        get_directions,
-        calculate_estimated_route_price,
-        get_place_details,
-        hotel_search_tool,
-        get_geocode_tool,
-        reverse_geocode_tool,
-        calculate_average_time_spent_at_an_address,
-        convert_unix_to_mmddyyyy,
-        convert_unix_to_yyyymmdd,
-        travel_budget_allocator,
-        get_weather_and_forecast,
-        add,
-        multiply,
-        estimate_hotel_cost
-    ]
-
-agent_executor = create_react_agent(LLM, tools, checkpointer=memory)
-config = {"configurable": {"thread_id": "1"}}
+
+from src.config.clients import LLM, get_llm
+from src.agents.context_assembler import ContextAssembler
+from src.agents.itinerary_scheduler import format_timetable
+from src.agents.summarizer import RollingSummarizer
+from src.agents.tool_scheduler import ProviderLimitedToolNode
+from src.config.settings import (
+    SUMMARY_TOKEN_THRESHOLD, SUMMARY_KEEP_RECENT_MESSAGES, SUMMARY_MAX_SESSIONS,
+    CONTEXT_TOKEN_BUDGET, TOOL_OUTPUT_MAX_TOKENS, TOOL_OUTPUT_DIGEST_TOKENS,
+    CHECKPOINT_DB_PATH, CHECKPOINT_KEEP_LAST, CHECKPOINT_THREAD_TTL, CHECKPOINT_COMPRESS_MIN_BYTES,
+    TRANSCRIPT_DIR, TRANSCRIPT_MAX_BYTES, TRANSCRIPT_MAX_AGE, TRANSCRIPT_BACKUP_COUNT, TRANSCRIPT_COMPRESS,
+    TRANSCRIPT_FLUSH_INTERVAL, ENABLED_TOOLS, DISABLED_TOOLS,
+)
+from src.tools.context_tools import TOOL_OUTPUT_STORE, store_tool_output
+from src.tools.registry import load_tools, prune_tool_docs
+from src.utils.http_transport import aclose_async_http_client
+from src.utils.sqlite_checkpointer import SqliteCheckpointSaver
+from src.utils.tokens import content_text
+from src.utils.transcript import TranscriptWriter
+
+
+# Conversation state lives on disk: resumable after a restart, nothing kept in memory per thread
+memory = SqliteCheckpointSaver(
+    CHECKPOINT_DB_PATH,
+    keep_last=CHECKPOINT_KEEP_LAST,
+    ttl_seconds=CHECKPOINT_THREAD_TTL,
+    compress_min_bytes=CHECKPOINT_COMPRESS_MIN_BYTES,
+)
+
+# Per-conversation JSON Lines transcripts, written off the turn path (replay: python -m src.utils.transcript <id>)
+TRANSCRIPTS = TranscriptWriter(
+    TRANSCRIPT_DIR,
+    max_bytes=TRANSCRIPT_MAX_BYTES,
+    max_age_seconds=TRANSCRIPT_MAX_AGE,
+    backup_count=TRANSCRIPT_BACKUP_COUNT,
+    compress=TRANSCRIPT_COMPRESS,
+    flush_interval=TRANSCRIPT_FLUSH_INTERVAL,
+)
+
+# Tools come from the registry: their schemas are known up front, their modules load on first call
+tools = load_tools(ENABLED_TOOLS, DISABLED_TOOLS)
+
+# Keeps every model call within CONTEXT_TOKEN_BUDGET: large tool results become digests with a
+# fetch_tool_output handle, and the oldest exchanges are dropped if that is not enough
+context_assembler = ContextAssembler(
+    TOOL_OUTPUT_STORE,
+    store_tool_output,
+    token_budget=CONTEXT_TOKEN_BUDGET,
+    tool_output_max_tokens=TOOL_OUTPUT_MAX_TOKENS,
+    digest_tokens=TOOL_OUTPUT_DIGEST_TOKENS,
+)
+
+def model_input(state: MessagesState, config: RunnableConfig) -> dict:
+    """
+    pre_model_hook: the checkpointed history holds only the conversation itself (each turn sends
+    just the new user message), so the system prompt and the running summary are put in front
+    of its unsummarized part here, for this model call only, and the result is kept within budget.
+    """
+    history = SUMMARIZER.model_context(config["configurable"]["thread_id"], SYSTEM_MESSAGES, state["messages"])
+    return {"llm_input_messages": context_assembler.assemble(history)}
+
+def build_agent(llm=None, checkpointer=memory):
+    # Tool calls from one model step run concurrently, throttled per upstream provider
+    return create_react_agent(llm or get_llm(), ProviderLimitedToolNode(tools), pre_model_hook=model_input, checkpointer=checkpointer)
+
+_agent_executor = None
+_agent_lock = threading.Lock()
+
+def get_agent_executor():
+    """The app's agent, compiled on first use (it needs the chat model, whose import dominates startup)."""
+    global _agent_executor
+    if _agent_executor is None:
+        with _agent_lock:
+            if _agent_executor is None:
+                _agent_executor = build_agent()
+    return _agent_executor
+config = {"configurable": {"thread_id": "default"}}
 
 messages = [
     {
@@ -54,20 +96,29 @@ messages = [
 
         * get_airport_name(airport_code: str): Retrieves the full name of an airport given its IATA code. (Tool Call: `get_airport_name(airport_code="[airport_code]")`)
         * get_airline_name(airline_code: str): Retrieves the full name of an airline given its IATA code. (Tool Call: `get_airline_name(airline_code="[airline_code]")`)
+        * get_airport_names(iata_codes: list[str]) / get_airline_names(iata_codes: list[str]): Resolve many airport or airline codes in one call. **Use these instead of one call per segment when presenting flight options.** (Tool Call: `get_airline_names(iata_codes=["[code1]", "[code2]"])`)
         * get_flight_details(origin: str, destination: str, date: str, adults: int, children: int = 0): Searches for available flights between origin and destination on a given date for specified passengers. (Tool Call: `get_flight_details(origin="[origin]", destination="[destination]", date="[date]", adults=[adults], children=[children])`)
+        * find_best_flights(origin: str, destination: str, departure_date: str, return_date: str = None, num_guests: int = 1, max_price: float = None, max_stops: int = None, carriers: list[str] = None, top_k: int = 5): Searches flights and returns only the top-k offers with the best price / duration / stops trade-off, as compact summaries. **Prefer this over `get_flight_details`.** (Tool Call: `find_best_flights(origin="[origin]", destination="[destination]", departure_date="[date]", num_guests=[num_guests])`)
+        * get_flight_offer_details(flight_id: str, origin: str, destination: str, departure_date: str, ...): Returns the full offer (segments, cabin, baggage) for a `flight_id` from `find_best_flights`; pass the same search arguments. (Tool Call: `get_flight_offer_details(flight_id="[flight_id]", origin="[origin]", destination="[destination]", departure_date="[date]")`)
         * get_exchange_rate(from_currency: str, to_currency: str): Fetches the real-time exchange rate between two currencies. (Tool Call: `get_exchange_rate(from_currency="[from_currency]", to_currency="[to_currency]")`)
+        * convert_currency_batch(conversions: list): Converts many amounts between currencies in one call; each item has `amount`, `from_currency` and `to_currency`. Prefer this over repeated `get_exchange_rate` calls when converting several prices. (Tool Call: `convert_currency_batch(conversions=[{"amount": [amount], "from_currency": "[from_currency]", "to_currency": "[to_currency]"}, ...])`)
         * get_nearby_places(latitude: float, longitude: float, radius_km: float, place_type: str): Finds points of interest within a specified radius of coordinates. (Tool Call: `get_nearby_places(latitude=[latitude], longitude=[longitude], radius_km=[radius_km], place_type="[place_type]")`)
         * get_directions(origin_address: str, destination_address: str, mode: str = "driving"): Provides directions, total duration, and total distance between two addresses. (Tool Call: `get_directions(origin_address="[origin_address]", destination_address="[destination_address]", mode="[mode]")`)
-        * calculate_estimated_route_price(route: Route): Estimates the cost of a route (driving, walking) considering distance, duration, and implied complexity. (Tool Call: `calculate_estimated_route_price(route=[route_object])`)
+        * get_travel_time_matrix(places: list[str], destinations: list[str] = None, modes: list[str] = None): Returns travel times (seconds) and distances (meters) between every pair of places, per mode, in one call. **Prefer this over repeated `get_directions` calls when ordering or comparing several places.** (Tool Call: `get_travel_time_matrix(places=["[place_1]", "[place_2]", "[place_3]"], modes=["walking", "transit"])`)
+        * group_places_by_day(places: list[dict], num_days: int): Splits candidate places (name, location, lat, lng, kind, visit_hours) into one geographic group per day, each within the hours a day can hold, so days stay in one area and multi-city trips go city by city. (Tool Call: `group_places_by_day(places=[{"name": "[name]", "location": "[address]", "lat": [latitude], "lng": [longitude], "visit_hours": [hours]}, ...], num_days=[num_days])`)
+        * plan_itinerary(places: list[dict], num_days: int, start_date: str = None, hotel: str = None, mode: str = "transit"): Orders candidate attractions and restaurants (name, location, kind, visit_hours, opens, closes) into feasible day plans that follow the `daily_timetable`, respecting opening hours and keeping travel short, with arrival and visit times for every stop. **Use this to draft the daily itinerary instead of ordering places by hand.** (Tool Call: `plan_itinerary(places=[{"name": "[name]", "location": "[address]", "kind": "attraction", "visit_hours": [hours]}, ...], num_days=[num_days], start_date="[start_date]", hotel="[hotel_address]")`)
+        * calculate_estimated_route_price(origin: str, destination: str, directions: list, total_duration: str, total_distance: str, travel_mode: str = None, fare: dict = None): Estimates the cost of a route returned by `get_directions` (Google's fare when present, otherwise local taxi/transit tariffs; walking and cycling are free). Pass the route's fields. (Tool Call: `calculate_estimated_route_price(origin="[origin_add]", destination="[destination_add]", directions=[directions], total_duration="[total_duration]", total_distance="[total_distance]", travel_mode="[travel_mode]", fare=[fare])`)
         * get_place_details(place_id: str): Retrieves detailed information about a specific place using its ID (obtained from `get_nearby_places`). (Tool Call: `get_place_details(place_id="[place_id]")`)
         * hotel_search_tool(location: str, adults: int, checkin: str, checkout: str): Searches for hotels in a specified location for given dates and number of adults. (Tool Call: `hotel_search_tool(location="[location]", adults=[adults], checkin="[checkin]", checkout="[checkout]")`)
         * get_geocode_tool(address: str): Converts a human-readable address into geographical coordinates (latitude, longitude). (Tool Call: `get_geocode_tool(address="[address]")`)
         * reverse_geocode_tool(latitude: float, longitude: float): Converts geographical coordinates (latitude, longitude) into a human-readable address. (Tool Call: `reverse_geocode_tool(latitude=[latitude], longitude=[longitude])`)
+        * reverse_geocode_batch(coordinates: list): Converts many coordinates (each `{"lat": ..., "lng": ...}`) into addresses in one call. Use it for the hotels or places the user shortlists. (Tool Call: `reverse_geocode_batch(coordinates=[{"lat": [latitude], "lng": [longitude]}, ...])`)
         * calculate_average_time_spent_at_an_address(place_type: str): **Estimates the typical time a user might spend at a location based on its *type*** (e.g., "museum", "restaurant"). (Tool Call: `calculate_average_time_spent_at_an_address(place_type="[place_type]")`)
         * convert_unix_to_mmddyyyy(unix_timestamp: int): Converts a Unix timestamp to MM/DD/YYYY format. (Tool Call: `convert_unix_to_mmddyyyy(unix_timestamp=[unix_timestamp])`)
         * convert_unix_to_yyyymmdd(unix_timestamp: int): Converts a Unix timestamp to Букмекерлар-MM-DD format. (Tool Call: `convert_unix_to_yyyymmdd(unix_timestamp=[unix_timestamp])`)
         * travel_budget_allocator(total_budget: float, num_days: int, trip_type: str): Allocates a total budget across various travel categories (flights, accommodation, food, activities). (Tool Call: `travel_budget_allocator(total_budget=[total_budget], num_days=[num_days], destination_type="[destination_type]")`)
         * get_weather_and_forecast(lat: float,long: float, metric: str): Provides weather conditions and forecast for a specific latitude, logitude and metric. (Tool Call: `get_weather_and_forecast(latitude=[latitude], longitude=[longitude], metric=["metric])`)
+        * fetch_tool_output(handle: str, offset: int = 0): Large tool results are shown as a digest ending in a handle; call this only when you need details missing from the digest. Long outputs come in pages; pass the returned `next_offset` to continue. (Tool Call: `fetch_tool_output(handle="[handle]")`)
         * add(num1: float, num2: float): Adds two numbers. (Tool Call: `add(num1=[num1], num2=[num2])`)
         * multiply(num1: float, num2: float): Multiplies two numbers. (Tool Call: `multiply(num1=[num1], num2=[num2])`)
         * estimate_hotel_cost(hotel_name: str, checkin_date: str, checkout_date: str, num_adults: int): Estimates the cost for a specific hotel stay. (Tool Call: `estimate_hotel_cost(hotel_name="[hotel_name]", checkin_date="[checkin_date]", checkout_date="[checkout_date]", num_adults=[num_adults])`)
@@ -86,12 +137,14 @@ messages = [
         Phase 2: Core Travel Logistics (Flights & Accommodation)
 
         3.  **Flight Search (if applicable):**
-            * If flight details are required, use `get_flight_details` with the origin, destination, dates, and passenger counts. (Tool Call: `get_flight_details(origin="[origin]", destination="[destination]", date="[date]", adults=[adults], children=[children])`)
-            * For specific airport or airline names, use `get_airport_name` or `get_airline_name` as needed. (Tool Call: `get_airport_name(airport_code="[airport_code]")` or `get_airline_name(airline_code="[airline_code]")`)
+            * If flight details are required, use `find_best_flights` with the origin, destination, dates, and passenger counts, adding `max_price`, `max_stops` or `carriers` when the user has constraints. (Tool Call: `find_best_flights(origin="[origin]", destination="[destination]", departure_date="[date]", num_guests=[num_guests])`)
+            * Only call `get_flight_offer_details` for the option(s) the user is interested in. (Tool Call: `get_flight_offer_details(flight_id="[flight_id]", origin="[origin]", destination="[destination]", departure_date="[date]")`)
+            * For airport or airline names, collect every code across the offers you present and resolve them with a single `get_airport_names` / `get_airline_names` call. Use `get_airport_name` or `get_airline_name` only for a one-off code. (Tool Call: `get_airline_names(iata_codes=["[code1]", "[code2]"])`)
             * Record potential flight options (airlines, times, estimated costs).
         4.  **Accommodation Search:**
             * Use `hotel_search_tool` to find available hotels in the destination city for the specified dates and number of adults. (Tool Call: `hotel_search_tool(location="[location]", adults=[adults], checkin="[checkin]", checkout="[checkout]")`)
             * Prioritize results based on relevance, rating, and any user-specified preferences (e.g., "luxury," "budget-friendly," "pet-friendly").
+            * Hotel results only include the address SerpAPI provides. Once you have shortlisted hotels, resolve any missing addresses with a single `reverse_geocode_batch` call. (Tool Call: `reverse_geocode_batch(coordinates=[{"lat": [latitude], "lng": [longitude]}, ...])`)
             * Use `estimate_hotel_cost` for a quick price estimation of promising options. (Tool Call: `estimate_hotel_cost(hotel_name="[hotel_name]", checkin_date="[checkin_date]", checkout_date="[checkout_date]", num_adults=[num_adults])`)
 
         Phase 3: Detailed Daily Itinerary & Local Exploration
@@ -99,14 +152,7 @@ messages = [
         5.  **Integrate Daily Timetable:** Utilize the following `daily_timetable` as a structural guide for each full day of the trip.
             ```python
             daily_timetable = [
-                {"time": "7:00 AM", "slot_name": "Wake up / Get ready", "duration_hours": 1},
-                {"time": "8:00 AM - 9:00 AM", "slot_name": "Hotel Breakfast", "duration_hours": 1},
-                {"time": "9:00 AM - 1:00 PM", "slot_name": "Morning Tour", "duration_hours": 4},
-                {"time": "1:00 PM - 3:00 PM", "slot_name": "Lunch at nearby place", "duration_hours": 2},
-                {"time": "3:00 PM - 8:00 PM", "slot_name": "Afternoon Tour", "duration_hours": 5},
-                {"time": "8:00 PM - 10:00 PM", "slot_name": "Dinner at nearby place", "duration_hours": 2},
-                {"time": "10:00 PM - 11:00 PM", "slot_name": "Explore / Take a walk", "duration_hours": 1},
-                {"time": "11:00 PM", "slot_name": "Sleep", "duration_hours": 0}
+                <DAILY_TIMETABLE>
             ]
             ```
             **For EACH full day of the trip, iterate through the `daily_timetable` slots.**
@@ -133,9 +179,14 @@ messages = [
             * **Restaurant Search:** Use `get_nearby_places` with `place_type="restaurant"` around the current activity's location or hotel. Suggest restaurants that align with any user preferences (e.g., cuisine type, price level). (Tool Call: `get_nearby_places(latitude=[latitude], longitude=[longitude], radius_km=[radius_km], place_type="restaurant")`)
             * **Time Estimation for Meals:** After selecting a restaurant, use `calculate_average_time_spent_at_an_address(place_type="restaurant")` to estimate the typical duration for the meal. Ensure this estimated time fits the slot. (Tool Call: `calculate_average_time_spent_at_an_address(place_type="restaurant")`)
 
+            Once you have candidate attractions, activities and restaurants for the whole trip (with their estimated visit times and, when known, opening hours):
+            * **Split by Area (multi-city or long trips):** To decide which city or neighbourhood each day covers, call `group_places_by_day` once with every candidate and their coordinates instead of dividing them by hand. (Tool Call: `group_places_by_day(places=[...], num_days=[num_days])`)
+            * **Draft the Days:** Call `plan_itinerary` once with all of them (including `lat`/`lng`, so that each day stays in one area), the number of days, the start date and the hotel address. Use its day plans (stops, arrival times, travel minutes) as the itinerary and only swap places when the user asks; anything it returns as `unscheduled` did not fit. (Tool Call: `plan_itinerary(places=[...], num_days=[num_days], start_date="[start_date]", hotel="[hotel_address]", mode="[mode]")`)
+
         6.  **Local Transportation Planning:**
             * For travel between key locations within the daily plan (e.g., hotel to morning tour, morning tour to lunch, lunch to afternoon tour, afternoon tour to dinner), use `get_directions` to calculate travel time and distance. Consider different `mode` options ("driving", "walking", "transit" if implied). (Tool Call: `get_directions(origin_address="[origin_address]", destination_address="[destination_address]", mode="[mode]")`)
-            * Use `calculate_estimated_route_price` for each significant route to estimate local transportation costs. (Tool Call: `calculate_estimated_route_price(route=[route_object])`)
+            * To order the day's places (hotel, tours, lunch, dinner) or compare travel options between them, first call `get_travel_time_matrix` once with all of them and the candidate modes, then use `get_directions` only for the legs you keep. (Tool Call: `get_travel_time_matrix(places=["[hotel_address]", "[place_1_address]", "[place_2_address]"], modes=["[mode]"])`)
+            * Use `calculate_estimated_route_price` for each significant route to estimate local transportation costs. (Tool Call: `calculate_estimated_route_price(origin="[origin_add]", destination="[destination_add]", directions=[directions], total_duration="[total_duration]", total_distance="[total_distance]", travel_mode="[travel_mode]", fare=[fare])`)
         7.  **Weather Forecast:**
             * Obtain the weather forecast for the destination city during the travel dates using `get_weather_and_forecast`. (Tool Call: `get_weather_and_forecast(location="[location]", date="[date]")`)
 
@@ -143,6 +194,7 @@ messages = [
 
         8.  **Currency Conversion:**
             * If the user's home currency differs from the destination currency, use `get_exchange_rate` to provide relevant conversion information. (Tool Call: `get_exchange_rate(from_currency="[from_currency]", to_currency="[to_currency]")`)
+            * To convert several prices at once (e.g., hotel, meal and activity costs across multiple countries), use a single `convert_currency_batch` call. (Tool Call: `convert_currency_batch(conversions=[...])`)
         9.  **Budget Allocation:**
             * If a `total_budget` is provided, use `travel_budget_allocator` to suggest a breakdown of expenses across categories (flights, accommodation, food, activities, local transport). (Tool Call: `travel_budget_allocator(total_budget=[total_budget], duration_days=[num_days], trip_type=[trip_type])`)
             * Use `add` and `multiply` for any necessary calculations, such as total cost for multiple days/travelers or summing up various expense categories. (Tool Call: `add(num1=[num1], num2=[num2])` or `multiply(num1=[num1], num2=[num2])`)
@@ -253,66 +305,166 @@ messages = [
     }
 ]
 
-def trim_and_summarize_messages(state: MessagesState):
-    system_prompt = (
-        "You are a helpful assistant. "
-        "Answer all questions to the best of your ability. "
-        "The provided chat history includes a summary of the earlier conversation."
-    )
-    system_message = SystemMessage(content=system_prompt)
-    message_history = state["messages"][:-1]  
-
-    if len(message_history) >= 4:
-        last_human_message = state["messages"][-1]
-        summary_prompt = (
-            "Distill the above chat messages into a single summary message. "
-            "Include as many specific details as you can."
-        )
-
-        summary_message = LLM.invoke(
-            message_history + [HumanMessage(content=summary_prompt)]
-        )
-
-        new_messages = [
-            system_message,
-            summary_message,
-            HumanMessage(content=last_human_message.content),
-        ]
-        return {"messages": new_messages}
+# The timetable in the prompt is the one plan_itinerary schedules with
+messages[0]["content"] = messages[0]["content"].replace("<DAILY_TIMETABLE>", format_timetable().replace("\n", ",\n" + " " * 16))
+# Tools left out of this deployment are not described to the model either
+messages[0]["content"] = prune_tool_docs(messages[0]["content"], [t.name for t in tools])
+
+SYSTEM_MESSAGES = [dict(m) for m in messages]
+
+def new_messages() -> list:
+    """Returns a fresh conversation history holding only the planner system prompt."""
+    return [dict(m) for m in SYSTEM_MESSAGES]
+
+def restore_messages(history: list) -> list:
+    """Rebuilds a conversation's role/content history from its checkpointed graph messages."""
+    messages = new_messages()
+    for message in history:
+        if isinstance(message, HumanMessage):
+            messages.append({"role": "user", "content": content_text(message.content)})
+        elif isinstance(message, AIMessage) and not message.tool_calls:
+            messages.append({"role": "assistant", "content": content_text(message.content)})
+    return messages
+
+# Folds older turns into a running summary in the background, so turns never wait on summarization
+SUMMARIZER = RollingSummarizer(
+    LLM,
+    token_threshold=SUMMARY_TOKEN_THRESHOLD,
+    keep_recent_messages=SUMMARY_KEEP_RECENT_MESSAGES,
+    max_sessions=SUMMARY_MAX_SESSIONS,
+)
+
+def turn_input(user_input: str) -> MessagesState:
+    """The agent input for one turn: only the new user message, appended to the checkpointed history."""
+    return {"messages": [HumanMessage(content=user_input)]}
+
+async def astream_turn(messages: list, user_input: str, thread_config: dict, agent=None):
+    """
+    Runs one conversation turn and yields its progress as (event, payload) pairs:
+    ("token", {"text"}) for model output as it is generated, ("tool_start", {"id", "name", "args"})
+    and ("tool_end", {"id", "name", "status", "timing", "preview"}) around each tool call, and
+    finally ("done", {"message", "messages"}) with the final assistant message and the updated history,
+    or ("error", {"detail"}) if the agent produced no assistant message (the history is then left as is).
+    Args:
+        messages (list): The conversation's role/content history, including the system prompt.
+        user_input (str): The user's new message.
+        thread_config (dict): Runnable config carrying this conversation's thread_id.
+        agent: The compiled agent graph; get_agent_executor() by default.
+    """
+    agent = agent or get_agent_executor()
+    thread_id = thread_config["configurable"]["thread_id"]
+    messages = messages + [{"role": "user", "content": user_input}]
+    TRANSCRIPTS.record(thread_id, "user", user_input)
+    last, tool_calls = None, []
+    async for mode, data in agent.astream(turn_input(user_input), thread_config, stream_mode=["messages", "updates"]):
+        if mode == "messages":
+            chunk, metadata = data
+            if metadata.get("langgraph_node") == "agent" and isinstance(chunk.content, str) and chunk.content:
+                yield "token", {"text": chunk.content}
+            continue
+        for update in data.values():
+            for message in (update.get("messages", []) if isinstance(update, dict) else []):
+                if isinstance(message, AIMessage):
+                    last = message
+                    for call in message.tool_calls:
+                        tool_calls.append(call["name"])
+                        yield "tool_start", {"id": call["id"], "name": call["name"], "args": call["args"]}
+                elif isinstance(message, ToolMessage):
+                    yield "tool_end", {
+                        "id": message.tool_call_id,
+                        "name": message.name,
+                        "status": message.status,
+                        "timing": message.response_metadata.get("timing"),
+                        "preview": str(message.content)[:200],
+                    }
+    if last is None:
+        TRANSCRIPTS.record(thread_id, "event", "turn ended without an assistant message", tools=tool_calls)
+        yield "error", {"detail": "The agent finished the turn without an assistant message."}
+        return
+    messages = messages + [{"role": "assistant", "content": last.content}]
+    TRANSCRIPTS.record(thread_id, "assistant", last.content, tools=tool_calls)
+    SUMMARIZER.acompact_in_background(thread_id, messages)
+    yield "done", {"message": last, "messages": messages}
+
+async def arun_turn(messages: list, user_input: str, thread_config: dict):
+    """
+    Runs one conversation turn with the agent's astream.
+    Tools are awaited through their async variants, so many conversations (each with its own
+    messages list and thread_id) can run concurrently on one event loop.
+    Args:
+        messages (list): The conversation's role/content history, including the system prompt.
+        user_input (str): The user's new message.
+        thread_config (dict): Runnable config carrying this conversation's thread_id.
+    Returns:
+        tuple: (reply, updated messages) where reply is the final assistant message.
+    """
+    async for event, payload in astream_turn(messages, user_input, thread_config):
+        if event == "done":
+            return payload["message"], payload["messages"]
+        if event == "error":
+            raise RuntimeError(payload["detail"])
+
+def run_chat():
+    global messages
+    thread_id = config["configurable"]["thread_id"]
+    TRANSCRIPTS.record(thread_id, "event", "session started")
+    try:
+        while True:
+            user_input = input("You: ")
+            if user_input.lower() in {"exit", "quit"}:
+                print("Exiting chat. Have a great trip! ✈️")
+                TRANSCRIPTS.record(thread_id, "event", "session ended")
+                break
+
+            messages.append({"role": "user", "content": user_input})
+            TRANSCRIPTS.record(thread_id, "user", user_input)
+
+            for step in get_agent_executor().stream(turn_input(user_input), config, stream_mode="values"):
+                last = step["messages"][-1]
+                try:
+                    last.pretty_print()
+                except UnicodeEncodeError:
+                    print(last.content)  
+
+            TRANSCRIPTS.record(thread_id, "assistant", last.content)
+            messages.append({"role": "assistant", "content": last.content})
+            SUMMARIZER.compact_in_background(thread_id, messages)
+    finally:
+        TRANSCRIPTS.close()
+
+async def arun_chat():
+    """Async REPL driver; the same loop a server would run per conversation."""
+    global messages
+    thread_id = config["configurable"]["thread_id"]
+    TRANSCRIPTS.record(thread_id, "event", "session started")
+    try:
+        while True:
+            user_input = await asyncio.to_thread(input, "You: ")
+            if user_input.lower() in {"exit", "quit"}:
+                print("Exiting chat. Have a great trip! ✈️")
+                TRANSCRIPTS.record(thread_id, "event", "session ended")
+                break
+            last, messages = await arun_turn(messages, user_input, config)
+            try:
+                last.pretty_print()
+            except UnicodeEncodeError:
+                print(last.content)
+    finally:
+        TRANSCRIPTS.close()
+        await aclose_async_http_client()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI travel and expense planner chat")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Run the asyncio chat loop")
+    parser.add_argument("--thread", help="Conversation id to resume; a new conversation is started if omitted")
+    args = parser.parse_args()
+
+    memory.purge_expired()
+    config["configurable"]["thread_id"] = args.thread or uuid.uuid4().hex
+    print(f"Conversation id: {config['configurable']['thread_id']} (resume with --thread {config['configurable']['thread_id']})")
+    # Build the agent while the user types the first message
+    threading.Thread(target=get_agent_executor, daemon=True).start()
+    if args.use_async:
+        asyncio.run(arun_chat())
     else:
-        return state
-
-with open("chat.txt", "w" , encoding="utf-8") as log_file:
-    log_file.write("=== Chat Session Started ===\n\n")
-
-while True:
-    user_input = input("You: ")
-    if user_input.lower() in {"exit", "quit"}:
-        print("Exiting chat. Have a great trip! ✈️")
-        with open("chat.txt", "a") as log_file:
-            log_file.write("\n=== Chat Session Ended ===\n")
-
-        break
-
-    messages.append({"role": "user", "content": user_input})
-
-    state = {"messages": [HumanMessage(content=m["content"]) if m["role"] == "user" 
-                          else SystemMessage(content=m["content"]) 
-                          for m in messages]}
-
-    trimmed_state = trim_and_summarize_messages(state)
-
-    for step in agent_executor.stream(trimmed_state, config, stream_mode="values"):
-        last = step["messages"][-1]
-        try:
-            last.pretty_print()
-        except UnicodeEncodeError:
-            print(last.content)  
-
-    with open("chat.txt", "a"  , encoding="utf-8") as log_file:
-        log_file.write(f"User: {user_input}\n")
-        log_file.write(f"Assistant: {last.content}\n\n")
-
-    messages = [{"role": "user" if isinstance(m, HumanMessage) else "system", "content": m.content}
-                for m in trimmed_state["messages"]]
-    messages.append({"role": "assistant", "content": last.content})
\ No newline at end of file
+        run_chat()
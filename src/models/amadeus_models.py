@@ -1,3 +1,4 @@
+from functools import cached_property
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
@@ -26,6 +27,14 @@ class TravelerPricing(BaseModel):
     travelerId: str
     fareDetailsBySegment: List[SegmentPricingDetails]
 
+    @cached_property
+    def fare_details_by_segment_id(self) -> Dict[str, SegmentPricingDetails]:
+        """Index of fareDetailsBySegment by segmentId (first entry wins, as with a linear scan)."""
+        index: Dict[str, SegmentPricingDetails] = {}
+        for details in self.fareDetailsBySegment:
+            index.setdefault(details.segmentId, details)
+        return index
+
 class DepartureArrivalLocation(BaseModel):
     """Details for departure/arrival airport."""
     iataCode: str
@@ -59,34 +68,35 @@ class FlightOffer(BaseModel):
     """
     Main Pydantic model for a simplified Amadeus flight offer,
     capturing the requested fields.
+    Derived properties are computed on first access and cached on the instance.
     """
     flight_id: str = Field(..., alias='id')
     itineraries: List[Itinerary]
     price: Price
     travelerPricings: List[TravelerPricing]
 
-    @property
+    @cached_property
     def origin(self) -> Optional[str]:
         """Returns the Airport Name/IATA code of the first segment's departure airport."""
         if self.itineraries and self.itineraries[0].segments:
             return self.itineraries[0].segments[0].departure.iataCode
         return None
 
-    @property
+    @cached_property
     def destination(self) -> Optional[str]:
         """Returns the Airport Name/IATA of the last segment's arrival airport."""
         if self.itineraries and self.itineraries[0].segments:
             return self.itineraries[0].segments[-1].arrival.iataCode
         return None
 
-    @property
+    @cached_property
     def departure_date(self) -> Optional[str]:
         """Returns the departure date of the first segment."""
         if self.itineraries and self.itineraries[0].segments:
             return self.itineraries[0].segments[0].departure.at.split('T')[0]
         return None
 
-    @property
+    @cached_property
     def arrival_date(self) -> Optional[str]:
         """Returns the arrival date of the last segment."""
         if self.itineraries and self.itineraries[0].segments:
@@ -98,7 +108,7 @@ class FlightOffer(BaseModel):
         """Returns the currency of the offer."""
         return self.price.currency
 
-    @property
+    @cached_property
     def duration(self) -> str:
         """Returns the total duration of the first itinerary."""
         if self.itineraries:
@@ -110,7 +120,7 @@ class FlightOffer(BaseModel):
         """Returns the grand total price."""
         return self.price.grandTotal
 
-    @property
+    @cached_property
     def segments_info(self) -> List[Dict[str, Any]]:
         """
         Extracts detailed segment information including cabin, baggage, and amenities
@@ -137,10 +147,7 @@ class FlightOffer(BaseModel):
 
             # Find corresponding pricing details for this segment
             if first_traveler_pricing:
-                segment_pricing_detail = next(
-                    (spd for spd in first_traveler_pricing.fareDetailsBySegment if spd.segmentId == segment.id),
-                    None
-                )
+                segment_pricing_detail = first_traveler_pricing.fare_details_by_segment_id.get(segment.id)
                 if segment_pricing_detail:
                     segment_details["cabin"] = segment_pricing_detail.cabin
                     segment_details["includedCheckedBags"] = segment_pricing_detail.includedCheckedBags.quantity if segment_pricing_detail.includedCheckedBags else 0
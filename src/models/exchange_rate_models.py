@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+class CurrencyConversion(BaseModel):
+    """A single amount to convert between two currencies."""
+    amount: float = Field(..., description="The amount to convert.")
+    from_currency: str = Field(..., description="ISO 4217 code of the currency to convert from (e.g., 'USD').")
+    to_currency: str = Field(..., description="ISO 4217 code of the currency to convert to (e.g., 'JPY').")
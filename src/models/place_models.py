@@ -23,4 +23,16 @@ class Place(BaseModel):
     place_id: str
     rating: float
     user_ratings_total: int
-    place_details: PlaceDetails
\ No newline at end of file
+    place_details: PlaceDetails
+
+class ItineraryPlace(BaseModel):
+    """A candidate stop for the itinerary scheduler."""
+    name: str
+    location: str                         # Address, place name or "lat,lng": anything the Distance Matrix API accepts
+    kind: str = "attraction"              # "attraction" (tour slots) or "restaurant" (meal slots)
+    visit_hours: Optional[float] = None   # Time spent there; 2 hours for attractions and 1 for restaurants if omitted
+    opens: Optional[str] = None           # Local opening time, "HH:MM"; open all day if omitted
+    closes: Optional[str] = None          # Local closing time, "HH:MM"
+    place_id: Optional[str] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
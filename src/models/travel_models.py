@@ -81,7 +81,8 @@ class Route(BaseModel):
     directions: list[Direction]
     total_duration: str
     total_distance: str
-    fare: dict
+    fare: dict = {}            # Google's fare ({'currency', 'value', 'text'}), when the route has one
+    travel_mode: str = "driving"
 
     def __str__(self):
         if not self.origin_add or not self.destination_add or not self.directions:
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from src.config import clients
+from src.config.settings import SERVER_HOST, SERVER_MAX_SESSIONS, SERVER_PORT, VISITED_PLACES
+from src.main import SUMMARIZER, TRANSCRIPTS, astream_turn, get_agent_executor, memory, new_messages, restore_messages
+from src.utils.http_transport import aclose_async_http_client
+
+
+class CreateSessionRequest(BaseModel):
+    session_id: Optional[str] = None  # Resume a checkpointed conversation (its checkpoints are kept across restarts)
+
+
+class MessageRequest(BaseModel):
+    content: str
+
+
+class _Session:
+    def __init__(self, session_id: str, messages: Optional[list] = None):
+        self.session_id = session_id
+        self.messages = messages or new_messages()
+        self.config = {"configurable": {"thread_id": session_id}}
+        self.lock = asyncio.Lock()  # One turn at a time per conversation
+        self.turns = sum(1 for m in self.messages if m["role"] == "user")
+        self.created_at = time.time()
+
+
+class SessionStore:
+    """
+    In-memory conversations by session id, least recently used evicted beyond max_sessions.
+    Each session has its own message history, runnable config (so its thread_id keys the
+    checkpoints and the visited-places registry) and turn lock. An evicted session loses only
+    its in-memory history; its checkpointed state is still there if it is resumed.
+    """
+
+    def __init__(self, max_sessions: int = SERVER_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+
+    def create(self, session_id: Optional[str] = None, messages: Optional[list] = None) -> _Session:
+        session_id = session_id or uuid.uuid4().hex
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session(session_id, messages)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def get(self, session_id: str) -> Optional[_Session]:
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def remove(self, session_id: str) -> Optional[_Session]:
+        return self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Formats one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def create_app(agent=None, checkpointer=None, max_sessions: int = SERVER_MAX_SESSIONS) -> FastAPI:
+    """
+    Builds the HTTP API. Every session is an independent conversation; turns of different
+    sessions run concurrently on the event loop (tools are awaited through their async variants).
+    Args:
+        agent: The compiled agent graph; get_agent_executor() by default.
+        checkpointer: The agent's checkpointer, used to delete a session's state; memory by default.
+        max_sessions (int): Number of sessions kept in memory.
+    """
+    agent = agent or get_agent_executor()
+    checkpointer = checkpointer or memory
+    sessions = SessionStore(max_sessions)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await asyncio.to_thread(TRANSCRIPTS.close)
+        await aclose_async_http_client()
+
+    app = FastAPI(title="AI travel and expense planner", lifespan=lifespan)
+    app.state.sessions = sessions
+
+    def get_session(session_id: str) -> _Session:
+        session = sessions.get(session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail=f"Unknown session: {session_id}")
+        return session
+
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        return {"status": "ok", "sessions": len(sessions), "summarizer": SUMMARIZER.stats(), "transcripts": TRANSCRIPTS.stats(),
+                "llm_cache": clients.LLM_CACHE.stats()}
+
+    @app.post("/sessions", status_code=201)
+    async def create_session(request: Optional[CreateSessionRequest] = None) -> Dict[str, Any]:
+        session_id = request.session_id if request else None
+        if session_id is None or sessions.get(session_id) is not None:
+            return {"session_id": sessions.create(session_id).session_id}
+        # Resuming: the history comes back from the checkpoints, so the next turn continues the thread
+        saved = await checkpointer.aget_tuple({"configurable": {"thread_id": session_id}})
+        if saved is None:
+            raise HTTPException(status_code=404, detail=f"No saved conversation to resume: {session_id}")
+        session = sessions.create(session_id, restore_messages(saved.checkpoint["channel_values"].get("messages", [])))
+        return {"session_id": session.session_id}
+
+    @app.get("/sessions/{session_id}")
+    async def read_session(session_id: str) -> Dict[str, Any]:
+        session = get_session(session_id)
+        return {
+            "session_id": session.session_id,
+            "turns": session.turns,
+            "busy": session.lock.locked(),
+            "messages": [m for m in session.messages if m["role"] != "system"],
+            "visited_places": VISITED_PLACES.session_places(session_id),
+        }
+
+    @app.delete("/sessions/{session_id}", status_code=204)
+    async def delete_session(session_id: str) -> None:
+        if sessions.remove(session_id) is None:
+            raise HTTPException(status_code=404, detail=f"Unknown session: {session_id}")
+        VISITED_PLACES.clear_session(session_id)
+        await checkpointer.adelete_thread(session_id)
+
+    @app.post("/sessions/{session_id}/messages")
+    async def post_message(session_id: str, request: MessageRequest) -> StreamingResponse:
+        """Runs one turn and streams it as server-sent events: token, tool_start, tool_end, then done (or error)."""
+        session = get_session(session_id)
+
+        async def events() -> AsyncIterator[str]:
+            async with session.lock:
+                started = time.perf_counter()
+                try:
+                    async for event, payload in astream_turn(session.messages, request.content, session.config, agent=agent):
+                        if event == "done":
+                            session.messages = payload["messages"]
+                            session.turns += 1
+                            payload = {
+                                "reply": payload["message"].content,
+                                "turn": session.turns,
+                                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                            }
+                        yield sse_event(event, payload)
+                except Exception as e:
+                    print(f"Error running turn for session {session_id}: {e}")
+                    yield sse_event("error", {"detail": str(e)})
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    memory.purge_expired()
+    uvicorn.run(create_app(), host=SERVER_HOST, port=SERVER_PORT)
@@ -1,9 +1,109 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from langchain_core.tools import tool
 from amadeus import ResponseError, Location
 from ..models.amadeus_models import FlightOffer
-from ..config.clients import AMADEUS_CLIENT
-from ..config.settings import BASE_CURRENCY
+from ..config import clients
+from ..config.settings import (
+    BASE_CURRENCY,
+    IATA_AIRPORTS_PATH,
+    IATA_AIRLINES_PATH,
+    IATA_NAME_CACHE_TTL,
+    IATA_NAME_CACHE_MAX_ENTRIES,
+    FLIGHT_CACHE_TTL,
+    FLIGHT_CACHE_MAX_ENTRIES,
+)
+from ..utils.flight_offers import FlightOfferTable
+from ..utils.iata_index import IataIndex
+from ..utils.single_flight import SingleFlight
+from ..utils.ttl_cache import TTLCache
+from ..utils.async_tools import offload_blocking
+
+# Local IATA reference data; Amadeus is only queried for codes missing from the bundled files
+AIRPORT_INDEX = IataIndex(code_length=3, path=IATA_AIRPORTS_PATH)
+AIRLINE_INDEX = IataIndex(code_length=2, path=IATA_AIRLINES_PATH)
+# Names fetched from Amadeus for codes the files don't have, keyed by ("airport" | "airline", code).
+# Unknown codes are cached too (as None), so a miss isn't looked up again on every mention.
+IATA_NAME_CACHE = TTLCache(max_size=IATA_NAME_CACHE_MAX_ENTRIES, ttl=IATA_NAME_CACHE_TTL)
+
+# Raw flight-offers payloads keyed by the full search, so results can be re-filtered or
+# re-parsed without another Amadeus request. Concurrent identical searches share one request.
+FLIGHT_CACHE = TTLCache(max_size=FLIGHT_CACHE_MAX_ENTRIES, ttl=FLIGHT_CACHE_TTL)
+FLIGHT_SEARCHES = SingleFlight()
+
+# Set to a client object to use instead of the configured one (tests, benchmarks)
+AMADEUS_CLIENT = None
+
+def get_amadeus_client():
+    """The Amadeus client to use, or None if none is configured."""
+    return AMADEUS_CLIENT if AMADEUS_CLIENT is not None else clients.get_amadeus_client()
+
+def refresh_iata_reference() -> None:
+    """Reloads the bundled airport and airline files, forgetting names learned from Amadeus."""
+    AIRPORT_INDEX.reload()
+    AIRLINE_INDEX.reload()
+    IATA_NAME_CACHE.clear()
+
+def _fetch_airport_name(iata_code: str) -> Tuple[bool, Optional[str]]:
+    """(answered, name): answered is False when Amadeus could not be asked, so the miss isn't cached."""
+    client = get_amadeus_client()
+    if client is None:
+        return False, None # Cannot fetch without client
+
+    try:
+        response = client.reference_data.locations.get(keyword=iata_code, subType=Location.AIRPORT)
+        return True, response.data[0].get('name') if response.data else None
+    except ResponseError as e:
+        print(f"Error fetching airport name for {iata_code}: {e}")
+        return False, None
+
+def _fetch_airline_names(iata_codes: List[str]) -> Optional[Dict[str, str]]:
+    """Names found for iata_codes, or None when Amadeus could not be asked."""
+    if not iata_codes:
+        return {}
+    client = get_amadeus_client()
+    if client is None:
+        return None # Cannot fetch without client
+
+    try:
+        # The airlines endpoint accepts a comma-separated list, so all misses cost one request
+        response = client.reference_data.airlines.get(airlineCodes=",".join(iata_codes))
+        return {
+            airline['iataCode']: airline['businessName']
+            for airline in response.data or []
+            if airline.get('iataCode') and airline.get('businessName')
+        }
+    except ResponseError as e:
+        print(f"Error fetching airline names for {iata_codes}: {e}")
+        return None
+
+def resolve_airport_names(iata_codes: List[str]) -> Dict[str, str]:
+    names = {}
+    for code in dict.fromkeys(c.strip().upper() for c in iata_codes):
+        name = AIRPORT_INDEX.lookup(code)
+        if name is None:
+            hit, name = IATA_NAME_CACHE.get(("airport", code))
+            if not hit:
+                answered, name = _fetch_airport_name(code)
+                if answered:
+                    IATA_NAME_CACHE.set(("airport", code), name)
+        names[code] = name or code
+    return names
+
+def resolve_airline_names(iata_codes: List[str]) -> Dict[str, str]:
+    codes = list(dict.fromkeys(c.strip().upper() for c in iata_codes))
+    names = AIRLINE_INDEX.lookup_many(codes)
+    missing = []
+    for code, name in names.items():
+        if name is None:
+            hit, names[code] = IATA_NAME_CACHE.get(("airline", code))
+            if not hit:
+                missing.append(code)
+    fetched = _fetch_airline_names(missing)
+    if fetched is not None:
+        for code in missing:
+            names[code] = fetched.get(code)
+            IATA_NAME_CACHE.set(("airline", code), names[code])
+    return {code: name or code for code, name in names.items()}
 
 @tool
 def get_airport_name(iata_code: str) -> str:
@@ -14,18 +114,7 @@ def get_airport_name(iata_code: str) -> str:
     Returns:
         str: The name of the airport location, or the IATA code if not found or an error occurs.
     """
-    if AMADEUS_CLIENT is None:
-        return iata_code # Cannot fetch without client
-
-    try:
-        response = AMADEUS_CLIENT.reference_data.locations.get(keyword=iata_code, subType=Location.AIRPORT)
-        if response.data:
-            return response.data[0].get('name', iata_code)
-        else:
-            return iata_code
-    except ResponseError as e:
-        print(f"Error fetching airport name for {iata_code}: {e}")
-        return iata_code
+    return resolve_airport_names([iata_code])[iata_code.strip().upper()]
 
 @tool
 def get_airline_name(iata_code: str) -> str:
@@ -36,18 +125,85 @@ def get_airline_name(iata_code: str) -> str:
     Returns:
         str: The name of the airline, or the IATA code if not found or an error occurs.
     """
-    if AMADEUS_CLIENT is None:
-        return iata_code # Cannot fetch without client
+    return resolve_airline_names([iata_code])[iata_code.strip().upper()]
+
+@tool
+def get_airport_names(iata_codes: List[str]) -> Dict[str, str]:
+    """
+    Fetches the names of many airports in one call.
+    Args:
+        iata_codes (List[str]): The IATA codes of the airports.
+    Returns:
+        Dict[str, str]: Airport names keyed by IATA code; unknown codes map to themselves.
+    """
+    return resolve_airport_names(iata_codes)
+
+@tool
+def get_airline_names(iata_codes: List[str]) -> Dict[str, str]:
+    """
+    Fetches the names of many airlines in one call.
+    Args:
+        iata_codes (List[str]): The IATA codes of the airlines.
+    Returns:
+        Dict[str, str]: Airline names keyed by IATA code; unknown codes map to themselves.
+    """
+    return resolve_airline_names(iata_codes)
+
+def flight_search_key(origin: str, destination: str, departure_date: str, return_date: Optional[str] = None, num_guests: int = 1, travel_class: str = 'ECONOMY', currency_code: str = BASE_CURRENCY) -> Tuple:
+    return (
+        origin.strip().upper(),
+        destination.strip().upper(),
+        departure_date.strip(),
+        return_date.strip() if return_date else None,
+        int(num_guests),
+        travel_class.strip().upper(),
+        currency_code.strip().upper(),
+    )
+
+def _fetch_flight_offers(key: Tuple) -> List[Dict[str, Any]]:
+    origin, destination, departure_date, return_date, num_guests, travel_class, currency_code = key
+    response = get_amadeus_client().shopping.flight_offers_search.get(
+        originLocationCode=origin,
+        destinationLocationCode=destination,
+        departureDate=departure_date,
+        returnDate=return_date,
+        adults=num_guests,
+        travelClass=travel_class,
+        max=20,
+        currencyCode=currency_code,
+    )
+    return response.data or []
+
+def search_flight_offers(origin: str, destination: str, departure_date: str, return_date: Optional[str] = None, num_guests: int = 1, travel_class: str = 'ECONOMY', currency_code: str = BASE_CURRENCY) -> Optional[List[Dict[str, Any]]]:
+    """
+    Returns the raw Amadeus flight-offers payload for a search, served from FLIGHT_CACHE when
+    the same search ran within FLIGHT_CACHE_TTL. Failed searches are not cached.
+    Returns:
+        Optional[List[Dict[str, Any]]]: The offers (possibly empty), or None if the search failed.
+    """
+    if get_amadeus_client() is None:
+        print("Amadeus client not initialized. Cannot fetch flight details.")
+        return None
+
+    key = flight_search_key(origin, destination, departure_date, return_date, num_guests, travel_class, currency_code)
+    hit, offers = FLIGHT_CACHE.get(key)
+    if hit:
+        return offers
+
+    def fetch() -> List[Dict[str, Any]]:
+        # Re-check: a search that finished while we queued for the lock has already filled the cache
+        hit, offers = FLIGHT_CACHE.get(key)
+        if not hit:
+            offers = _fetch_flight_offers(key)
+            FLIGHT_CACHE.set(key, offers)
+        return offers
 
     try:
-        response = AMADEUS_CLIENT.reference_data.airlines.get(airlineCodes=iata_code)
-        if response.data:
-            return response.data[0].get('businessName', iata_code)
-        else:
-            return iata_code
+        offers, _ = FLIGHT_SEARCHES.do(key, fetch)
+        return offers
     except ResponseError as e:
-        print(f"Error fetching airline name for {iata_code}: {e}")
-        return iata_code
+        print(f"Error fetching flight details: {e}")
+        return None
 
 @tool
 def get_flight_details(origin: str, destination: str, departure_date: str, return_date: Optional[str] = None, num_guests: int = 1, travel_class: str = 'ECONOMY', currency_code: str = BASE_CURRENCY) -> List[FlightOffer]:
@@ -62,26 +218,60 @@ def get_flight_details(origin: str, destination: str, departure_date: str, retur
     Returns:
         List[FlightOffer]: A list of FlightOffer objects containing flight details.
     """
-    if AMADEUS_CLIENT is None:
-        print("Amadeus client not initialized. Cannot fetch flight details.")
+    offers = search_flight_offers(origin, destination, departure_date, return_date, num_guests, travel_class, currency_code)
+    if offers is None:
         return []
+    if not offers:
+        print("No flight offers found.")
+    return [FlightOffer.model_validate(offer) for offer in offers]
 
-    try:
-        response = AMADEUS_CLIENT.shopping.flight_offers_search.get(
-            originLocationCode=origin,
-            destinationLocationCode=destination,
-            departureDate=departure_date,
-            returnDate=return_date,
-            adults=num_guests,
-            travelClass=travel_class,
-            max=20,
-            currencyCode=currency_code,
-        )
-        if response.data:
-            return [FlightOffer.model_validate(offer) for offer in response.data]
-        else:
-            print("No flight offers found.")
-            return []
-    except ResponseError as e:
-        print(f"Error fetching flight details: {e}")
-        return []
\ No newline at end of file
+@tool
+def find_best_flights(origin: str, destination: str, departure_date: str, return_date: Optional[str] = None, num_guests: int = 1, travel_class: str = 'ECONOMY', currency_code: str = BASE_CURRENCY,
+                      max_price: Optional[float] = None, max_stops: Optional[int] = None, carriers: Optional[List[str]] = None, top_k: int = 5) -> List[Dict[str, Any]]:
+    """
+    Searches flights with Amadeus and returns only the best trade-offs: offers that no other offer beats on
+    price, total duration and number of stops at once, best first.
+    Args:
+        origin (str): The IATA code of the origin airport.
+        destination (str): The IATA code of the destination airport.
+        departure_date (str): The departure date in YYYY-MM-DD format.
+        return_date (Optional[str]): The return date in YYYY-MM-DD format. If None, one-way flight is assumed.
+        num_guests (int): Number of guests traveling.
+        max_price (Optional[float]): Drop offers above this grand total.
+        max_stops (Optional[int]): Drop offers with more stops than this (across all legs).
+        carriers (Optional[List[str]]): Only keep offers validated by these airline IATA codes.
+        top_k (int): Maximum number of offers to return.
+    Returns:
+        List[Dict[str, Any]]: Compact summaries with flight_id, price, currency, duration_minutes, stops,
+                              departure and carrier. Use get_flight_offer_details for the full offer.
+    """
+    offers = search_flight_offers(origin, destination, departure_date, return_date, num_guests, travel_class, currency_code)
+    if not offers:
+        return []
+    table = FlightOfferTable.from_offers(offers).filter(max_price=max_price, max_stops=max_stops, carriers=carriers)
+    return table.top_k(top_k).to_records()
+
+@tool
+def get_flight_offer_details(flight_id: str, origin: str, destination: str, departure_date: str, return_date: Optional[str] = None, num_guests: int = 1, travel_class: str = 'ECONOMY', currency_code: str = BASE_CURRENCY) -> Optional[FlightOffer]:
+    """
+    Fetches the full details of one offer returned by find_best_flights. Pass the same search arguments
+    used for find_best_flights; the search is served from cache.
+    Args:
+        flight_id (str): The flight_id of the chosen offer.
+        origin (str): The IATA code of the origin airport.
+        destination (str): The IATA code of the destination airport.
+        departure_date (str): The departure date in YYYY-MM-DD format.
+        return_date (Optional[str]): The return date in YYYY-MM-DD format.
+        num_guests (int): Number of guests traveling.
+    Returns:
+        Optional[FlightOffer]: The full offer, or None if it is no longer available.
+    """
+    offers = search_flight_offers(origin, destination, departure_date, return_date, num_guests, travel_class, currency_code)
+    offer = FlightOfferTable.from_offers(offers or []).offer(flight_id)
+    if offer is None:
+        print(f"Flight offer {flight_id} not found.")
+        return None
+    return FlightOffer.model_validate(offer)
+
+# The Amadeus SDK only offers blocking calls; async callers run them on the shared blocking pool
+offload_blocking(get_airport_name, get_airline_name, get_airport_names, get_airline_names, get_flight_details, find_best_flights, get_flight_offer_details)
@@ -1,4 +1,5 @@
 from langchain_core.tools import tool
+from ..utils.async_tools import run_inline
 
 @tool
 def add(a: float, b: float) -> float:
@@ -41,3 +42,5 @@ def estimate_hotel_cost(price_per_night: float, total_days: int) -> float:
         return round(price_per_night * total_days, 2)
     except Exception as e:
         return str(e)
+
+run_inline(add, multiply, estimate_hotel_cost)
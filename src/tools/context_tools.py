@@ -0,0 +1,38 @@
+import hashlib
+from langchain_core.tools import tool
+from ..config.settings import CHARS_PER_TOKEN, TOOL_OUTPUT_MAX_TOKENS, TOOL_OUTPUT_STORE_MAX_ENTRIES, TOOL_OUTPUT_STORE_TTL
+from ..utils.async_tools import run_inline
+from ..utils.ttl_cache import TTLCache
+
+# Full tool results whose digest replaced them in the model context, keyed by handle
+TOOL_OUTPUT_STORE = TTLCache(max_size=TOOL_OUTPUT_STORE_MAX_ENTRIES, ttl=TOOL_OUTPUT_STORE_TTL)
+
+# Pages returned by fetch_tool_output stay under the size at which tool outputs get digested
+FETCH_PAGE_CHARS = TOOL_OUTPUT_MAX_TOKENS * CHARS_PER_TOKEN * 9 // 10
+
+def store_tool_output(content: str) -> str:
+    """Stores a full tool result and returns its handle."""
+    handle = "out_" + hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+    TOOL_OUTPUT_STORE.set(handle, content)
+    return handle
+
+@tool
+def fetch_tool_output(handle: str, offset: int = 0) -> str:
+    """
+    Retrieves a full tool result that was shortened to a digest, one page at a time.
+    Args:
+        handle (str): The handle given in the digest (e.g. 'out_1a2b3c4d5e6f').
+        offset (int): Character offset to start from; use the next_offset of the previous page.
+    Returns:
+        str: The requested page of the original output, followed by next_offset if more remains.
+    """
+    hit, content = TOOL_OUTPUT_STORE.get(handle)
+    if not hit:
+        return f"No stored output for handle {handle}; it may have expired. Call the original tool again."
+    page = content[offset:offset + FETCH_PAGE_CHARS]
+    end = offset + len(page)
+    if end < len(content):
+        page += f"\n[... {len(content) - end} more characters; next_offset={end}]"
+    return page
+
+run_inline(fetch_tool_output)
@@ -1,6 +1,122 @@
-import requests
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
 from langchain_core.tools import tool
 from ..config.clients import BASE_CURRENCY, EXCHANGERATE_BASERURL
+from ..config.settings import EXCHANGE_RATE_TTL, EXCHANGE_RATE_STALE_TTL
+from ..models.exchange_rate_models import CurrencyConversion
+from ..utils.async_tools import async_variant, run_blocking
+from ..utils.http_transport import get_json
+
+
+class RateTableCache:
+    """
+    Caches a single ExchangeRate-API conversion table (rates relative to one base currency)
+    and derives any currency pair from it by cross-rate.
+
+    The table is fresh for `ttl` seconds. For the following `stale_ttl` seconds the stale
+    table is still served while one background thread refreshes it; after that, callers
+    block on a synchronous refresh.
+    """
+
+    def __init__(self, fetch_table: Callable[[], Dict[str, float]], ttl: float, stale_ttl: float):
+        self._fetch_table = fetch_table
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._rates: Optional[Dict[str, float]] = None
+        self._fetched_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+    def _refresh(self) -> Dict[str, float]:
+        with self._fetch_lock:
+            return self._fetch_and_store()
+
+    def _fetch_and_store(self) -> Dict[str, float]:
+        rates = self._fetch_table()
+        with self._lock:
+            self._rates = rates
+            self._fetched_at = time.monotonic()
+        return rates
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._refresh()
+        except Exception as e:
+            print(f"Background exchange rate refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def cached_rates(self) -> Optional[Dict[str, float]]:
+        """
+        Returns the table if it can be served without blocking: fresh, or stale while a
+        background refresh runs. Returns None when a synchronous fetch is required.
+        """
+        with self._lock:
+            rates, age = self._rates, time.monotonic() - self._fetched_at
+            if rates is not None and age < self.ttl:
+                return rates
+            if rates is not None and age < self.ttl + self.stale_ttl:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._refresh_in_background, name="exchange-rate-refresh", daemon=True).start()
+                return rates
+        return None
+
+    def get_rates(self) -> Dict[str, float]:
+        """Returns the cached conversion table, refreshing it as needed."""
+        rates = self.cached_rates()
+        if rates is not None:
+            return rates
+        with self._fetch_lock:
+            # Another caller may have refreshed the table while we waited
+            with self._lock:
+                if self._rates is not None and time.monotonic() - self._fetched_at < self.ttl:
+                    return self._rates
+            return self._fetch_and_store()
+
+    def rate(self, base_currency: str, target_currency: str) -> float:
+        """
+        Returns how many units of target_currency one unit of base_currency buys.
+        Raises:
+            ValueError: If either currency is missing from the table.
+        """
+        return self.cross_rate(self.get_rates(), base_currency, target_currency)
+
+    async def arate(self, base_currency: str, target_currency: str) -> float:
+        """Async rate(); only a missing or expired table costs a (threaded) fetch."""
+        rates = self.cached_rates()
+        if rates is None:
+            rates = await run_blocking(self.get_rates)
+        return self.cross_rate(rates, base_currency, target_currency)
+
+    @staticmethod
+    def cross_rate(rates: Dict[str, float], base_currency: str, target_currency: str) -> float:
+        base_currency, target_currency = base_currency.upper(), target_currency.upper()
+        for currency in (base_currency, target_currency):
+            if currency not in rates:
+                raise ValueError(f"Exchange rate for {currency} not found in response.")
+        return rates[target_currency] / rates[base_currency]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rates = None
+            self._fetched_at = 0.0
+
+
+def _fetch_conversion_rates() -> Dict[str, float]:
+    if not EXCHANGERATE_BASERURL:
+        raise ValueError("exchangerate_baseurl is not set. Please check your configuration.")
+    data = get_json(EXCHANGERATE_BASERURL)
+    if 'conversion_rates' not in data:
+        raise ValueError("conversion_rates not found in ExchangeRate API response.")
+    return data['conversion_rates']
+
+# One table for BASE_CURRENCY serves every currency pair
+RATE_TABLE = RateTableCache(_fetch_conversion_rates, ttl=EXCHANGE_RATE_TTL, stale_ttl=EXCHANGE_RATE_STALE_TTL)
+
 
 @tool
 def get_exchange_rate(base_currency: str = BASE_CURRENCY, target_currency: str = None) -> float:
@@ -12,12 +128,47 @@ def get_exchange_rate(base_currency: str = BASE_CURRENCY, target_currency: str =
     Returns:
         float: The exchange rate from base_currency to target_currency.
     """
-    if not EXCHANGERATE_BASERURL:
-        raise ValueError("exchangerate_baseurl is not set. Please check your configuration.")
-    response = requests.get(EXCHANGERATE_BASERURL.format(base_currency=base_currency))
-    response.raise_for_status()
-    data = response.json()
-    if 'conversion_rates' in data and target_currency in data['conversion_rates']:
-        return data['conversion_rates'][target_currency]
-    else:
-        raise ValueError(f"Exchange rate for {target_currency} not found in response.")
\ No newline at end of file
+    if not target_currency:
+        raise ValueError("target_currency is required.")
+    return RATE_TABLE.rate(base_currency, target_currency)
+
+@async_variant(get_exchange_rate)
+async def aget_exchange_rate(base_currency: str = BASE_CURRENCY, target_currency: str = None) -> float:
+    if not target_currency:
+        raise ValueError("target_currency is required.")
+    return await RATE_TABLE.arate(base_currency, target_currency)
+
+
+@tool
+def convert_currency_batch(conversions: List[CurrencyConversion]) -> List[Dict[str, Any]]:
+    """
+    Converts many amounts between currencies in a single call, using one cached rate table.
+    Args:
+        conversions (List[CurrencyConversion]): The amounts to convert, each with amount, from_currency and to_currency.
+    Returns:
+        List[Dict[str, Any]]: One entry per conversion, in order, with the rate and converted_amount,
+                              or an error message if a currency is unknown.
+    """
+    return _convert_all(conversions, RATE_TABLE.get_rates())
+
+@async_variant(convert_currency_batch)
+async def aconvert_currency_batch(conversions: List[CurrencyConversion]) -> List[Dict[str, Any]]:
+    rates = RATE_TABLE.cached_rates()
+    if rates is None:
+        rates = await run_blocking(RATE_TABLE.get_rates)
+    return _convert_all(conversions, rates)
+
+def _convert_all(conversions: List[CurrencyConversion], rates: Dict[str, float]) -> List[Dict[str, Any]]:
+    results = []
+    for conversion in conversions:
+        if isinstance(conversion, dict):
+            conversion = CurrencyConversion.model_validate(conversion)
+        result = conversion.model_dump()
+        try:
+            rate = RateTableCache.cross_rate(rates, conversion.from_currency, conversion.to_currency)
+            result["rate"] = rate
+            result["converted_amount"] = round(conversion.amount * rate, 2)
+        except ValueError as e:
+            result["error"] = str(e)
+        results.append(result)
+    return results
@@ -0,0 +1,97 @@
+import datetime
+from typing import Any, Dict, List, Optional
+from langchain_core.tools import tool
+from ..agents.day_partitioner import available_hours, partition_days
+from ..agents.itinerary_scheduler import plan_days
+from ..config.settings import DAY_PARTITION_FILL, DAY_PARTITION_MAX_DETOUR_KM, ITINERARY_TIME_BUDGET
+from ..models.place_models import ItineraryPlace
+from ..utils.async_tools import offload_blocking
+from .maps_tools import travel_time_matrix
+
+
+def _plan(places: List[ItineraryPlace], num_days: int, start_date: Optional[str], hotel: Optional[str],
+          mode: str, time_budget: float) -> Dict[str, Any]:
+    locations = ([hotel] if hotel else []) + [place.location for place in places]
+    matrix = travel_time_matrix(locations, mode=mode)
+    return plan_days(places, matrix["duration_seconds"], num_days, start_date=start_date,
+                     has_start=bool(hotel), time_budget=time_budget)
+
+def partition(places: List[ItineraryPlace], num_days: int) -> Dict[str, Any]:
+    """partition_days with the configured day capacity and detour limit."""
+    return partition_days(places, num_days, day_hours=available_hours(fill=DAY_PARTITION_FILL),
+                          max_detour_km=DAY_PARTITION_MAX_DETOUR_KM)
+
+def schedule_places(places: List[ItineraryPlace], num_days: int, start_date: Optional[str] = None,
+                    hotel: Optional[str] = None, mode: str = 'transit') -> Dict[str, Any]:
+    """
+    Plans the days (see plan_days). When every place has coordinates, the places are first
+    partitioned into one geographic cluster per day and each day is planned on its own, with a
+    travel-time matrix over that day's places only; otherwise one matrix covers the whole trip.
+    """
+    if num_days <= 1 or not all(place.lat is not None and place.lng is not None for place in places):
+        return _plan(places, num_days, start_date, hotel, mode, ITINERARY_TIME_BUDGET)
+
+    buckets = partition(places, num_days)
+    first_day = datetime.date.fromisoformat(start_date) if start_date else None
+    days = []
+    unscheduled = [places[i].name for i in buckets["unassigned"] if places[i].kind != 'restaurant']
+    for number, bucket in enumerate(buckets["days"], start=1):
+        date = (first_day + datetime.timedelta(days=number - 1)).isoformat() if first_day else None
+        plan = _plan([places[i] for i in bucket["places"]], 1, date, hotel, mode, ITINERARY_TIME_BUDGET / num_days)
+        day = plan["days"][0]
+        day["day"] = number
+        days.append(day)
+        unscheduled += plan["unscheduled"]
+    return {"days": days, "unscheduled": unscheduled}
+
+@tool
+def plan_itinerary(places: List[ItineraryPlace], num_days: int, start_date: Optional[str] = None,
+                   hotel: Optional[str] = None, mode: str = 'transit') -> Dict[str, Any]:
+    """
+    Orders candidate places into feasible day plans that follow the daily timetable: attractions in
+    the morning and afternoon tour slots, one restaurant for each lunch and dinner. Opening hours
+    and visit durations are respected and travel between stops is kept short. When every place
+    has lat/lng, each day covers one compact area.
+    Args:
+        places (List[ItineraryPlace]): Candidates, each with name, location (address or "lat,lng"),
+            kind ('attraction' or 'restaurant'), and optionally visit_hours (e.g. from
+            calculate_average_time_spent_at_an_address), opens and closes ("HH:MM"), lat and lng.
+        num_days (int): Number of full days to plan.
+        start_date (str): Date of the first day (YYYY-MM-DD).
+        hotel (str): Address each day starts from.
+        mode (str): Travel mode between stops ('transit', 'walking', 'driving', 'bicycling').
+    Returns:
+        Dict[str, Any]: days (per day: date, slots with their stops, arrival/start/end times and
+                        travel minutes) and unscheduled (attractions that did not fit).
+    """
+    places = [ItineraryPlace.model_validate(p) if isinstance(p, dict) else p for p in places]
+    return schedule_places(places, num_days, start_date, hotel, mode)
+
+@tool
+def group_places_by_day(places: List[ItineraryPlace], num_days: int) -> Dict[str, Any]:
+    """
+    Splits candidate places into one geographic group per day, so each day stays in one area
+    (and a multi-city trip city by city). Each day holds at most the hours its tour slots allow;
+    restaurants are spread evenly over the days. Needs lat and lng for every place.
+    Args:
+        places (List[ItineraryPlace]): Candidates, each with name, location, lat, lng, kind
+            ('attraction' or 'restaurant') and optionally visit_hours.
+        num_days (int): Number of days to split the places over.
+    Returns:
+        Dict[str, Any]: days (in visiting order: day, places (names), visit_hours and center
+                        {lat, lng}) and unassigned (names of places without coordinates or that
+                        fit no day).
+    """
+    places = [ItineraryPlace.model_validate(p) if isinstance(p, dict) else p for p in places]
+    buckets = partition(places, num_days)
+    return {
+        "days": [
+            {"day": number, "places": [places[i].name for i in bucket["places"]],
+             "visit_hours": bucket["visit_hours"], "center": bucket["center"]}
+            for number, bucket in enumerate(buckets["days"], start=1)
+        ],
+        "unassigned": [places[i].name for i in buckets["unassigned"]],
+    }
+
+# The travel-time matrix is fetched with blocking googlemaps calls, and clustering is CPU-bound
+offload_blocking(plan_itinerary, group_places_by_day)
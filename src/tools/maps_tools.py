@@ -1,31 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, Hashable, List, Optional
 from enum import Enum
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from ..config.clients import GMAPS
+from ..config import clients
 from ..models.travel_models import Route, Direction
-from ..config.settings import PLACES_VISITED, UNITS
+from ..models.place_models import LatLng
+from ..config.settings import (
+    VISITED_PLACES,
+    UNITS,
+    GMAPS_MAX_WORKERS,
+    GMAPS_CALL_TIMEOUT,
+    RESPONSE_CACHE_PATH,
+    RESPONSE_CACHE_BYPASS,
+    GEOCODE_CACHE_TTL,
+    REVERSE_GEOCODE_CACHE_TTL,
+    PLACE_DETAILS_CACHE_TTL,
+    DIRECTIONS_CACHE_TTL,
+    ROUTE_TARIFFS_PATH,
+    DISTANCE_MATRIX_CACHE_TTL,
+    DISTANCE_MATRIX_MAX_DIMENSION,
+    DISTANCE_MATRIX_MAX_ELEMENTS,
+)
+from ..utils.response_cache import ResponseCache, make_cache_key
+from ..utils.route_costs import RouteCostModel, count_transit_rides, parse_distance_meters, parse_duration_seconds
+from ..utils.async_tools import offload_blocking
 import json
+import time
 from ..config.clients import LLM  # Make sure this path matches where your LLM instance is defined
-from langchain.prompts import PromptTemplate
+from langchain_core.prompts import PromptTemplate
 
 
 def get_gmaps_client():
-    if GMAPS is None:
+    gmaps = clients.get_gmaps_client()
+    if gmaps is None:
         raise ValueError("GMAPS client is not initialized. Please check your configuration.")
-    return GMAPS
+    return gmaps
 
-@tool
-### Get place details using Google Places API using place_id
-def get_place_details(place_id: str) -> Dict[str, Any]:
+# Raw Google responses are cached on disk so repeated lookups skip the API
+RESPONSE_CACHE = ResponseCache(RESPONSE_CACHE_PATH, bypass=RESPONSE_CACHE_BYPASS)
+
+def cached_gmaps_call(namespace: str, ttl: float, method: str, *args, case_sensitive: bool = True, **kwargs) -> Any:
     """
-    Fetches detailed information about a place using its place_id.
+    Calls a googlemaps client method through the response cache.
     Args:
-        place_id (str): The unique identifier for the place.
+        namespace (str): Cache namespace for the endpoint (e.g. 'geocode').
+        ttl (float): Seconds a fresh response stays valid.
+        method (str): Name of the googlemaps.Client method to call.
+        case_sensitive (bool): Set to False for free-text inputs (addresses) so casing doesn't split the cache.
     Returns:
-        Dict[str, Any]: A dictionary containing detailed information about the place.
+        Any: The raw (JSON-compatible) response from Google or the cache.
     """
-    place_details = get_gmaps_client().place(place_id=place_id)
+    key = make_cache_key(args, kwargs, casefold=not case_sensitive)
+    return RESPONSE_CACHE.get_or_set(
+        namespace,
+        key,
+        lambda: getattr(get_gmaps_client(), method)(*args, **kwargs),
+        ttl,
+    )
+
+# Local taxi and transit tariffs; routes are only priced by the LLM in regions without one
+ROUTE_COSTS = RouteCostModel(ROUTE_TARIFFS_PATH)
+
+DEFAULT_SESSION_ID = "default"
+
+def get_session_id(config: Optional[RunnableConfig]) -> str:
+    """Returns the conversation thread_id from a runnable config, or a shared default session."""
+    if not config:
+        return DEFAULT_SESSION_ID
+    return str(config.get("configurable", {}).get("thread_id") or DEFAULT_SESSION_ID)
+
+# Shared worker pool for fanned-out Google lookups (place details, reverse geocoding).
+# Sized once so the concurrency cap holds across overlapping tool calls, not just within one.
+_GMAPS_EXECUTOR = None
+
+def get_gmaps_executor() -> ThreadPoolExecutor:
+    global _GMAPS_EXECUTOR
+    if _GMAPS_EXECUTOR is None:
+        _GMAPS_EXECUTOR = ThreadPoolExecutor(
+            max_workers=GMAPS_MAX_WORKERS,
+            thread_name_prefix="gmaps",
+        )
+    return _GMAPS_EXECUTOR
+
+def map_concurrently(func: Callable[..., Any], calls: Dict[Hashable, tuple], default: Any, timeout: float = GMAPS_CALL_TIMEOUT) -> Dict[Hashable, Any]:
+    """
+    Runs func(*args) for every entry of calls on the shared worker pool.
+    Each call's timeout counts from when a worker picks it up, so a slow lookup doesn't
+    use up the time of the calls queued behind it.
+    Args:
+        func (Callable): The lookup to run.
+        calls (Dict[Hashable, tuple]): Positional arguments for each call, keyed by an identifier.
+        default (Any): Value returned for calls that raised or did not finish in time.
+        timeout (float): Seconds each call may run (or wait for a free worker) before it is given up on.
+    Returns:
+        Dict[Hashable, Any]: Results keyed like calls.
+    """
+    executor = get_gmaps_executor()
+    started: Dict[Hashable, float] = {}
+
+    def run(key: Hashable, args: tuple) -> Any:
+        started[key] = time.monotonic()
+        return func(*args)
+
+    futures = {key: executor.submit(run, key, args) for key, args in calls.items()}
+    stalled = False
+    for key, future in futures.items():
+        while not future.done():
+            start = started.get(key)
+            if start is None and stalled:
+                break
+            remaining = timeout if start is None else start + timeout - time.monotonic()
+            if remaining <= 0:
+                break
+            if not wait([future], timeout=remaining).done and key not in started:
+                # No worker freed up in time; don't wait on the other calls still queued either
+                stalled = True
+
+    results = {}
+    for key, future in futures.items():
+        if not future.done():
+            future.cancel()
+            print(f"Timed out running {func.__name__} for {key}.")
+            results[key] = default
+        elif future.exception() is not None:
+            print(f"Error running {func.__name__} for {key}: {future.exception()}")
+            results[key] = default
+        else:
+            results[key] = future.result()
+    return results
+
+def _fetch_place_details(place_id: str) -> Dict[str, Any]:
+    place_details = cached_gmaps_call("place_details", PLACE_DETAILS_CACHE_TTL, "place", place_id=place_id)
     
     if 'result' in place_details:
         result = place_details['result']
@@ -38,9 +145,21 @@ def get_place_details(place_id: str) -> Dict[str, Any]:
     
     return {}
 
+@tool
+### Get place details using Google Places API using place_id
+def get_place_details(place_id: str) -> Dict[str, Any]:
+    """
+    Fetches detailed information about a place using its place_id.
+    Args:
+        place_id (str): The unique identifier for the place.
+    Returns:
+        Dict[str, Any]: A dictionary containing detailed information about the place.
+    """
+    return _fetch_place_details(place_id)
+
 ### Get nearby places using Google Places API
 @tool
-def get_nearby_places(lat: float, long: float, radius: int = 5000, place_type: str ='other') -> List[Dict[str, Any]]:
+def get_nearby_places(lat: float, long: float, radius: int = 5000, place_type: str ='other', config: RunnableConfig = None) -> List[Dict[str, Any]]:
     """
     Fetches nearby places of a specific type using Google Places API.
     Args:
@@ -57,21 +176,26 @@ def get_nearby_places(lat: float, long: float, radius: int = 5000, place_type: s
         type=place_type
     )
     
+    session_id = get_session_id(config)
     places_list = []
     for place in places_result.get('results', []):
         if 'geometry' in place and 'location' in place['geometry']:
             location = place['geometry']['location']
-            if( place.get('place_id') not in PLACES_VISITED):
-                PLACES_VISITED.append(place.get('place_id'))
+            if VISITED_PLACES.mark_if_new(session_id, place.get('place_id')):
                 places_list.append({
                     'place_id': place.get('place_id'),
                     'name': place.get('name'),
                     'latitude': location.get('lat'),
                     'longitude': location.get('lng'),
                     'rating': place.get('rating', 0.0),
-                    'place_details' : get_place_details(place.get('place_id')),
+                    'place_details' : {},
                     'price_level': place.get('price_level', 0)
                 })
+
+    # Enrich all new places in parallel; failed or slow lookups keep an empty place_details
+    details = map_concurrently(_fetch_place_details, {p['place_id']: (p['place_id'],) for p in places_list}, default={})
+    for place in places_list:
+        place['place_details'] = details.get(place['place_id'], {})
     
     # Sort by rating and then by price level
     places_list.sort(key=lambda x: (-x['rating'], x['price_level']))
@@ -90,7 +214,11 @@ def get_directions(origin: str, destination: str, mode: str = 'driving') -> Rout
     Returns:
         Route: A Route object containing the directions, total duration, and distance.
     """
-    directions_result = get_gmaps_client().directions(
+    directions_result = cached_gmaps_call(
+        "directions",
+        DIRECTIONS_CACHE_TTL,
+        "directions",
+        case_sensitive=False,
         origin=origin,
         destination=destination,
         mode=mode,
@@ -99,44 +227,43 @@ def get_directions(origin: str, destination: str, mode: str = 'driving') -> Rout
 
     if not directions_result:
         print("No directions found.")
-        return Route(origin, destination, [], "0 hours", "0 meters")
+        return Route(origin_add=origin, destination_add=destination, directions=[], total_duration="0 hours",
+                     total_distance="0 meters", travel_mode=mode)
 
     route = directions_result[0]
-    total_duration = route['legs'][0]['duration']['text']
-    total_distance = route['legs'][0]['distance']['text']
-    origin_address = route['legs'][0]['start_address']
-    destination_address = route['legs'][0]['end_address']
-    if route['fare']:
-        fare = route['fare']
-
-    directions = []
-    for step in route['legs'][0]['steps']:
-        direction = Direction(
+    leg = route['legs'][0]
+    directions = [
+        Direction(
             distance=step['distance']['text'],
             duration=step['duration']['text'],
             instruction=step['html_instructions'],
             travel_mode=step['travel_mode']
         )
-        directions.append(direction)
+        for step in leg['steps']
+    ]
 
-    return Route(origin_address, destination_address, directions, total_duration, total_duration, fare)
+    return Route(
+        origin_add=leg.get('start_address', origin),
+        destination_add=leg.get('end_address', destination),
+        directions=directions,
+        total_duration=leg['duration']['text'],
+        total_distance=leg['distance']['text'],
+        fare=route.get('fare') or {},
+        travel_mode=mode,
+    )
 
 
+def _parse_price_estimate(answer: str) -> Optional[Dict[str, Any]]:
+    """Reads the JSON object from a price estimate answer (models often wrap it in a ```json fence)."""
+    text = answer.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+    try:
+        estimate = json.loads(text)
+    except ValueError:
+        return None
+    return estimate if isinstance(estimate, dict) else None
 
-@tool
-def calculate_estimated_route_price(origin: str, destination: str, directions: list[Direction], total_duration: str, total_distance: str) -> str:
-    """
-    Estimates a fair price for transportation based on route details.
-    Args:
-        origin (str): The starting address or place.
-        destination (str): The ending address or place.
-        directions (list[Direction]): A list of Direction objects representing each step in the route.
-        total_duration (str): The total estimated time to complete the route.
-        total_distance (str): The total distance of the route.
-        
-    Returns:
-        str: A JSON string containing the estimated price and currency, or "N/A" if estimation is not possible.
-    """
+def _llm_route_price(origin: str, destination: str, directions: list[Direction], total_duration: str, total_distance: str) -> Optional[Dict[str, Any]]:
+    """Asks the model for a price estimate (for regions without a local tariff)."""
     prompt = (
         """
             You are a professional price estimator for travel routes.
@@ -164,21 +291,156 @@ def calculate_estimated_route_price(origin: str, destination: str, directions: l
         input_variables=["origin_address","destination_address","total_distance","total_duration","directions"],
         template=prompt
     )
-    response = LLM.invoke(template.format(
-        origin_address=origin,
-        destination_address=destination,
-        total_distance=total_distance,
-        total_duration=total_duration,
-        directions=directions
-    ))
-    if response and isinstance(response, str):
-        try:
-            return json.dumps(response.coptent)
-        except ValueError:
-            print(f"Could not convert response to float: {response}")
+    response = clients.LLM_CACHE.invoke(
+        "route_price",
+        LLM,
+        template.format(
+            origin_address=origin,
+            destination_address=destination,
+            total_distance=total_distance,
+            total_duration=total_duration,
+            directions=directions
+        ),
+        cacheable=lambda answer: _parse_price_estimate(answer) is not None,
+        semantic_key=f"{origin} to {destination}, {total_distance}, {total_duration}",
+    )
+    if response:
+        estimate = _parse_price_estimate(response)
+        if estimate is not None and estimate.get("estimated_price") not in (None, "N/A"):
+            return {**estimate, "source": "llm"}
+        print(f"Could not parse price estimate: {response}")
     else:
         print("Invalid response from LLM.")
-    return json.dumps({"estimated_price": "N/A","currency": "N/A"})
+    return None
+
+@tool
+def calculate_estimated_route_price(origin: str, destination: str, directions: list[Direction], total_duration: str, total_distance: str,
+                                    travel_mode: Optional[str] = None, fare: Optional[Dict[str, Any]] = None, region: Optional[str] = None) -> str:
+    """
+    Estimates a fair price for transportation based on route details (the fields of a Route from get_directions).
+    Uses Google's fare when the route has one, otherwise local taxi and transit tariffs for the region.
+    Args:
+        origin (str): The starting address or place.
+        destination (str): The ending address or place.
+        directions (list[Direction]): A list of Direction objects representing each step in the route.
+        total_duration (str): The total estimated time to complete the route.
+        total_distance (str): The total distance of the route.
+        travel_mode (str): The route's travel mode ('driving', 'transit', 'walking', 'bicycling'); inferred from the directions if omitted.
+        fare (dict): The route's fare from get_directions, if any.
+        region (str): Country whose tariffs apply; taken from the addresses if omitted.
+
+    Returns:
+        str: A JSON string containing the estimated price, currency and source, or "N/A" if estimation is not possible.
+    """
+    step_modes = [direction.travel_mode for direction in directions]
+    if travel_mode is None:
+        travel_mode = "transit" if count_transit_rides(step_modes) else (step_modes[0].lower() if step_modes else "driving")
+    distance, duration = parse_distance_meters(total_distance), parse_duration_seconds(total_duration)
+    region = region or ROUTE_COSTS.region(destination, origin)
+
+    estimate = ROUTE_COSTS.estimate(travel_mode, distance, duration, region, fare, transit_rides=count_transit_rides(step_modes))
+    if estimate is None:
+        # No local tariff for the region (or an unparseable route): ask the model, then fall back to the default tariff
+        estimate = _llm_route_price(origin, destination, directions, total_duration, total_distance)
+    if estimate is None:
+        estimate = ROUTE_COSTS.estimate(travel_mode, distance, duration, "default", transit_rides=count_transit_rides(step_modes))
+    if estimate is None:
+        return json.dumps({"estimated_price": "N/A","currency": "N/A"})
+    return json.dumps(estimate)
+
+
+def _matrix_blocks(origins: List[str], destinations: List[str]) -> List[tuple]:
+    """Splits origins x destinations into requests within the Distance Matrix limits (per side and per request)."""
+    columns = max(min(len(destinations), DISTANCE_MATRIX_MAX_DIMENSION, DISTANCE_MATRIX_MAX_ELEMENTS), 1)
+    rows = max(min(DISTANCE_MATRIX_MAX_DIMENSION, DISTANCE_MATRIX_MAX_ELEMENTS // columns), 1)
+    return [
+        (tuple(origins[i:i + rows]), tuple(destinations[j:j + columns]))
+        for i in range(0, len(origins), rows)
+        for j in range(0, len(destinations), columns)
+    ]
+
+def _fetch_matrix_block(origins: tuple, destinations: tuple, mode: str) -> Dict[tuple, Dict[str, Optional[float]]]:
+    """Fetches one Distance Matrix request and caches each of its cells."""
+    response = get_gmaps_client().distance_matrix(list(origins), list(destinations), mode=mode, units=UNITS)
+    cells = {}
+    for origin, row in zip(origins, response.get('rows', [])):
+        for destination, element in zip(destinations, row.get('elements', [])):
+            ok = element.get('status') == 'OK'
+            cell = {
+                "duration_seconds": element['duration']['value'] if ok and 'duration' in element else None,
+                "distance_meters": element['distance']['value'] if ok and 'distance' in element else None,
+            }
+            # Unreachable pairs (ZERO_RESULTS) are cached too; failed requests never get here
+            RESPONSE_CACHE.set("distance_matrix", make_cache_key((origin, destination, mode), casefold=True), cell, DISTANCE_MATRIX_CACHE_TTL)
+            cells[(origin, destination)] = cell
+    return cells
+
+def travel_time_matrix(origins: List[str], destinations: Optional[List[str]] = None, mode: str = 'driving') -> Dict[str, Any]:
+    """
+    Travel times and distances from every origin to every destination for one travel mode.
+    Cells are served from the response cache; the missing ones are fetched from the Distance
+    Matrix API in as few requests as its limits allow, concurrently.
+    Returns:
+        Dict[str, Any]: origins, destinations, mode, and the duration_seconds and distance_meters
+                        matrices (rows are origins, None where no route was found or the request
+                        failed), ready for np.array(..., dtype=float).
+    """
+    destinations = list(origins) if destinations is None else list(destinations)
+    cells: Dict[tuple, Dict[str, Optional[float]]] = {}
+    missing: Dict[str, List[str]] = {}
+    for origin in dict.fromkeys(origins):
+        for destination in dict.fromkeys(destinations):
+            if origin == destination:
+                cells[(origin, destination)] = {"duration_seconds": 0, "distance_meters": 0}
+                continue
+            hit, cell = (False, None) if RESPONSE_CACHE.bypass else RESPONSE_CACHE.get(
+                "distance_matrix", make_cache_key((origin, destination, mode), casefold=True))
+            if hit:
+                cells[(origin, destination)] = cell
+            else:
+                missing.setdefault(origin, []).append(destination)
+
+    if missing:
+        # Origins missing most of their row (new places) are fetched against all of their missing
+        # destinations; the rest only against the destinations they lack (typically the new places)
+        width = len(dict.fromkeys(destinations))
+        blocks = []
+        for group in ([o for o, row in missing.items() if 2 * len(row) >= width], [o for o, row in missing.items() if 2 * len(row) < width]):
+            columns = [d for d in dict.fromkeys(destinations) if any(d in missing[o] for o in group)]
+            blocks += _matrix_blocks(group, columns) if group else []
+        results = map_concurrently(_fetch_matrix_block, {block: (*block, mode) for block in blocks}, default={})
+        for block_cells in results.values():
+            cells.update(block_cells)
+
+    empty = {"duration_seconds": None, "distance_meters": None}
+    return {
+        "origins": list(origins),
+        "destinations": destinations,
+        "mode": mode,
+        "duration_seconds": [[cells.get((o, d), empty)["duration_seconds"] for d in destinations] for o in origins],
+        "distance_meters": [[cells.get((o, d), empty)["distance_meters"] for d in destinations] for o in origins],
+    }
+
+@tool
+def get_travel_time_matrix(places: List[str], destinations: Optional[List[str]] = None, modes: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Builds travel-time and distance matrices between many places at once, e.g. to order the places
+    of a day or pick the closest restaurant. Prefer this over repeated get_directions calls when
+    comparing more than two places; use get_directions for turn-by-turn steps of a chosen route.
+    Args:
+        places (List[str]): Origins: addresses, place names or "lat,lng" strings.
+        destinations (List[str]): Destinations; the same places if omitted (a square matrix).
+        modes (List[str]): Travel modes ('driving', 'walking', 'bicycling', 'transit'); ['driving'] if omitted.
+    Returns:
+        Dict[str, Any]: origins, destinations, and for each mode the duration_seconds and
+                        distance_meters matrices (rows are origins, columns destinations,
+                        null where no route was found).
+    """
+    result = {"origins": list(places), "destinations": list(places) if destinations is None else list(destinations), "modes": {}}
+    for mode in modes or ['driving']:
+        matrix = travel_time_matrix(places, destinations, mode)
+        result["modes"][mode] = {"duration_seconds": matrix["duration_seconds"], "distance_meters": matrix["distance_meters"]}
+    return result
 
 
 ### Geo Coding Tool 
@@ -188,7 +450,7 @@ def get_geocode_tool(address: str) -> Dict[str, Any]:
     Fetches geographical coordinates (latitude, longitude) for a given address.
     """
     try:
-        geocode_result = get_gmaps_client().geocode(address)
+        geocode_result = cached_gmaps_call("geocode", GEOCODE_CACHE_TTL, "geocode", address, case_sensitive=False)
         
         if geocode_result:
             print("Geocoding successful!")
@@ -208,6 +470,14 @@ def get_geocode_tool(address: str) -> Dict[str, Any]:
         print(f"An API error occurred: {e}")
     return {"address": address, "lat": 0.0, "lng": 0.0}
 
+def _reverse_geocode(latitude: float, longitude: float) -> Optional[str]:
+    """Returns the formatted address for a coordinate, or None if Google has no result."""
+    reverse_geocode_result = cached_gmaps_call("reverse_geocode", REVERSE_GEOCODE_CACHE_TTL, "reverse_geocode", (latitude, longitude))
+    if reverse_geocode_result:
+        # The first result is usually the most accurate/relevant one
+        return reverse_geocode_result[0]['formatted_address']
+    return None
+
 ### Reverse Geo Coding Tool 
 @tool
 def reverse_geocode_tool(latitude: float, longitude: float) -> Dict[str, Any]:
@@ -224,14 +494,11 @@ def reverse_geocode_tool(latitude: float, longitude: float) -> Dict[str, Any]:
                         the geocoding fails.
     """
     try:
-        gmaps = get_gmaps_client()
         # Perform reverse geocoding
-        reverse_geocode_result = gmaps.reverse_geocode((latitude, longitude))
+        formatted_address = _reverse_geocode(latitude, longitude)
 
-        if reverse_geocode_result:
+        if formatted_address:
             print("Reverse geocoding successful!")
-            # The first result is usually the most accurate/relevant one
-            formatted_address = reverse_geocode_result[0]['formatted_address']
             # The lat/lng are the input, but we return them for consistency with get_geocoding_tool
             lat = latitude
             lng = longitude
@@ -245,4 +512,38 @@ def reverse_geocode_tool(latitude: float, longitude: float) -> Dict[str, Any]:
             return {"address": None, "lat": latitude, "lng": longitude}
     except Exception as e:
         print(f"An API error occurred during reverse geocoding: {e}")
-        return {"address": None, "lat": latitude, "lng": longitude}
\ No newline at end of file
+        return {"address": None, "lat": latitude, "lng": longitude}
+
+### Batch Reverse Geo Coding Tool
+@tool
+def reverse_geocode_batch(coordinates: List[LatLng]) -> List[Dict[str, Any]]:
+    """
+    Fetches human-readable addresses for many coordinates at once, e.g. for the hotels or places
+    the user has shortlisted. Lookups run concurrently and are served from cache when possible.
+
+    Args:
+        coordinates (List[LatLng]): The coordinates to resolve, each with lat and lng.
+
+    Returns:
+        List[Dict[str, Any]]: One entry per coordinate, in order, with address, lat and lng.
+                              address is None when the lookup fails.
+    """
+    coordinates = [LatLng.model_validate(c) if isinstance(c, dict) else c for c in coordinates]
+    addresses = map_concurrently(
+        _reverse_geocode,
+        {(c.lat, c.lng): (c.lat, c.lng) for c in coordinates},
+        default=None,
+    )
+    return [{"address": addresses[(c.lat, c.lng)], "lat": c.lat, "lng": c.lng} for c in coordinates]
+
+# googlemaps only offers blocking calls; async callers run them on the shared blocking pool
+offload_blocking(
+    get_place_details,
+    get_nearby_places,
+    get_directions,
+    calculate_estimated_route_price,
+    get_travel_time_matrix,
+    get_geocode_tool,
+    reverse_geocode_tool,
+    reverse_geocode_batch,
+)
@@ -0,0 +1,171 @@
+"""
+Declarative registry of the agent's tools.
+
+Each tool is registered by name with the module that implements it. Its schema (description
+and JSON arguments schema) is read from tool_manifest.json, so the agent can be built and the
+model told about every tool without importing the implementation modules (and the SDKs they
+pull in). A module is imported the first time one of its tools is called.
+
+After changing a tool's signature or docstring, regenerate the manifest:
+
+    python -m src.tools.registry
+"""
+import importlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from pydantic import PrivateAttr
+
+from ..utils.async_tools import run_blocking
+
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "tool_manifest.json")
+
+# Agent tools, in the order they are offered to the model, and the module implementing each.
+# A tool's group is its module name without the "_tools" suffix (amadeus, maps, weather, ...).
+TOOL_MODULES = {
+    'get_airport_name': 'src.tools.amadeus_tools',
+    'get_airline_name': 'src.tools.amadeus_tools',
+    'get_airport_names': 'src.tools.amadeus_tools',
+    'get_airline_names': 'src.tools.amadeus_tools',
+    'get_flight_details': 'src.tools.amadeus_tools',
+    'find_best_flights': 'src.tools.amadeus_tools',
+    'get_flight_offer_details': 'src.tools.amadeus_tools',
+    'get_exchange_rate': 'src.tools.exchange_rate_tools',
+    'convert_currency_batch': 'src.tools.exchange_rate_tools',
+    'get_nearby_places': 'src.tools.maps_tools',
+    'get_directions': 'src.tools.maps_tools',
+    'get_travel_time_matrix': 'src.tools.maps_tools',
+    'calculate_estimated_route_price': 'src.tools.maps_tools',
+    'get_place_details': 'src.tools.maps_tools',
+    'hotel_search_tool': 'src.tools.serpapi_tools',
+    'get_geocode_tool': 'src.tools.maps_tools',
+    'reverse_geocode_tool': 'src.tools.maps_tools',
+    'reverse_geocode_batch': 'src.tools.maps_tools',
+    'calculate_average_time_spent_at_an_address': 'src.tools.util_tools',
+    'convert_unix_to_mmddyyyy': 'src.tools.util_tools',
+    'convert_unix_to_yyyymmdd': 'src.tools.util_tools',
+    'travel_budget_allocator': 'src.tools.util_tools',
+    'plan_itinerary': 'src.tools.itinerary_tools',
+    'group_places_by_day': 'src.tools.itinerary_tools',
+    'get_weather_and_forecast': 'src.tools.weather_tools',
+    'add': 'src.tools.arithmetic_tools',
+    'multiply': 'src.tools.arithmetic_tools',
+    'estimate_hotel_cost': 'src.tools.arithmetic_tools',
+    'fetch_tool_output': 'src.tools.context_tools',
+}
+
+
+def tool_group(name: str) -> str:
+    return TOOL_MODULES[name].rsplit(".", 1)[-1].removesuffix("_tools")
+
+
+class LazyTool(BaseTool):
+    """
+    Stands in for a registered tool: it has the tool's name, description and arguments schema,
+    and imports the implementing module only when it is first run. Calls are forwarded to the
+    real tool, which validates the arguments.
+    """
+
+    module: str
+    _tool: Optional[BaseTool] = PrivateAttr(default=None)
+
+    def resolve(self) -> BaseTool:
+        """Imports the implementing module (once) and returns the real tool."""
+        if self._tool is None:
+            self._tool = getattr(importlib.import_module(self.module), self.name)
+        return self._tool
+
+    def _run(self, config: RunnableConfig, run_manager: Optional[CallbackManagerForToolRun] = None, **kwargs: Any) -> Any:
+        return self.resolve().invoke(kwargs, {**config, "callbacks": run_manager.get_child() if run_manager else None})
+
+    async def _arun(self, config: RunnableConfig, run_manager: Optional[AsyncCallbackManagerForToolRun] = None, **kwargs: Any) -> Any:
+        # The first call imports the module; do that off the event loop
+        tool = self._tool or await run_blocking(self.resolve)
+        return await tool.ainvoke(kwargs, {**config, "callbacks": run_manager.get_child() if run_manager else None})
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Dict[str, Dict[str, Any]]:
+    with open(path, encoding="utf-8") as file:
+        return {entry["name"]: entry for entry in json.load(file)}
+
+
+def select_tools(enabled: Optional[Iterable[str]] = None, disabled: Iterable[str] = ()) -> List[str]:
+    """
+    Resolves tool names and groups to registered tool names, in registry order.
+    Args:
+        enabled: Tool names or groups to offer; all registered tools if empty or None.
+        disabled: Tool names or groups to leave out.
+    Raises:
+        ValueError: If an entry names no registered tool or group, so a typo can't silently
+            offer every tool (or keep one that was meant to be disabled).
+    """
+    def expand(entries: Iterable[str]) -> set:
+        names = set()
+        for entry in (e.strip() for e in entries):
+            if not entry:
+                continue
+            matches = {name for name in TOOL_MODULES if entry in (name, tool_group(name))}
+            if not matches:
+                raise ValueError(f"Unknown tool or tool group '{entry}' in the tool configuration.")
+            names |= matches
+        return names
+
+    wanted = expand(enabled or ()) or set(TOOL_MODULES)
+    unwanted = expand(disabled)
+    return [name for name in TOOL_MODULES if name in wanted and name not in unwanted]
+
+
+def load_tools(enabled: Optional[Iterable[str]] = None, disabled: Iterable[str] = (), manifest_path: str = MANIFEST_PATH) -> List[LazyTool]:
+    """Builds lazy tools for the selected registered tools, from the manifest's schemas."""
+    manifest = load_manifest(manifest_path)
+    return [
+        LazyTool(
+            name=name,
+            description=manifest[name]["description"],
+            args_schema=manifest[name]["args_schema"],
+            module=TOOL_MODULES[name],
+        )
+        for name in select_tools(enabled, disabled)
+    ]
+
+
+def prune_tool_docs(prompt: str, tool_names: Sequence[str]) -> str:
+    """Removes prompt lines that document a registered tool (`* tool_name(...`) not in tool_names."""
+    offered = set(tool_names)
+    bullet = re.compile(r"^\s*\* (\w+)\(")
+
+    def keep(line: str) -> bool:
+        match = bullet.match(line)
+        return not (match and match.group(1) in TOOL_MODULES and match.group(1) not in offered)
+
+    return "\n".join(line for line in prompt.split("\n") if keep(line))
+
+
+def build_manifest() -> List[Dict[str, Any]]:
+    """Imports every registered tool and returns its manifest entry (name, module, description, schema)."""
+    entries = []
+    for name, module in TOOL_MODULES.items():
+        tool = getattr(importlib.import_module(module), name)
+        entries.append({
+            "name": name,
+            "module": module,
+            "description": tool.description,
+            "args_schema": tool.tool_call_schema.model_json_schema(),
+        })
+    return entries
+
+
+def write_manifest(path: str = MANIFEST_PATH) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(build_manifest(), file, indent=2, ensure_ascii=False)
+        file.write("\n")
+
+
+if __name__ == "__main__":
+    write_manifest()
+    print(f"Wrote {len(TOOL_MODULES)} tool schemas to {MANIFEST_PATH}")
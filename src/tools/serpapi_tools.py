@@ -1,11 +1,25 @@
 from langchain_core.tools import tool
 from ..config.settings import SERP_API_KEY
-from .maps_tools import reverse_geocode_tool
-from datetime import datetime
+from .maps_tools import reverse_geocode_batch
+from datetime import datetime, timedelta
 from serpapi import GoogleSearch
+from ..utils.async_tools import offload_blocking
+
+HOTEL_ADDRESS_SOURCES = ("serpapi", "geocode", "none")
+
+def _fill_addresses_by_reverse_geocoding(hotels: list) -> None:
+    """Resolves all hotel addresses in one concurrent, cached batch."""
+    located = [h for h in hotels if h["latitude"] is not None and h["longitude"] is not None]
+    if not located:
+        return
+    results = reverse_geocode_batch.invoke({
+        "coordinates": [{"lat": h["latitude"], "lng": h["longitude"]} for h in located]
+    })
+    for hotel, result in zip(located, results):
+        hotel["address"] = result["address"]
 
 @tool
-def hotel_search_tool(location: str, adults: int = 1, checkin: str = None, checkout: str = None) -> list:
+def hotel_search_tool(location: str, adults: int = 1, checkin: str = None, checkout: str = None, address_source: str = "serpapi") -> list:
     """
     Searches for hotels using the SerpAPI Google Hotels API.
 
@@ -15,6 +29,11 @@ def hotel_search_tool(location: str, adults: int = 1, checkin: str = None, check
         adults (int): Number of adults (default: 1).
         checkin (str): Check-in date in 'YYYY-MM-DD' format. If None, defaults to tomorrow.
         checkout (str): Check-out date in 'YYYY-MM-DD' format. If None, defaults to day after tomorrow.
+        address_source (str): How to fill each hotel's address:
+                              "serpapi" (default) uses the address SerpAPI returns, if any, with no extra calls;
+                              "geocode" reverse geocodes every hotel (batched, concurrent and cached);
+                              "none" leaves addresses empty. Prefer calling `reverse_geocode_batch`
+                              later for just the shortlisted hotels.
 
     Returns:
         list: A list of dictionaries, each representing a hotel with its name, address,
@@ -25,6 +44,9 @@ def hotel_search_tool(location: str, adults: int = 1, checkin: str = None, check
     if not SERP_API_KEY:
         return [{"error": "SerpAPI client not initialized. Check API key."}]
 
+    if address_source not in HOTEL_ADDRESS_SOURCES:
+        return [{"error": f"Invalid address_source. Use one of {', '.join(HOTEL_ADDRESS_SOURCES)}."}]
+
     # Validate and set default dates if not provided
     if checkin is None:
         checkin_date_obj = datetime.now() + timedelta(days=1)
@@ -74,7 +96,7 @@ def hotel_search_tool(location: str, adults: int = 1, checkin: str = None, check
             for hotel_data in sorted_properties:
                 hotel_info = {
                     "hotel_name": hotel_data.get("name"),
-                    "address": reverse_geocode_tool.invoke({'latitude':hotel_data.get("gps_coordinates", {}).get("latitude"), 'longitude':hotel_data.get("gps_coordinates", {}).get("longitude")}),
+                    "address": hotel_data.get("address") if address_source == "serpapi" else None,
                     "latitude": hotel_data.get("gps_coordinates", {}).get("latitude"),
                     "longitude": hotel_data.get("gps_coordinates", {}).get("longitude"),
                     "rating": hotel_data.get("overall_rating"),
@@ -84,10 +106,16 @@ def hotel_search_tool(location: str, adults: int = 1, checkin: str = None, check
                 }
                 hotels.append(hotel_info)
 
+            if address_source == "geocode":
+                _fill_addresses_by_reverse_geocoding(hotels)
+
             return hotels
         else:
             return [{"message": "No hotel offers found for the specified criteria."}]
 
     except Exception as e:
         print(f"An unexpected error occurred with SerpAPI: {e}")
-        return [{"error": f"An unexpected error occurred with SerpAPI: {e}"}]
\ No newline at end of file
+        return [{"error": f"An unexpected error occurred with SerpAPI: {e}"}]
+
+# SerpAPI's client only offers blocking calls; async callers run it on the shared blocking pool
+offload_blocking(hotel_search_tool)
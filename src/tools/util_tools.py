@@ -1,30 +1,30 @@
 from typing import Dict
 from langchain_core.tools import tool
 from langchain_core.prompts import PromptTemplate
+from src.config import clients
 from src.config.clients import LLM
 from ..models.travel_models import TravelBudgetAllocator
 from ..models.enums import BudgetLevel
+from ..utils.async_tools import async_variant, run_inline
 import datetime
 
-@tool
-def calculate_average_time_spent_at_an_address(address: str) -> float:
-    """
-    Calculates the average time spent by people at a given address.
-    Args:
-        address (str): The address of the place to estimate time for.
-    Returns:
-        float: The average time spent in hours.
-    """
-    prompt = (
+AVERAGE_TIME_PROMPT = PromptTemplate(
+    input_variables=["address"],
+    template=(
         "You are a good time estimator. Please provide me the average time spent by people for '{address}' in a day. "
         "Please provide me a single average time in hours format by extracting from the answer and nothing else. "
         "To this add a buffer time. Only give me the numeric value."
     )
-    template = PromptTemplate(
-        input_variables=["address"],
-        template=prompt
-    )
-    response = LLM.invoke(template.format(address=address))
+)
+
+def _is_number(answer: str) -> bool:
+    try:
+        float(answer.strip())
+        return True
+    except ValueError:
+        return False
+
+def _parse_average_time(response) -> float:
     if response and isinstance(response, str):
         try:
             return float(response.strip())
@@ -34,6 +34,23 @@ def calculate_average_time_spent_at_an_address(address: str) -> float:
         print("Invalid response from LLM.")
     return 3.0
 
+@tool
+def calculate_average_time_spent_at_an_address(address: str) -> float:
+    """
+    Calculates the average time spent by people at a given address.
+    Args:
+        address (str): The address of the place to estimate time for.
+    Returns:
+        float: The average time spent in hours.
+    """
+    response = clients.LLM_CACHE.invoke("average_time", LLM, AVERAGE_TIME_PROMPT.format(address=address), cacheable=_is_number, semantic_key=address)
+    return _parse_average_time(response)
+
+@async_variant(calculate_average_time_spent_at_an_address)
+async def acalculate_average_time_spent_at_an_address(address: str) -> float:
+    response = await clients.LLM_CACHE.ainvoke("average_time", LLM, AVERAGE_TIME_PROMPT.format(address=address), cacheable=_is_number, semantic_key=address)
+    return _parse_average_time(response)
+
 
 @tool
 ### Convert UNIX to Datetime 
@@ -89,4 +106,6 @@ def travel_budget_allocator(total_budget: float, trip_type: str, duration_days:
     # Instantiate the allocator with the provided arguments
     allocator = TravelBudgetAllocator(total_budget, trip_type, duration_days)
     # Call the allocate method to get the budget breakdown
-    return allocator.allocate()
\ No newline at end of file
+    return allocator.allocate()
+
+run_inline(convert_unix_to_mmddyyyy, convert_unix_to_yyyymmdd, travel_budget_allocator)
@@ -1,8 +1,45 @@
-import requests
+import time
+from typing import Any, Dict, Tuple
 from langchain_core.tools import tool
 from ..config.clients import OPENWEATHER_BASEURL
 from ..models.openweather_models import OpenWeatherResponse
-from ..config.settings import UNITS, OPENWEATHER_API_KEY
+from ..config.settings import (
+    UNITS,
+    OPENWEATHER_API_KEY,
+    WEATHER_CACHE_INTERVAL,
+    WEATHER_CACHE_COORD_PRECISION,
+    WEATHER_CACHE_MAX_ENTRIES,
+)
+from ..utils.ttl_cache import TTLCache
+from ..utils.http_transport import get_json, async_get_json
+from ..utils.async_tools import async_variant
+
+# Parsed forecasts keyed by coordinate bucket and units, so nearby places in a city share one entry
+WEATHER_CACHE = TTLCache(max_size=WEATHER_CACHE_MAX_ENTRIES)
+
+def weather_cache_key(lat: float, long: float, metric: str) -> Tuple[float, float, str]:
+    """Rounds coordinates to WEATHER_CACHE_COORD_PRECISION so nearby points share a bucket."""
+    return (round(lat, WEATHER_CACHE_COORD_PRECISION), round(long, WEATHER_CACHE_COORD_PRECISION), metric.lower())
+
+def next_weather_update(now: float) -> float:
+    """Returns the next OpenWeather update boundary after now (Unix seconds)."""
+    return (now // WEATHER_CACHE_INTERVAL + 1) * WEATHER_CACHE_INTERVAL
+
+def _forecast_params(key: Tuple[float, float, str]) -> Dict[str, Any]:
+    if not OPENWEATHER_BASEURL:
+        raise ValueError("OPENWEATHER_BASEURL is not set or is None.")
+    # Query the bucket centre and the normalised units, so the cached forecast matches its key for every caller
+    return {
+        "lat": key[0],
+        "lon": key[1],
+        "appid": OPENWEATHER_API_KEY,
+        "units": key[2]
+    }
+
+def _store_forecast(key: Tuple[float, float, str], payload: Dict[str, Any]) -> OpenWeatherResponse:
+    forecast = OpenWeatherResponse.model_validate(payload)
+    WEATHER_CACHE.set(key, forecast, expires_at=next_weather_update(time.time()))
+    return forecast
 
 ### Get current weather and forecast using OpenWeather One Call API
 @tool
@@ -15,14 +52,18 @@ def get_weather_and_forecast(lat: float,long: float, metric: str = UNITS) -> Ope
     Returns:
         OpenWeatherOneCallAPIResponse: Parsed response containing current weather data.
     '''
-    if not OPENWEATHER_BASEURL:
-        raise ValueError("OPENWEATHER_BASEURL is not set or is None.")
-    params = {
-        "lat": lat,
-        "lon": long,
-        "appid": OPENWEATHER_API_KEY,
-        "units": metric
-    }
-    response = requests.get(OPENWEATHER_BASEURL, params=params)
-    response.raise_for_status()
-    return OpenWeatherResponse.model_validate(response.json())
\ No newline at end of file
+    key = weather_cache_key(lat, long, metric)
+    hit, forecast = WEATHER_CACHE.get(key)
+    if hit:
+        return forecast
+    payload = get_json(OPENWEATHER_BASEURL, params=_forecast_params(key))
+    return _store_forecast(key, payload)
+
+@async_variant(get_weather_and_forecast)
+async def aget_weather_and_forecast(lat: float, long: float, metric: str = UNITS) -> OpenWeatherResponse:
+    key = weather_cache_key(lat, long, metric)
+    hit, forecast = WEATHER_CACHE.get(key)
+    if hit:
+        return forecast
+    payload = await async_get_json(OPENWEATHER_BASEURL, params=_forecast_params(key))
+    return _store_forecast(key, payload)
@@ -0,0 +1,63 @@
+import asyncio
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from langchain_core.tools import BaseTool
+
+from ..config.settings import ASYNC_BLOCKING_MAX_WORKERS
+
+# Bounded pool for tools whose SDKs only offer blocking calls (googlemaps, Amadeus, SerpAPI),
+# so async callers never run them on the event loop thread.
+_BLOCKING_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    global _BLOCKING_EXECUTOR
+    if _BLOCKING_EXECUTOR is None:
+        _BLOCKING_EXECUTOR = ThreadPoolExecutor(max_workers=ASYNC_BLOCKING_MAX_WORKERS, thread_name_prefix="blocking-io")
+    return _BLOCKING_EXECUTOR
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, executor: Optional[Executor] = None, **kwargs: Any) -> Any:
+    """Runs a blocking callable on a worker thread and awaits its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or get_blocking_executor(), functools.partial(func, *args, **kwargs))
+
+
+def async_variant(sync_tool: BaseTool) -> Callable:
+    """
+    Decorator that registers an async function as the coroutine of an existing @tool,
+    so `ainvoke` awaits it instead of running the sync implementation in a thread.
+    """
+    def decorator(coroutine: Callable) -> Callable:
+        sync_tool.coroutine = coroutine
+        return coroutine
+    return decorator
+
+
+def _offloaded(func: Callable) -> Callable:
+    # wraps() keeps the signature, so injected arguments such as RunnableConfig still reach func
+    @functools.wraps(func)
+    async def coroutine(*args: Any, **kwargs: Any) -> Any:
+        return await run_blocking(func, *args, **kwargs)
+    return coroutine
+
+
+def _inline(func: Callable) -> Callable:
+    @functools.wraps(func)
+    async def coroutine(*args: Any, **kwargs: Any) -> Any:
+        return func(*args, **kwargs)
+    return coroutine
+
+
+def offload_blocking(*sync_tools: BaseTool) -> None:
+    """Gives each tool a coroutine that runs its blocking implementation on the shared blocking pool."""
+    for sync_tool in sync_tools:
+        sync_tool.coroutine = _offloaded(sync_tool.func)
+
+
+def run_inline(*sync_tools: BaseTool) -> None:
+    """Gives CPU-only tools a coroutine that runs them directly, skipping the thread hop."""
+    for sync_tool in sync_tools:
+        sync_tool.coroutine = _inline(sync_tool.func)
@@ -0,0 +1,157 @@
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+_ISO_DURATION = re.compile(r"P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$")
+
+# Objectives for Pareto selection and ranking: lower is better for all of them
+PARETO_COLUMNS = ("price", "duration_minutes", "stops")
+
+
+def parse_iso8601_duration(duration: Optional[str]) -> int:
+    """Converts an ISO-8601 duration such as 'PT14H35M' or 'P1DT2H' to whole minutes (0 if unparseable)."""
+    match = _ISO_DURATION.match(duration or "")
+    if not match:
+        return 0
+    parts = {name: float(value) for name, value in match.groupdict().items() if value}
+    return int(parts.get("days", 0) * 1440 + parts.get("hours", 0) * 60 + parts.get("minutes", 0) + parts.get("seconds", 0) // 60)
+
+
+class FlightOfferTable:
+    """
+    Columnar view of an Amadeus flight-offers payload: one NumPy array per attribute, one
+    row per offer. Sorting, filtering and Pareto selection are vectorized and return new
+    tables over the same raw offers, so nothing is re-parsed or re-validated.
+
+    Columns: flight_id, price, currency, duration_minutes (all itineraries), stops (all
+    itineraries), departure (first segment, datetime64[m]) and carrier (validating airline).
+    """
+
+    def __init__(self, offers: Sequence[Dict[str, Any]], rows: Optional[np.ndarray] = None, columns: Optional[Dict[str, np.ndarray]] = None):
+        self.offers = offers
+        if columns is None:
+            columns = self._parse(offers)
+            rows = np.arange(len(offers))
+        self.rows = rows
+        self.columns = columns
+
+    @staticmethod
+    def _parse(offers: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        flight_ids, prices, currencies, durations, stops, departures, carriers = [], [], [], [], [], [], []
+        for offer in offers:
+            itineraries = offer.get("itineraries") or []
+            segments = [itinerary.get("segments") or [] for itinerary in itineraries]
+            first_segment = segments[0][0] if segments and segments[0] else {}
+            price = offer.get("price") or {}
+            validating = offer.get("validatingAirlineCodes") or [first_segment.get("carrierCode", "")]
+
+            flight_ids.append(str(offer.get("id", "")))
+            prices.append(float(price.get("grandTotal") or "nan"))
+            currencies.append(price.get("currency", ""))
+            durations.append(sum(parse_iso8601_duration(itinerary.get("duration")) for itinerary in itineraries))
+            stops.append(sum(max(len(legs) - 1, 0) for legs in segments))
+            departures.append(first_segment.get("departure", {}).get("at") or "NaT")
+            carriers.append(validating[0] or "")
+
+        return {
+            "flight_id": np.array(flight_ids, dtype=str),
+            "price": np.array(prices, dtype=np.float64),
+            "currency": np.array(currencies, dtype=str),
+            "duration_minutes": np.array(durations, dtype=np.int32),
+            "stops": np.array(stops, dtype=np.int16),
+            "departure": np.array(departures, dtype="datetime64[m]"),
+            "carrier": np.array(carriers, dtype=str),
+        }
+
+    @classmethod
+    def from_offers(cls, offers: Sequence[Dict[str, Any]]) -> "FlightOfferTable":
+        return cls(offers)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def take(self, indices: np.ndarray) -> "FlightOfferTable":
+        """Returns a table with the given positions (an index array or boolean mask), in that order."""
+        return FlightOfferTable(self.offers, self.rows[indices], {name: values[indices] for name, values in self.columns.items()})
+
+    def filter(self, max_price: Optional[float] = None, max_stops: Optional[int] = None, max_duration_minutes: Optional[int] = None,
+               carriers: Optional[Sequence[str]] = None, depart_after: Optional[str] = None, depart_before: Optional[str] = None) -> "FlightOfferTable":
+        """
+        Keeps offers matching every given bound. depart_after/depart_before take 'HH:MM' times of
+        day; carriers takes IATA airline codes.
+        """
+        mask = ~np.isnan(self.columns["price"])
+        if max_price is not None:
+            mask &= self.columns["price"] <= max_price
+        if max_stops is not None:
+            mask &= self.columns["stops"] <= max_stops
+        if max_duration_minutes is not None:
+            mask &= self.columns["duration_minutes"] <= max_duration_minutes
+        if carriers:
+            mask &= np.isin(self.columns["carrier"], [carrier.upper() for carrier in carriers])
+        if depart_after or depart_before:
+            departure = self.columns["departure"]
+            minute_of_day = (departure - departure.astype("datetime64[D]")).astype(np.int64)
+            if depart_after:
+                mask &= minute_of_day >= _minute_of_day(depart_after)
+            if depart_before:
+                mask &= minute_of_day <= _minute_of_day(depart_before)
+        return self.take(mask)
+
+    def sort_by(self, column: str, descending: bool = False) -> "FlightOfferTable":
+        order = np.argsort(self.columns[column], kind="stable")
+        return self.take(order[::-1] if descending else order)
+
+    def _objectives(self) -> np.ndarray:
+        return np.column_stack([self.columns[name].astype(np.float64) for name in PARETO_COLUMNS])
+
+    def pareto_front(self) -> "FlightOfferTable":
+        """Keeps offers not dominated on price, duration and stops (no other offer is as good on all and better on one)."""
+        objectives = self._objectives()
+        no_worse = (objectives[:, None, :] <= objectives[None, :, :]).all(axis=2)
+        better = (objectives[:, None, :] < objectives[None, :, :]).any(axis=2)
+        dominated = (no_worse & better).any(axis=0)
+        return self.take(~dominated)
+
+    def scores(self, weights: Sequence[float] = (1.0, 1.0, 1.0)) -> np.ndarray:
+        """Weighted sum of price, duration and stops, each min-max scaled to [0, 1] within this table; lower is better."""
+        objectives = self._objectives()
+        if not len(objectives):
+            return np.zeros(0)
+        low, span = objectives.min(axis=0), np.ptp(objectives, axis=0)
+        scaled = (objectives - low) / np.where(span > 0, span, 1.0)
+        return scaled @ np.asarray(weights, dtype=np.float64)
+
+    def top_k(self, k: int, weights: Sequence[float] = (1.0, 1.0, 1.0)) -> "FlightOfferTable":
+        """The k best Pareto-optimal offers, best first."""
+        front = self.pareto_front()
+        return front.take(np.argsort(front.scores(weights), kind="stable")[:k])
+
+    def offer(self, flight_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the raw offer with the given id, if it is in this table."""
+        matches = np.flatnonzero(self.columns["flight_id"] == str(flight_id))
+        return self.offers[self.rows[matches[0]]] if len(matches) else None
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Compact per-offer summaries, suitable for returning to the LLM."""
+        return [
+            {
+                "flight_id": str(self.columns["flight_id"][i]),
+                "price": float(self.columns["price"][i]),
+                "currency": str(self.columns["currency"][i]),
+                "duration_minutes": int(self.columns["duration_minutes"][i]),
+                "stops": int(self.columns["stops"][i]),
+                "departure": str(self.columns["departure"][i]),
+                "carrier": str(self.columns["carrier"][i]),
+            }
+            for i in range(len(self.rows))
+        ]
+
+
+def _minute_of_day(hh_mm: str) -> int:
+    hours, minutes = hh_mm.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..config.settings import HTTP_MAX_CONNECTIONS_PER_HOST, HTTP_MAX_HOSTS, HTTP_TIMEOUT
+
+# Shared keep-alive transports. The sync session backs the googlemaps client and the
+# REST tools; async tools use one httpx client per event loop. Both cap concurrent
+# connections per host at HTTP_MAX_CONNECTIONS_PER_HOST.
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_HOST_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def get_http_session() -> requests.Session:
+    """Returns the process-wide pooled requests session."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                # pool_block makes each host's pool a hard cap instead of opening overflow connections
+                adapter = HTTPAdapter(pool_connections=HTTP_MAX_HOSTS, pool_maxsize=HTTP_MAX_CONNECTIONS_PER_HOST, pool_block=True)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def get_json(url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """GETs url on the shared session and returns the decoded JSON body."""
+    response = get_http_session().get(url, params=params, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Returns the pooled httpx client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_HOSTS * HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=HTTP_MAX_HOSTS * HTTP_MAX_CONNECTIONS_PER_HOST,
+        )
+        client = _ASYNC_CLIENTS[loop] = httpx.AsyncClient(limits=limits, timeout=HTTP_TIMEOUT)
+    return client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    semaphores = _HOST_SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+    host = urlsplit(url).netloc
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(HTTP_MAX_CONNECTIONS_PER_HOST)
+    return semaphores[host]
+
+
+async def async_get_json(url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """Async GET on the shared client, limited per host; returns the decoded JSON body."""
+    async with _host_semaphore(url):
+        response = await get_async_http_client().get(url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+async def aclose_async_http_client() -> None:
+    """Closes the running loop's httpx client; call before the loop shuts down."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,91 @@
+import string
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+_ALPHABET = string.digits + string.ascii_uppercase
+_CHAR_INDEX = {c: i for i, c in enumerate(_ALPHABET)}
+
+
+class IataIndex:
+    """
+    Compact, array-backed lookup table from IATA codes to names.
+
+    Every possible code of up to `code_length` base-36 characters maps to a fixed slot in
+    an int32 array that stores an index into the names list (-1 when unknown), so a lookup
+    is a couple of arithmetic operations and one array read, with no per-entry dict
+    overhead. Entries learned at runtime (e.g. from an API fallback) can be added with add().
+    """
+
+    def __init__(self, code_length: int, path: Optional[str] = None):
+        self.code_length = code_length
+        self.path = path
+        self._lock = threading.Lock()
+        self._slots = array('i', [-1]) * (len(_ALPHABET) + 1) ** code_length
+        self._names: List[str] = []
+        if path is not None:
+            self.load(path)
+
+    def _slot(self, code: str) -> Optional[int]:
+        code = code.strip().upper()
+        if not code or len(code) > self.code_length:
+            return None
+        slot = 0
+        for char in code.ljust(self.code_length):
+            # Slot digit 0 is reserved for padding so 'A' and 'A ' don't collide with other codes
+            index = 0 if char == ' ' else _CHAR_INDEX.get(char, -1) + 1
+            if index < 0:
+                return None
+            slot = slot * (len(_ALPHABET) + 1) + index
+        return slot
+
+    def load(self, path: str) -> int:
+        """
+        Replaces the index contents with the tab-separated `code<TAB>name` entries in path.
+        Returns:
+            int: The number of entries loaded.
+        """
+        slots = array('i', [-1]) * len(self._slots)
+        names: List[str] = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith('#'):
+                    continue
+                code, _, name = line.rstrip('\n').partition('\t')
+                slot = self._slot(code)
+                if slot is None or not name:
+                    continue
+                slots[slot] = len(names)
+                names.append(name)
+        with self._lock:
+            self._slots, self._names = slots, names
+            self.path = path
+        return len(names)
+
+    def reload(self) -> int:
+        """Reloads the bundled file, dropping entries added at runtime."""
+        if self.path is None:
+            return len(self)
+        return self.load(self.path)
+
+    def add(self, code: str, name: str) -> None:
+        slot = self._slot(code)
+        if slot is None:
+            return
+        with self._lock:
+            self._slots[slot] = len(self._names)
+            self._names.append(name)
+
+    def lookup(self, code: str) -> Optional[str]:
+        slot = self._slot(code)
+        if slot is None:
+            return None
+        with self._lock:
+            index = self._slots[slot]
+            return self._names[index] if index >= 0 else None
+
+    def lookup_many(self, codes: Iterable[str]) -> Dict[str, Optional[str]]:
+        return {code: self.lookup(code) for code in codes}
+
+    def __len__(self) -> int:
+        return sum(1 for index in self._slots if index >= 0)
@@ -0,0 +1,134 @@
+from typing import Any, Callable, Dict, Optional
+
+from .async_tools import run_blocking
+from .response_cache import ResponseCache, make_cache_key
+
+
+def model_id(llm: Any) -> str:
+    """Identifies the model behind a chat model instance, so answers of different models are cached apart."""
+    for attribute in ("model_name", "model"):
+        value = getattr(llm, attribute, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(llm).__name__
+
+
+def response_text(response: Any) -> str:
+    """The text of an LLM response: a message's content (text parts joined) or a plain string."""
+    content = getattr(response, "content", response)
+    if isinstance(content, list):
+        content = "".join(part if isinstance(part, str) else part.get("text", "") for part in content if isinstance(part, (str, dict)))
+    return content if isinstance(content, str) else ""
+
+
+class LLMCache:
+    """
+    Memoizes the answers of LLM-backed helper tools (average visit time, route price, ...).
+
+    An answer is keyed on the model id and the rendered prompt, whitespace-collapsed and
+    case-folded, so asking the same helper question again is a SQLite lookup instead of a model
+    round trip. Answers are stored in a ResponseCache (one namespace per tool), expire after
+    ttl seconds and survive restarts. Each namespace keeps at most max_entries answers; the
+    oldest are evicted first. Hit/miss counts and hit rates are reported by stats().
+
+    With a SemanticCache, calls that pass a semantic_key (the tool's question without the
+    prompt boilerplate, e.g. the address) that miss the exact cache are matched by meaning
+    before the model is asked.
+    """
+
+    def __init__(self, store: ResponseCache, ttl: float = 7 * 24 * 60 * 60, max_entries: int = 2000, semantic: Any = None):
+        self.store = store
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.semantic = semantic
+        self.evictions: Dict[str, int] = {}
+
+    @staticmethod
+    def key(llm: Any, prompt: str) -> str:
+        return make_cache_key((model_id(llm), prompt), casefold=True)
+
+    def lookup(self, namespace: str, llm: Any, prompt: str) -> Optional[str]:
+        """Returns the cached answer to prompt, or None on a miss (or when the cache is bypassed)."""
+        if self.store.bypass:
+            return None
+        hit, value = self.store.get(namespace, self.key(llm, prompt))
+        return value if hit else None
+
+    def store_answer(self, namespace: str, llm: Any, prompt: str, answer: str) -> None:
+        self.store.set(namespace, self.key(llm, prompt), answer, self.ttl)
+        evicted = self.store.trim(namespace, self.max_entries)
+        if evicted:
+            self.evictions[namespace] = self.evictions.get(namespace, 0) + evicted
+
+    def _semantic_lookup(self, namespace: str, llm: Any, prompt: str, semantic_key: Optional[str]) -> Optional[str]:
+        if self.semantic is None or semantic_key is None or self.store.bypass:
+            return None
+        answer = self.semantic.lookup(namespace, model_id(llm), semantic_key)
+        if answer is not None:
+            self.store_answer(namespace, llm, prompt, answer)  # The exact prompt is answered directly next time
+        return answer
+
+    def _store(self, namespace: str, llm: Any, prompt: str, answer: str, semantic_key: Optional[str]) -> None:
+        self.store_answer(namespace, llm, prompt, answer)
+        if self.semantic is not None and semantic_key is not None:
+            self.semantic.add(namespace, model_id(llm), semantic_key, answer)
+
+    def invoke(self, namespace: str, llm: Any, prompt: str, cacheable: Optional[Callable[[str], bool]] = None,
+               semantic_key: Optional[str] = None) -> str:
+        """
+        Answers prompt from the cache, or with llm.invoke(prompt) on a miss.
+        Args:
+            namespace (str): Cache namespace, one per tool.
+            llm: The chat model (or anything with invoke/ainvoke returning a message or a string).
+            prompt (str): The rendered prompt.
+            cacheable: Optional check on the answer; answers it rejects (unparseable ones) are not stored.
+            semantic_key (str): The question to match by meaning in the semantic cache, if any.
+        Returns:
+            str: The answer text ("" if the model returned nothing usable).
+        """
+        answer = self.lookup(namespace, llm, prompt)
+        if answer is None:
+            answer = self._semantic_lookup(namespace, llm, prompt, semantic_key)
+        if answer is None:
+            answer = response_text(llm.invoke(prompt))
+            if answer and (cacheable is None or cacheable(answer)):
+                self._store(namespace, llm, prompt, answer, semantic_key)
+        return answer
+
+    async def ainvoke(self, namespace: str, llm: Any, prompt: str, cacheable: Optional[Callable[[str], bool]] = None,
+                      semantic_key: Optional[str] = None) -> str:
+        """Async form of invoke(): awaits llm.ainvoke(prompt) and keeps SQLite and embeddings off the event loop."""
+        answer = await run_blocking(self.lookup, namespace, llm, prompt)
+        if answer is None:
+            answer = await run_blocking(self._semantic_lookup, namespace, llm, prompt, semantic_key)
+        if answer is None:
+            answer = response_text(await llm.ainvoke(prompt))
+            if answer and (cacheable is None or cacheable(answer)):
+                await run_blocking(self._store, namespace, llm, prompt, answer, semantic_key)
+        return answer
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns hits, misses, hit_rate, entries and evictions per namespace (and the semantic cache's, if any)."""
+        report = {namespace: {**counters, "evictions": self.evictions.get(namespace, 0)} for namespace, counters in self.store.stats().items()}
+        if self.semantic is not None:
+            for namespace, counters in self.semantic.stats().items():
+                report.setdefault(namespace, {})["semantic"] = counters
+        return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.config.settings import LLM_CACHE_PATH
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the LLM answer cache")
+    parser.add_argument("--clear", nargs="?", const="", metavar="NAMESPACE", help="Delete all answers (or one namespace's)")
+    parser.add_argument("--purge-expired", action="store_true", help="Delete expired answers")
+    args = parser.parse_args()
+    store = ResponseCache(LLM_CACHE_PATH)
+    if args.clear is not None:
+        store.clear(args.clear or None)
+    if args.purge_expired:
+        print(f"Removed {store.purge_expired()} expired answers")
+    for namespace, counters in store.stats().items():
+        print(f"{namespace}: {counters['entries']} answers")
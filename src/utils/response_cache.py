@@ -0,0 +1,153 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def _normalize(value: Any, casefold: bool) -> Any:
+    """Normalizes an argument so trivially different calls share a cache key."""
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        return value.casefold() if casefold else value
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v, casefold) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v, casefold) for k, v in value.items()}
+    return value
+
+
+def make_cache_key(args: tuple = (), kwargs: Optional[Dict[str, Any]] = None, casefold: bool = False) -> str:
+    """
+    Builds a stable cache key from call arguments.
+    Strings are whitespace-collapsed (and case-folded when casefold is set, for free-text
+    inputs such as addresses), floats are rounded to 6 decimals and keyword arguments are
+    sorted, so equivalent calls map to the same key.
+    """
+    return json.dumps([_normalize(list(args), casefold), _normalize(kwargs or {}, casefold)], sort_keys=True, default=str)
+
+
+class ResponseCache:
+    """
+    Disk-backed cache for JSON-serializable API responses, stored in SQLite (WAL mode).
+
+    Entries are grouped by namespace (one per endpoint) and carry their own expiry, so each
+    endpoint can use a different TTL. The database survives restarts and can be shared by
+    several processes. Hit/miss counters are kept per namespace for the current process.
+    """
+
+    def __init__(self, path: str, bypass: bool = False):
+        self.path = path
+        self.bypass = bypass
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _record(self, namespace: str, outcome: str) -> None:
+        counters = self._stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+    def get(self, namespace: str, key: str) -> Tuple[bool, Any]:
+        """
+        Looks up a cached value.
+        Returns:
+            Tuple[bool, Any]: (True, value) on a fresh hit, (False, None) otherwise.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM responses WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is None or row[1] <= time.time():
+                self._record(namespace, "misses")
+                return False, None
+            self._record(namespace, "hits")
+        return True, json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO responses (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, payload, time.time() + ttl),
+            )
+
+    def get_or_set(self, namespace: str, key: str, fetch: Callable[[], Any], ttl: float, bypass: bool = False) -> Any:
+        """
+        Returns the cached value for key, calling fetch() and storing its result on a miss.
+        When bypass (or the cache-wide bypass flag) is set, fetch() is always called and
+        its result still refreshes the cache. Exceptions raised by fetch() are not cached.
+        """
+        if not (bypass or self.bypass):
+            hit, value = self.get(namespace, key)
+            if hit:
+                return value
+        value = fetch()
+        self.set(namespace, key, value, ttl)
+        return value
+
+    def purge_expired(self) -> int:
+        """Deletes expired entries and returns how many were removed."""
+        with self._lock:
+            cursor = self._connect().execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            return cursor.rowcount
+
+    def trim(self, namespace: str, max_entries: int) -> int:
+        """Keeps the max_entries newest entries of a namespace (by expiry) and returns how many were removed."""
+        with self._lock:
+            cursor = self._connect().execute(
+                "DELETE FROM responses WHERE namespace = ? AND key NOT IN ("
+                " SELECT key FROM responses WHERE namespace = ? ORDER BY expires_at DESC LIMIT ?)",
+                (namespace, namespace, max(max_entries, 0)),
+            )
+            return cursor.rowcount
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._connect().execute("DELETE FROM responses")
+            else:
+                self._connect().execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns hits, misses, hit_rate and stored entry count per namespace."""
+        with self._lock:
+            entries = dict(self._connect().execute("SELECT namespace, COUNT(*) FROM responses GROUP BY namespace").fetchall())
+            report = {}
+            for namespace in sorted(set(entries) | set(self._stats)):
+                counters = self._stats.get(namespace, {"hits": 0, "misses": 0})
+                lookups = counters["hits"] + counters["misses"]
+                report[namespace] = {
+                    **counters,
+                    "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+                    "entries": entries.get(namespace, 0),
+                }
+            return report
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
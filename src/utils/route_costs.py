@@ -0,0 +1,147 @@
+import json
+import re
+from typing import Any, Dict, Iterable, Optional
+
+_QUANTITY = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([^\W\d_]+)")
+
+_METERS_PER_UNIT = {
+    "m": 1.0, "meter": 1.0, "meters": 1.0, "metre": 1.0, "metres": 1.0,
+    "km": 1000.0, "kms": 1000.0, "kilometer": 1000.0, "kilometers": 1000.0, "kilometre": 1000.0, "kilometres": 1000.0,
+    "mi": 1609.344, "mile": 1609.344, "miles": 1609.344,
+    "ft": 0.3048, "feet": 0.3048, "foot": 0.3048,
+    "yd": 0.9144, "yard": 0.9144, "yards": 0.9144,
+}
+
+_SECONDS_PER_UNIT = {
+    "s": 1, "sec": 1, "secs": 1, "second": 1, "seconds": 1,
+    "m": 60, "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "h": 3600, "hr": 3600, "hrs": 3600, "hour": 3600, "hours": 3600,
+    "d": 86400, "day": 86400, "days": 86400,
+}
+
+# Travel modes as Google names them (and common synonyms), by how they are priced
+_MODE_PRICING = {
+    "driving": "taxi", "drive": "taxi", "taxi": "taxi", "car": "taxi",
+    "transit": "transit", "bus": "transit", "subway": "transit", "train": "transit", "tram": "transit", "rail": "transit",
+    "walking": "free", "walk": "free", "bicycling": "free", "bicycle": "free", "cycling": "free",
+}
+
+
+def _parse_quantity(text: Optional[str], units: Dict[str, float]) -> Optional[float]:
+    if not text:
+        return None
+    total, matched = 0.0, False
+    for number, unit in _QUANTITY.findall(text):
+        factor = units.get(unit.lower())
+        if factor is not None:
+            total += float(number.replace(",", "")) * factor
+            matched = True
+    return total if matched else None
+
+
+def parse_distance_meters(text: Optional[str]) -> Optional[float]:
+    """Converts a distance such as '5.3 mi', '1,200 m' or '12 km' to meters (None if unparseable)."""
+    return _parse_quantity(text, _METERS_PER_UNIT)
+
+
+def parse_duration_seconds(text: Optional[str]) -> Optional[float]:
+    """Converts a duration such as '1 hour 20 mins' or '2 days 3 hours' to seconds (None if unparseable)."""
+    return _parse_quantity(text, _SECONDS_PER_UNIT)
+
+
+class RouteCostModel:
+    """
+    Prices a route locally, without a model call.
+
+    Google's fare is used when the route has one (Directions returns it for many transit
+    routes). Otherwise the region's tariff applies: a metered taxi fare for driving (base,
+    which may cover the first km, + per km + per minute, at least the minimum), a flat fare
+    per ride for transit, and nothing for walking or cycling. Regions are matched on the
+    country at the end of an address. Tariffs are read from a JSON file with a "default"
+    entry and per-region entries.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.default: Dict[str, Any] = {}
+        self.regions: Dict[str, Dict[str, Any]] = {}
+        self._aliases: Dict[str, str] = {}
+        if path is not None:
+            self.load(path)
+
+    def load(self, path: str) -> int:
+        """
+        Replaces the tariffs with the contents of path.
+        Returns:
+            int: The number of regions loaded.
+        """
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.default = data.get("default", {})
+        self.regions = {name.casefold(): tariff for name, tariff in data.get("regions", {}).items()}
+        self._aliases = {name: name for name in self.regions}
+        for name, tariff in self.regions.items():
+            for alias in tariff.get("aliases", []):
+                self._aliases[alias.casefold()] = name
+        return len(self.regions)
+
+    def region(self, *addresses: Optional[str]) -> Optional[str]:
+        """The first known region named by the last comma-separated part of one of addresses, or None."""
+        for address in addresses:
+            if not address:
+                continue
+            last = address.rsplit(",", 1)[-1]
+            # Drop postcodes and the like ("Tokyo 105-0011", "Japan 100-0005")
+            candidate = " ".join(word for word in last.split() if not any(c.isdigit() for c in word)).casefold()
+            if candidate in self._aliases:
+                return self._aliases[candidate]
+        return None
+
+    def estimate(self, mode: str, distance_meters: Optional[float], duration_seconds: Optional[float],
+                 region: Optional[str] = None, fare: Optional[Dict[str, Any]] = None, transit_rides: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Prices one route.
+        Args:
+            mode (str): Travel mode ('driving', 'transit', 'walking', 'bicycling', ...).
+            distance_meters (float): Route distance, or None if unknown.
+            duration_seconds (float): Route duration, or None if unknown.
+            region (str): Region name or alias, or 'default' for the fallback tariff.
+            fare (dict): Google's fare ({'currency': 'JPY', 'value': 210, ...}), if the route has one.
+            transit_rides (int): Number of transit rides (vehicle legs) in the route.
+        Returns:
+            Optional[Dict[str, Any]]: estimated_price, currency, source ('google_fare' or
+            'tariff'), region and mode; None if the route cannot be priced locally (unknown
+            mode, a driving or transit route in an unknown region, or a driving route without
+            a distance). Walking and cycling are free everywhere, with a None currency (and
+            region) when the region has no tariff.
+        """
+        if fare and fare.get("value") is not None and fare.get("currency"):
+            return self._result(float(fare["value"]), fare["currency"], "google_fare", region, mode)
+
+        pricing = _MODE_PRICING.get((mode or "").strip().lower())
+        name = "default" if region == "default" else self._aliases.get((region or "").casefold())
+        tariff = self.default if name == "default" else self.regions.get(name)
+        if pricing == "free":
+            # Walking and cycling cost nothing anywhere; the currency is only known with a tariff
+            return self._result(0.0, tariff.get("currency") if tariff else None, "tariff", name, mode)
+        if pricing is None or not tariff:
+            return None
+        currency = tariff["currency"]
+
+        if pricing == "transit":
+            return self._result(tariff["transit"]["flat"] * max(transit_rides, 1), currency, "tariff", name, mode)
+        if distance_meters is None:
+            return None
+        taxi = tariff["taxi"]
+        charged_km = max(distance_meters / 1000 - taxi.get("included_km", 0), 0)
+        price = taxi["base"] + taxi["per_km"] * charged_km + taxi.get("per_minute", 0) * (duration_seconds or 0) / 60
+        return self._result(max(price, taxi.get("minimum", 0)), currency, "tariff", name, mode)
+
+    @staticmethod
+    def _result(price: float, currency: str, source: str, region: Optional[str], mode: str) -> Dict[str, Any]:
+        return {"estimated_price": round(price, 2), "currency": currency, "source": source, "region": region, "mode": mode}
+
+
+def count_transit_rides(travel_modes: Iterable[str]) -> int:
+    """Number of transit legs among a route's step travel modes."""
+    return sum(1 for mode in travel_modes if _MODE_PRICING.get((mode or "").lower()) == "transit")
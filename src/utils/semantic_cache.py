@@ -0,0 +1,272 @@
+import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class BatchingEmbedder:
+    """
+    Embeds texts with a sentence-transformers model, batching concurrent requests.
+
+    embed() queues its texts and waits. A worker thread takes whatever has been queued within
+    batch_window seconds (up to batch_size texts) and encodes it in one model call, so the
+    parallel tool calls of a turn share a forward pass. The model (and torch) is only loaded on
+    first use. Vectors are L2-normalized, so their inner product is the cosine similarity.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 64, batch_window: float = 0.005, model: Any = None):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.batches = 0
+        self._model = model
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._thread.start()
+
+    def embed(self, texts: Sequence[str]):
+        """Returns a (len(texts), dimension) float32 array of normalized embeddings."""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((list(texts), future))
+        return future.result()
+
+    def _load(self) -> Any:
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def _run(self) -> None:
+        import numpy as np
+
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.batch_window
+            while size < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+                size += len(batch[-1][0])
+            texts = [text for request, _ in batch for text in request]
+            try:
+                vectors = np.asarray(
+                    self._load().encode(texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True),
+                    dtype="float32",
+                ).reshape(len(texts), -1)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            offset = 0
+            for request, future in batch:
+                future.set_result(vectors[offset:offset + len(request)])
+                offset += len(request)
+
+
+class _Index:
+    """One namespace's FAISS index (inner product over normalized vectors) and the answers it points to."""
+
+    def __init__(self, prefix: str, embedding_model: str):
+        self.prefix = prefix
+        self.embedding_model = embedding_model
+        self.index = None
+        self.entries: Dict[int, Dict[str, Any]] = {}  # FAISS id -> text, answer, expires_at
+        self.next_id = 0
+
+    def load(self) -> None:
+        import faiss
+
+        try:
+            with open(self.prefix + ".json", encoding="utf-8") as file:
+                meta = json.load(file)
+            if meta["embedding_model"] != self.embedding_model:
+                return  # Vectors of another model are not comparable; start over
+            self.index = faiss.read_index(self.prefix + ".faiss")
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, RuntimeError) as e:
+            print(f"Error loading semantic cache index {self.prefix}: {e}. Starting a new one.")
+            return
+        self.entries = {int(key): entry for key, entry in meta["entries"].items()}
+        self.next_id = meta["next_id"]
+
+    def save(self) -> None:
+        import faiss
+
+        faiss.write_index(self.index, self.prefix + ".faiss.tmp")
+        os.replace(self.prefix + ".faiss.tmp", self.prefix + ".faiss")
+        with open(self.prefix + ".json.tmp", "w", encoding="utf-8") as file:
+            json.dump({"embedding_model": self.embedding_model, "next_id": self.next_id,
+                       "entries": self.entries}, file, ensure_ascii=False)
+        os.replace(self.prefix + ".json.tmp", self.prefix + ".json")
+
+    def remove(self, ids: List[int]) -> None:
+        import numpy as np
+
+        if ids:
+            self.index.remove_ids(np.asarray(ids, dtype="int64"))
+            for entry_id in ids:
+                self.entries.pop(entry_id, None)
+
+    def search(self, vectors, threshold: float, now: float, k: int = 4) -> List[Optional[Tuple[Dict[str, Any], float]]]:
+        """Best fresh entry at or above threshold for each vector; expired entries met on the way are removed."""
+        if self.index is None or self.index.ntotal == 0:
+            return [None] * len(vectors)
+        scores, ids = self.index.search(vectors, min(k, self.index.ntotal))
+        results, expired = [], set()
+        for row_scores, row_ids in zip(scores, ids):
+            match = None
+            for score, entry_id in zip(row_scores, row_ids):
+                if entry_id < 0 or score < threshold:
+                    break
+                entry = self.entries.get(int(entry_id))
+                if entry is None or entry["expires_at"] <= now:
+                    expired.add(int(entry_id))
+                    continue
+                match = (entry, float(score))
+                break
+            results.append(match)
+        self.remove(sorted(expired))
+        return results
+
+    def add(self, vectors, texts: Sequence[str], answers: Sequence[str], expires_at: float, max_entries: int) -> None:
+        import faiss
+        import numpy as np
+
+        if self.index is None:
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(vectors.shape[1]))
+        ids = list(range(self.next_id, self.next_id + len(texts)))
+        self.next_id += len(texts)
+        self.index.add_with_ids(vectors, np.asarray(ids, dtype="int64"))
+        for entry_id, text, answer in zip(ids, texts, answers):
+            self.entries[entry_id] = {"text": text, "answer": answer, "expires_at": expires_at}
+        # Ids grow with insertion order, so the smallest are the oldest
+        overflow = len(self.entries) - max_entries
+        self.remove(sorted(self.entries)[:overflow] if overflow > 0 else [])
+
+
+class SemanticCache:
+    """
+    Embedding-keyed cache for the answers of LLM-backed helper tools.
+
+    Where LLMCache needs the same prompt, this matches questions by meaning: the tool's
+    question ("Tokyo National Museum", "National Museum Tokyo") is embedded and looked up in
+    a FAISS index of earlier questions, and the answer of the nearest one is reused if its
+    cosine similarity is at least the namespace's threshold. There is one index per tool
+    namespace and model id, persisted under `directory` after every insert.
+
+    Entries expire after ttl seconds and each index keeps at most max_entries, the oldest
+    evicted first. Embeddings go through a BatchingEmbedder, and lookup_many/add_many embed
+    all their texts in one batch. If faiss or the embedding model cannot be loaded, the cache
+    reports an error once and then always misses.
+    """
+
+    def __init__(self, directory: str, embedder: Any, threshold: float = 0.9, thresholds: Optional[Dict[str, float]] = None,
+                 ttl: float = 7 * 24 * 60 * 60, max_entries: int = 2000, max_recent: int = 256):
+        self.directory = directory
+        self.embedder = embedder
+        self.threshold = threshold
+        self.thresholds = dict(thresholds or {})
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_recent = max_recent
+        self.disabled = False
+        self._indexes: Dict[Tuple[str, str], _Index] = {}
+        self._recent: "OrderedDict[str, Any]" = OrderedDict()  # Recent embeddings, so add() after a missed lookup does not embed again
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _index(self, namespace: str, model: str) -> _Index:
+        index = self._indexes.get((namespace, model))
+        if index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            name = _SAFE_NAME.sub("_", f"{namespace}.{model}")
+            index = self._indexes[(namespace, model)] = _Index(os.path.join(self.directory, name), self.embedder.model_name)
+            index.load()
+        return index
+
+    def _embed(self, texts: Sequence[str]):
+        """Embeds texts (recently seen ones from memory). Runs outside the lock so concurrent callers batch together."""
+        import numpy as np
+
+        with self._lock:
+            known = {text: self._recent[text] for text in texts if text in self._recent}
+        missing = list(dict.fromkeys(text for text in texts if text not in known))
+        if missing:
+            known.update(zip(missing, self.embedder.embed(missing)))
+        with self._lock:
+            for text in texts:
+                self._recent[text] = known[text]
+                self._recent.move_to_end(text)
+            while len(self._recent) > self.max_recent:
+                self._recent.popitem(last=False)
+        return np.stack([known[text] for text in texts]).astype("float32")
+
+    def _fail(self, e: Exception) -> None:
+        self.disabled = True
+        print(f"Error: semantic cache unavailable ({e}). Falling back to exact-match caching.")
+
+    def lookup_many(self, namespace: str, model: str, texts: Sequence[str]) -> List[Optional[str]]:
+        """Cached answers of the questions nearest to texts (None where nothing is similar enough)."""
+        if self.disabled or not texts:
+            return [None] * len(texts)
+        try:
+            vectors = self._embed(texts)
+            with self._lock:
+                matches = self._index(namespace, model).search(vectors, self.thresholds.get(namespace, self.threshold), time.time())
+        except Exception as e:
+            self._fail(e)
+            return [None] * len(texts)
+        counters = self._stats.setdefault(namespace, {"hits": 0, "misses": 0})
+        for match in matches:
+            counters["hits" if match else "misses"] += 1
+        return [match[0]["answer"] if match else None for match in matches]
+
+    def lookup(self, namespace: str, model: str, text: str) -> Optional[str]:
+        return self.lookup_many(namespace, model, [text])[0]
+
+    def add_many(self, namespace: str, model: str, texts: Sequence[str], answers: Sequence[str]) -> None:
+        if self.disabled or not texts:
+            return
+        try:
+            vectors = self._embed(texts)
+            with self._lock:
+                index = self._index(namespace, model)
+                index.add(vectors, texts, answers, time.time() + self.ttl, self.max_entries)
+                index.save()
+        except Exception as e:
+            self._fail(e)
+
+    def add(self, namespace: str, model: str, text: str, answer: str) -> None:
+        self.add_many(namespace, model, [text], [answer])
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns semantic hits, misses, hit_rate and indexed entries per namespace."""
+        with self._lock:
+            entries: Dict[str, int] = {}
+            for (namespace, _), index in self._indexes.items():
+                entries[namespace] = entries.get(namespace, 0) + len(index.entries)
+        report = {}
+        for namespace in sorted(set(entries) | set(self._stats)):
+            counters = self._stats.get(namespace, {"hits": 0, "misses": 0})
+            lookups = counters["hits"] + counters["misses"]
+            report[namespace] = {**counters, "hit_rate": counters["hits"] / lookups if lookups else 0.0, "entries": entries.get(namespace, 0)}
+        return report
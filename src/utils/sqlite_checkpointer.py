@@ -0,0 +1,365 @@
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+from .async_tools import run_blocking
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS threads ("
+    " thread_id TEXT PRIMARY KEY,"
+    " updated_at REAL NOT NULL,"
+    " keep_last INTEGER,"          # NULL: use the saver default
+    " ttl_seconds REAL)",
+    "CREATE TABLE IF NOT EXISTS checkpoints ("
+    " thread_id TEXT NOT NULL,"
+    " checkpoint_ns TEXT NOT NULL,"
+    " checkpoint_id TEXT NOT NULL,"
+    " parent_checkpoint_id TEXT,"
+    " type TEXT NOT NULL,"
+    " checkpoint BLOB NOT NULL,"
+    " metadata_type TEXT NOT NULL,"
+    " metadata BLOB NOT NULL,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    # Channel values, stored once per version: a checkpoint only adds blobs for the channels it changed
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    " thread_id TEXT NOT NULL,"
+    " checkpoint_ns TEXT NOT NULL,"
+    " channel TEXT NOT NULL,"
+    " version TEXT NOT NULL,"
+    " type TEXT NOT NULL,"
+    " data BLOB,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, channel, version))",
+    # Which blob versions each checkpoint uses, so pruned checkpoints can release their blobs
+    "CREATE TABLE IF NOT EXISTS checkpoint_blobs ("
+    " thread_id TEXT NOT NULL,"
+    " checkpoint_ns TEXT NOT NULL,"
+    " checkpoint_id TEXT NOT NULL,"
+    " channel TEXT NOT NULL,"
+    " version TEXT NOT NULL,"
+    " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, channel))",
+    "CREATE INDEX IF NOT EXISTS checkpoint_blobs_by_blob ON checkpoint_blobs (thread_id, checkpoint_ns, channel, version)",
+    "CREATE TABLE IF NOT EXISTS writes ("
+    " thread_id TEXT NOT NULL,"
+    " checkpoint_ns TEXT NOT NULL,"
+    " checkpoint_id TEXT NOT NULL,"
+    " task_id TEXT NOT NULL,"
+    " idx INTEGER NOT NULL,"
+    " channel TEXT NOT NULL,"
+    " type TEXT NOT NULL,"
+    " data BLOB,"
+    " task_path TEXT NOT NULL DEFAULT '',"
+    " PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+)
+
+# Serialized values at least this large are zlib-compressed; the type gets this prefix
+_COMPRESSED = "zlib:"
+
+
+class SqliteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpointer backed by a SQLite file (WAL mode), so conversations survive restarts
+    and no thread state is held in process memory between calls.
+
+    Like InMemorySaver, channel values are stored per version and each checkpoint only records
+    the versions it uses; a step that changes one channel writes one blob. Serialized values of
+    compress_min_bytes or more are zlib-compressed.
+
+    Retention: after each put, only the newest keep_last checkpoints of the thread are kept (older
+    ones, their pending writes and blobs no other checkpoint uses are deleted), and
+    purge_expired() deletes threads idle for longer than ttl_seconds. Both defaults can be
+    overridden per thread with set_retention().
+    """
+
+    def __init__(self, path: str, keep_last: Optional[int] = 20, ttl_seconds: Optional[float] = None,
+                 compress_min_bytes: int = 1024, *, serde: Optional[SerializerProtocol] = None):
+        super().__init__(serde=serde)
+        self.path = path
+        self.keep_last = keep_last if keep_last is None else max(keep_last, 1)
+        self.ttl_seconds = ttl_seconds
+        self.compress_min_bytes = compress_min_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    # --- serialization -------------------------------------------------------------------------
+
+    def _dump(self, value: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        if data is not None and len(data) >= self.compress_min_bytes:
+            return _COMPRESSED + type_, zlib.compress(data)
+        return type_, data
+
+    def _load(self, type_: str, data: bytes) -> Any:
+        if type_.startswith(_COMPRESSED):
+            type_, data = type_[len(_COMPRESSED):], zlib.decompress(data)
+        return self.serde.loads_typed((type_, data))
+
+    # --- reads ---------------------------------------------------------------------------------
+
+    def _tuple(self, conn: sqlite3.Connection, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, type_, data, metadata_type, metadata = row
+        checkpoint = self._load(type_, data)
+        values = conn.execute(
+            "SELECT b.channel, b.type, b.data FROM checkpoint_blobs cb JOIN blobs b"
+            " ON b.thread_id = cb.thread_id AND b.checkpoint_ns = cb.checkpoint_ns AND b.channel = cb.channel AND b.version = cb.version"
+            " WHERE cb.thread_id = ? AND cb.checkpoint_ns = ? AND cb.checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        writes = conn.execute(
+            "SELECT task_id, channel, type, data FROM writes"
+            " WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}},
+            checkpoint={
+                **checkpoint,
+                "channel_values": {channel: self._load(t, d) for channel, t, d in values if t != "empty"},
+            },
+            metadata=self._load(metadata_type, metadata),
+            parent_config=(
+                {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": parent_id}}
+                if parent_id else None
+            ),
+            pending_writes=[(task_id, channel, self._load(t, d)) for task_id, channel, t, d in writes],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        with self._lock:
+            conn = self._connect()
+            if checkpoint_id := get_checkpoint_id(config):
+                row = conn.execute(
+                    f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+                    " ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._tuple(conn, row) if row else None
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+                f" FROM checkpoints{where} ORDER BY thread_id, checkpoint_ns, checkpoint_id DESC",
+                params,
+            ).fetchall()
+        for row in rows:
+            if limit is not None and limit <= 0:
+                break
+            if filter:
+                metadata = self._load(row[6], row[7])
+                if not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+            if limit is not None:
+                limit -= 1
+            with self._lock:
+                yield self._tuple(self._connect(), row)
+
+    # --- writes --------------------------------------------------------------------------------
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = checkpoint["id"]
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+        blobs = [
+            (thread_id, checkpoint_ns, channel, str(version), *(self._dump(values[channel]) if channel in values else ("empty", None)))
+            for channel, version in new_versions.items()
+        ]
+        links = [(thread_id, checkpoint_ns, checkpoint_id, channel, str(version))
+                 for channel, version in checkpoint["channel_versions"].items()]
+        checkpoint_type, checkpoint_data = self._dump(stored)
+        metadata_type, metadata_data = self._dump(get_checkpoint_metadata(config, metadata))
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?)", blobs)
+                conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (thread_id, checkpoint_ns, checkpoint_id, config["configurable"].get("checkpoint_id"),
+                     checkpoint_type, checkpoint_data, metadata_type, metadata_data),
+                )
+                conn.executemany("INSERT OR REPLACE INTO checkpoint_blobs VALUES (?, ?, ?, ?, ?)", links)
+                conn.execute(
+                    "INSERT INTO threads (thread_id, updated_at) VALUES (?, ?)"
+                    " ON CONFLICT (thread_id) DO UPDATE SET updated_at = excluded.updated_at",
+                    (thread_id, time.time()),
+                )
+                self._prune(conn, thread_id, checkpoint_ns)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return {"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint_id": checkpoint_id}}
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = [
+            (thread_id, checkpoint_ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx), channel, *self._dump(value), task_path)
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        # Regular writes are idempotent per (task, idx); special channels (negative idx) overwrite
+        with self._lock:
+            conn = self._connect()
+            conn.executemany("INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", [row for row in rows if row[4] >= 0])
+            conn.executemany("INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", [row for row in rows if row[4] < 0])
+
+    # --- retention -----------------------------------------------------------------------------
+
+    def set_retention(self, thread_id: str, keep_last: Optional[int] = None, ttl_seconds: Optional[float] = None) -> None:
+        """Overrides keep_last and/or ttl_seconds for one thread (None keeps the saver default)."""
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO threads (thread_id, updated_at, keep_last, ttl_seconds) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (thread_id) DO UPDATE SET keep_last = excluded.keep_last, ttl_seconds = excluded.ttl_seconds",
+                (thread_id, time.time(), keep_last, ttl_seconds),
+            )
+
+    def _prune(self, conn: sqlite3.Connection, thread_id: str, checkpoint_ns: str) -> None:
+        row = conn.execute("SELECT keep_last FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+        keep_last = row[0] if row and row[0] is not None else self.keep_last
+        if keep_last is None:
+            return
+        stale = conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?"
+            " ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+            (thread_id, checkpoint_ns, keep_last),
+        ).fetchall()
+        if not stale:
+            return
+        for table in ("checkpoints", "checkpoint_blobs", "writes"):
+            conn.executemany(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                [(thread_id, checkpoint_ns, checkpoint_id) for (checkpoint_id,) in stale],
+            )
+        conn.execute(
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND NOT EXISTS ("
+            " SELECT 1 FROM checkpoint_blobs cb WHERE cb.thread_id = blobs.thread_id AND cb.checkpoint_ns = blobs.checkpoint_ns"
+            " AND cb.channel = blobs.channel AND cb.version = blobs.version)",
+            (thread_id, checkpoint_ns),
+        )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            for table in ("checkpoints", "checkpoint_blobs", "blobs", "writes", "threads"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            conn.execute("COMMIT")
+
+    def purge_expired(self) -> int:
+        """Deletes threads idle for longer than their ttl_seconds and returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            rows = self._connect().execute("SELECT thread_id, updated_at, ttl_seconds FROM threads").fetchall()
+        expired = [
+            thread_id for thread_id, updated_at, ttl in rows
+            if (ttl if ttl is not None else self.ttl_seconds) is not None
+            and updated_at + (ttl if ttl is not None else self.ttl_seconds) <= now
+        ]
+        for thread_id in expired:
+            self.delete_thread(thread_id)
+        return len(expired)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            conn = self._connect()
+            report = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                      for table in ("threads", "checkpoints", "blobs", "writes")}
+        report["file_bytes"] = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return report
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- async: SQLite calls run on the shared blocking pool -----------------------------------
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await run_blocking(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        tuples: List[CheckpointTuple] = await run_blocking(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await run_blocking(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        await run_blocking(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await run_blocking(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        # Same scheme as InMemorySaver: zero-padded counter (sortable as text) plus a random suffix
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
@@ -0,0 +1,30 @@
+import json
+from typing import Any
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from ..config.settings import CHARS_PER_TOKEN
+
+# Per-message framing (role, separators) that providers add on top of the content
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimates tokens from length; close enough for budgeting and much cheaper than a tokenizer call."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def content_text(content: Any) -> str:
+    """Flattens message content (a string or a list of content blocks) to text."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(block if isinstance(block, str) else str(block.get("text", block)) for block in content)
+    return str(content)
+
+
+def estimate_message_tokens(message: BaseMessage) -> int:
+    tokens = estimate_text_tokens(content_text(message.content)) + MESSAGE_OVERHEAD_TOKENS
+    if isinstance(message, AIMessage) and message.tool_calls:
+        tokens += estimate_text_tokens(json.dumps([call["args"] for call in message.tool_calls], default=str))
+    return tokens
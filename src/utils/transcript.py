@@ -0,0 +1,210 @@
+import gzip
+import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+_STOP = object()
+
+
+def transcript_name(thread_id: str) -> str:
+    """File-name-safe form of a thread id."""
+    return _SAFE_NAME.sub("_", str(thread_id)) or "default"
+
+
+class _OpenTranscript:
+    def __init__(self, path: str):
+        self.path = path
+        self.file: TextIO = open(path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+        self.started_at = _first_timestamp(path) if self.size else time.time()
+
+
+def _first_timestamp(path: str) -> float:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return float(json.loads(file.readline()).get("ts", time.time()))
+    except (OSError, ValueError, AttributeError):
+        return time.time()
+
+
+class TranscriptWriter:
+    """
+    Appends conversation records to one JSON Lines file per thread (<directory>/<thread>.jsonl).
+
+    record() only puts the record on a queue; a background thread serializes and writes them,
+    flushing every flush_interval seconds, so logging never blocks a turn. If the queue is full
+    (the disk cannot keep up) records are dropped and counted rather than making callers wait.
+
+    A thread's file is rotated to <thread>.<timestamp>.jsonl(.gz) once it exceeds max_bytes or
+    its first record is older than max_age_seconds. Rotated files are gzip-compressed if
+    `compress` is set, and only the newest backup_count of them are kept per thread. At most
+    max_open_files files are kept open; the least recently written one is closed first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024, max_age_seconds: Optional[float] = 24 * 60 * 60,
+                 backup_count: int = 5, compress: bool = True, flush_interval: float = 1.0,
+                 max_queue: int = 10000, max_open_files: int = 64):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.backup_count = backup_count
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.max_open_files = max_open_files
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._files: "OrderedDict[str, _OpenTranscript]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    os.makedirs(self.directory, exist_ok=True)
+                    self._thread = threading.Thread(target=self._run, name="transcript-writer", daemon=True)
+                    self._thread.start()
+
+    def record(self, thread_id: str, role: str, content: Any, **fields: Any) -> bool:
+        """Queues one record for a thread. Returns False if it was dropped because the queue is full."""
+        self._ensure_started()
+        entry = {"ts": time.time(), "thread_id": thread_id, "role": role, "content": content, **fields}
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Blocks until everything queued so far is written and flushed (for tests and shutdown)."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"written": self.written, "dropped": self.dropped, "queued": self._queue.qsize(), "open_files": len(self._files)}
+
+    # --- writer thread -------------------------------------------------------------------------
+
+    def _run(self) -> None:
+        dirty = set()
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(next_flush - time.monotonic(), 0))
+            except queue.Empty:
+                item = None
+            if item is _STOP or isinstance(item, threading.Event) or time.monotonic() >= next_flush:
+                for name in dirty:
+                    if name in self._files:
+                        self._files[name].file.flush()
+                dirty.clear()
+                next_flush = time.monotonic() + self.flush_interval
+            if item is _STOP:
+                for transcript in self._files.values():
+                    transcript.file.close()
+                self._files.clear()
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not None:
+                try:
+                    dirty.add(self._write(item))
+                except Exception as e:
+                    print(f"Error writing transcript for thread {item.get('thread_id')}: {e}")
+
+    def _write(self, entry: Dict[str, Any]) -> str:
+        name = transcript_name(entry["thread_id"])
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        size = len(line.encode("utf-8"))
+        transcript = self._open(name)
+        if transcript.size and self._due_for_rotation(transcript, size):
+            self._rotate(name)
+            transcript = self._open(name)
+        transcript.file.write(line)
+        transcript.size += size
+        self.written += 1
+        return name
+
+    def _open(self, name: str) -> _OpenTranscript:
+        transcript = self._files.get(name)
+        if transcript is None:
+            transcript = self._files[name] = _OpenTranscript(os.path.join(self.directory, f"{name}.jsonl"))
+            while len(self._files) > self.max_open_files:
+                self._files.popitem(last=False)[1].file.close()
+        self._files.move_to_end(name)
+        return transcript
+
+    def _due_for_rotation(self, transcript: _OpenTranscript, incoming: int) -> bool:
+        if transcript.size + incoming > self.max_bytes:
+            return True
+        return self.max_age_seconds is not None and time.time() - transcript.started_at > self.max_age_seconds
+
+    def _rotate(self, name: str) -> None:
+        transcript = self._files.pop(name)
+        transcript.file.close()
+        now = time.time()
+        rotated = os.path.join(self.directory, f"{name}.{time.strftime('%Y%m%d%H%M%S', time.localtime(now))}{int(now * 1e6) % 1_000_000:06d}.jsonl")
+        os.replace(transcript.path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as source, gzip.open(rotated + ".gz", "wb") as target:
+                target.writelines(source)
+            os.remove(rotated)
+        for stale in rotated_transcripts(self.directory, name)[:-self.backup_count or None]:
+            os.remove(stale)
+
+
+def rotated_transcripts(directory: str, thread_id: str) -> List[str]:
+    """Paths of a thread's rotated transcript files, oldest first."""
+    name = transcript_name(thread_id)
+    pattern = re.compile(rf"^{re.escape(name)}\.\d+\.jsonl(\.gz)?$")
+    try:
+        files = [f for f in os.listdir(directory) if pattern.match(f)]
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, f) for f in sorted(files)]
+
+
+def read_transcript(directory: str, thread_id: str) -> Iterator[Dict[str, Any]]:
+    """Yields a thread's records in order: the kept rotated files, then the current file."""
+    current = os.path.join(directory, f"{transcript_name(thread_id)}.jsonl")
+    for path in rotated_transcripts(directory, thread_id) + [current]:
+        opener = gzip.open if path.endswith(".gz") else open
+        try:
+            with opener(path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            continue
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.config.settings import TRANSCRIPT_DIR
+
+    parser = argparse.ArgumentParser(description="Replay a conversation transcript")
+    parser.add_argument("thread", help="Conversation id")
+    parser.add_argument("--dir", default=TRANSCRIPT_DIR)
+    args = parser.parse_args()
+    for entry in read_transcript(args.dir, args.thread):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["ts"]))
+        print(f"[{stamp}] {entry['role']}: {entry['content']}\n")
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class VisitedPlacesRegistry:
+    """
+    Tracks the places already suggested in each conversation so tools can avoid repeats.
+
+    Each session (keyed by the LangGraph thread_id) holds an insertion-ordered map of
+    place_id -> last-seen timestamp, giving O(1) membership checks. Memory is bounded by:
+      * max_places_per_session: oldest places in a session are evicted first (LRU).
+      * ttl_seconds: places not seen for this long are treated as unvisited and purged.
+      * max_sessions: least recently used sessions are dropped once the cap is reached.
+    All operations take a single lock, so the registry is safe to share between
+    concurrent tool calls.
+    """
+
+    def __init__(self, max_places_per_session: int = 500, max_sessions: int = 1000, ttl_seconds: Optional[float] = None):
+        self.max_places_per_session = max_places_per_session
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, OrderedDict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_expired(self, seen_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - seen_at > self.ttl_seconds
+
+    def _get_session(self, session_id: str, create: bool) -> Optional["OrderedDict[str, float]"]:
+        places = self._sessions.get(session_id)
+        if places is None:
+            if not create:
+                return None
+            places = self._sessions[session_id] = OrderedDict()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return places
+
+    def mark_if_new(self, session_id: str, place_id: str) -> bool:
+        """
+        Records place_id as visited in the session.
+        Returns:
+            bool: True if the place was not already visited (and is now recorded), False otherwise.
+        """
+        now = time.monotonic()
+        with self._lock:
+            places = self._get_session(session_id, create=True)
+            seen_at = places.get(place_id)
+            if seen_at is not None and not self._is_expired(seen_at, now):
+                return False
+            places[place_id] = now
+            places.move_to_end(place_id)
+            while len(places) > self.max_places_per_session:
+                places.popitem(last=False)
+            return True
+
+    def contains(self, session_id: str, place_id: str) -> bool:
+        with self._lock:
+            places = self._get_session(session_id, create=False)
+            if places is None or place_id not in places:
+                return False
+            return not self._is_expired(places[place_id], time.monotonic())
+
+    def session_places(self, session_id: str) -> List[str]:
+        """Returns the visited place_ids of a session, oldest first."""
+        now = time.monotonic()
+        with self._lock:
+            places = self._get_session(session_id, create=False) or {}
+            return [place_id for place_id, seen_at in places.items() if not self._is_expired(seen_at, now)]
+
+    def clear_session(self, session_id: str) -> None:
+        """Forgets everything recorded for a session, e.g. when a conversation ends."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def purge_expired(self) -> int:
+        """
+        Drops expired places and empty sessions. Intended to be called periodically by long-running servers.
+        Returns:
+            int: The number of place entries removed.
+        """
+        if self.ttl_seconds is None:
+            return 0
+        now = time.monotonic()
+        removed = 0
+        with self._lock:
+            for session_id in list(self._sessions):
+                places = self._sessions[session_id]
+                expired = [place_id for place_id, seen_at in places.items() if self._is_expired(seen_at, now)]
+                for place_id in expired:
+                    del places[place_id]
+                removed += len(expired)
+                if not places:
+                    del self._sessions[session_id]
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "places": sum(len(places) for places in self._sessions.values()),
+            }
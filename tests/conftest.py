@@ -0,0 +1,23 @@
+import pytest
+from src.config import clients
+from src.tools import maps_tools
+from src.utils.llm_cache import LLMCache
+from src.utils.response_cache import ResponseCache
+
+
+@pytest.fixture(autouse=True)
+def isolated_response_cache(tmp_path, monkeypatch):
+    """Points the Google Maps response cache at a throwaway database for every test."""
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    monkeypatch.setattr(maps_tools, "RESPONSE_CACHE", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_llm_cache(tmp_path, monkeypatch):
+    """Points the LLM answer cache at a throwaway database for every test."""
+    cache = LLMCache(ResponseCache(str(tmp_path / "llm_answers.sqlite3")))
+    monkeypatch.setattr(clients, "LLM_CACHE", cache)
+    yield cache
+    cache.store.close()
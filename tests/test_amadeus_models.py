@@ -0,0 +1,41 @@
+from src.models.amadeus_models import FlightOffer
+
+
+def _segment(segment_id, origin, destination, at):
+    return {
+        "departure": {"iataCode": origin, "at": at}, "arrival": {"iataCode": destination, "at": at},
+        "carrierCode": "JL", "number": segment_id, "duration": "PT2H", "id": segment_id,
+    }
+
+OFFER = {
+    "id": "7",
+    "itineraries": [{"duration": "PT9H", "segments": [
+        _segment("1", "DFW", "LAX", "2025-07-01T08:00:00"),
+        _segment("2", "LAX", "HND", "2025-07-02T13:00:00"),
+    ]}],
+    "price": {"currency": "USD", "grandTotal": "950.00"},
+    "travelerPricings": [{"travelerId": "1", "fareDetailsBySegment": [
+        # Out of segment order, and a duplicate id: the first entry must win, as with the old scan
+        {"segmentId": "2", "cabin": "BUSINESS", "includedCheckedBags": {"quantity": 2},
+         "amenities": [{"description": "MEAL", "isChargeable": False}]},
+        {"segmentId": "1", "cabin": "ECONOMY"},
+        {"segmentId": "2", "cabin": "FIRST"},
+    ]}],
+}
+
+
+def test_segments_info_uses_fare_details_index():
+    offer = FlightOffer.model_validate(OFFER)
+    info = offer.segments_info
+    assert [s["cabin"] for s in info] == ["ECONOMY", "BUSINESS"]
+    assert info[1]["includedCheckedBags"] == 2 and info[1]["includedCabinBags"] == 0
+    assert info[1]["amenities"] == [{"description": "MEAL", "isChargeable": False}]
+    assert (offer.origin, offer.destination, offer.departure_date, offer.arrival_date) == ("DFW", "HND", "2025-07-01", "2025-07-02")
+
+
+def test_derived_properties_are_cached_and_not_serialized():
+    offer = FlightOffer.model_validate(OFFER)
+    assert offer.segments_info is offer.segments_info
+    assert offer.travelerPricings[0].fare_details_by_segment_id is offer.travelerPricings[0].fare_details_by_segment_id
+    assert "segments_info" not in offer.model_dump()
+    assert offer == FlightOffer.model_validate(OFFER)
@@ -0,0 +1,132 @@
+from src.tools import amadeus_tools
+from src.utils import ttl_cache
+from src.utils.iata_index import IataIndex
+from src.utils.ttl_cache import TTLCache
+
+
+class FailingAmadeus:
+    """Any attribute access means a network call was attempted."""
+    def __getattr__(self, name):
+        raise AssertionError(f"unexpected Amadeus call: {name}")
+
+def test_bundled_codes_resolve_without_network(monkeypatch):
+    monkeypatch.setattr(amadeus_tools, "AMADEUS_CLIENT", FailingAmadeus())
+    assert amadeus_tools.get_airport_name.invoke({"iata_code": "dfw"}) == "Dallas/Fort Worth International Airport"
+    assert amadeus_tools.get_airline_names.invoke({"iata_codes": ["JL", "NH", "AA"]}) == {
+        "JL": "Japan Airlines", "NH": "All Nippon Airways", "AA": "American Airlines",
+    }
+
+def test_misses_fall_back_to_amadeus_once(monkeypatch):
+    calls = []
+    class Response:
+        data = [{"iataCode": "QQ", "businessName": "Test Air"}]
+    class Airlines:
+        def get(self, airlineCodes):
+            calls.append(airlineCodes)
+            return Response()
+    client = type("Amadeus", (), {"reference_data": type("Ref", (), {"airlines": Airlines()})()})()
+    monkeypatch.setattr(amadeus_tools, "AMADEUS_CLIENT", client)
+    monkeypatch.setattr(amadeus_tools, "AIRLINE_INDEX", IataIndex(code_length=2, path=amadeus_tools.IATA_AIRLINES_PATH))
+    monkeypatch.setattr(amadeus_tools, "IATA_NAME_CACHE", TTLCache(ttl=60))
+
+    assert amadeus_tools.get_airline_names.invoke({"iata_codes": ["QQ", "ZZ", "JL"]}) == {"QQ": "Test Air", "ZZ": "ZZ", "JL": "Japan Airlines"}
+    assert amadeus_tools.get_airline_name.invoke({"iata_code": "QQ"}) == "Test Air"
+    assert amadeus_tools.get_airline_name.invoke({"iata_code": "ZZ"}) == "ZZ"  # The miss is cached too
+    assert calls == ["QQ,ZZ"]
+
+def test_airport_fallbacks_and_misses_expire(monkeypatch):
+    from amadeus import ResponseError
+    now, calls, fail = [1000.0], [], [True]
+    class Response:
+        def __init__(self, keyword):
+            self.data = [{"name": "Test Airport"}] if keyword == "QQQ" else []
+    class Locations:
+        def get(self, keyword, subType):
+            calls.append(keyword)
+            if fail[0]:
+                raise ResponseError(type("Response", (), {"status_code": 500, "result": None, "data": None, "parsed": False})())
+            return Response(keyword)
+    client = type("Amadeus", (), {"reference_data": type("Ref", (), {"locations": Locations()})()})()
+    monkeypatch.setattr(amadeus_tools, "AMADEUS_CLIENT", client)
+    monkeypatch.setattr(amadeus_tools, "IATA_NAME_CACHE", TTLCache(ttl=60))
+    monkeypatch.setattr(ttl_cache.time, "time", lambda: now[0])
+
+    # A failed lookup is not cached
+    assert amadeus_tools.resolve_airport_names(["QQQ"]) == {"QQQ": "QQQ"}
+    fail[0] = False
+    assert amadeus_tools.resolve_airport_names(["QQQ", "ZZZ"]) == {"QQQ": "Test Airport", "ZZZ": "ZZZ"}
+    assert amadeus_tools.resolve_airport_names(["qqq", "zzz", "DFW"]) == {"QQQ": "Test Airport", "ZZZ": "ZZZ", "DFW": "Dallas/Fort Worth International Airport"}
+    assert calls == ["QQQ", "QQQ", "ZZZ"]
+
+    now[0] += 61
+    amadeus_tools.resolve_airport_names(["QQQ", "ZZZ"])
+    assert calls == ["QQQ", "QQQ", "ZZZ", "QQQ", "ZZZ"]
+
+def test_iata_index_slots_do_not_collide():
+    index = IataIndex(code_length=3)
+    index.add("A", "one letter")
+    index.add("AA", "two letters")
+    index.add("AAA", "three letters")
+    assert index.lookup_many(["A", "AA", "AAA", "AAB", "A-1"]) == {
+        "A": "one letter", "AA": "two letters", "AAA": "three letters", "AAB": None, "A-1": None,
+    }
+
+
+def _offer(offer_id):
+    segment = {
+        "departure": {"iataCode": "DFW", "at": "2025-07-01T08:00:00"},
+        "arrival": {"iataCode": "HND", "at": "2025-07-02T12:00:00"},
+        "carrierCode": "JL", "number": "11", "duration": "PT14H", "id": "1",
+    }
+    return {
+        "id": offer_id,
+        "itineraries": [{"duration": "PT14H", "segments": [segment]}],
+        "price": {"currency": "USD", "grandTotal": "1200.00"},
+        "travelerPricings": [{"travelerId": "1", "fareDetailsBySegment": [{"segmentId": "1", "cabin": "ECONOMY"}]}],
+    }
+
+def _flight_client(calls, delay=0.0):
+    import time
+    class Response:
+        data = [_offer("1"), _offer("2")]
+    class Search:
+        def get(self, **params):
+            calls.append(params)
+            time.sleep(delay)
+            return Response()
+    shopping = type("Shopping", (), {"flight_offers_search": Search()})()
+    return type("Amadeus", (), {"shopping": shopping})()
+
+def test_identical_flight_searches_share_one_request(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from src.utils.ttl_cache import TTLCache
+    calls = []
+    monkeypatch.setattr(amadeus_tools, "AMADEUS_CLIENT", _flight_client(calls, delay=0.1))
+    monkeypatch.setattr(amadeus_tools, "FLIGHT_CACHE", TTLCache(ttl=60))
+
+    args = {"origin": "DFW", "destination": "HND", "departure_date": "2025-07-01"}
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: amadeus_tools.get_flight_details.invoke(args), range(4)))
+    assert len(calls) == 1
+    assert all([offer.flight_id for offer in result] == ["1", "2"] for result in results)
+
+    # Same search spelled differently is a cache hit and returns the raw payload
+    raw = amadeus_tools.search_flight_offers("dfw", "hnd", "2025-07-01", travel_class="economy")
+    assert [offer["id"] for offer in raw] == ["1", "2"]
+    assert len(calls) == 1
+
+    amadeus_tools.get_flight_details.invoke({**args, "travel_class": "BUSINESS"})
+    assert len(calls) == 2
+
+def test_failed_flight_search_is_not_cached(monkeypatch):
+    from amadeus import ResponseError
+    from src.utils.ttl_cache import TTLCache
+    class FailingSearch:
+        def get(self, **params):
+            raise ResponseError(type("Response", (), {"status_code": 500, "result": None, "data": None, "parsed": False})())
+    client = type("Amadeus", (), {"shopping": type("Shopping", (), {"flight_offers_search": FailingSearch()})()})()
+    monkeypatch.setattr(amadeus_tools, "AMADEUS_CLIENT", client)
+    monkeypatch.setattr(amadeus_tools, "FLIGHT_CACHE", TTLCache(ttl=60))
+
+    assert amadeus_tools.get_flight_details.invoke({"origin": "DFW", "destination": "HND", "departure_date": "2025-07-01"}) == []
+    assert len(amadeus_tools.FLIGHT_CACHE) == 0
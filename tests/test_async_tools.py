@@ -0,0 +1,44 @@
+import asyncio
+import threading
+from src.tools import maps_tools, util_tools
+from src.utils import http_transport
+from src.utils.visited_places import VisitedPlacesRegistry
+
+
+def test_offloaded_tool_runs_off_the_event_loop_and_keeps_config(monkeypatch):
+    threads = []
+    mock_places = {"results": [{"place_id": "1", "name": "Place 1", "geometry": {"location": {"lat": 1, "lng": 2}}}]}
+    def places_nearby(**kwargs):
+        threads.append(threading.current_thread().name)
+        return mock_places
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: type("GMAPS", (), {"places_nearby": staticmethod(places_nearby), "place": staticmethod(lambda place_id: {})})())
+    monkeypatch.setattr(maps_tools, "VISITED_PLACES", VisitedPlacesRegistry())
+
+    async def run():
+        args = {"lat": 1.0, "long": 2.0, "place_type": "museum"}
+        return await asyncio.gather(
+            maps_tools.get_nearby_places.ainvoke(args, {"configurable": {"thread_id": "a"}}),
+            maps_tools.get_nearby_places.ainvoke(args, {"configurable": {"thread_id": "b"}}),
+        )
+
+    first, second = asyncio.run(run())
+    assert len(first) == len(second) == 1
+    assert all(name.startswith("blocking-io") for name in threads)
+
+def test_llm_tool_async_variant_awaits_llm(monkeypatch):
+    async def ainvoke(prompt):
+        return "1.5"
+    monkeypatch.setattr(util_tools, "LLM", type("LLM", (), {"ainvoke": staticmethod(ainvoke)})())
+    result = asyncio.run(util_tools.calculate_average_time_spent_at_an_address.ainvoke({"address": "museum"}))
+    assert result == 1.5
+
+def test_async_client_is_pooled_per_event_loop():
+    async def clients():
+        client = http_transport.get_async_http_client()
+        same = http_transport.get_async_http_client()
+        await http_transport.aclose_async_http_client()
+        return client, same
+    first, same = asyncio.run(clients())
+    second, _ = asyncio.run(clients())
+    assert first is same
+    assert first is not second
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+import threading
+import time
+
+from src.config import clients
+
+
+def test_importing_the_app_does_not_import_client_sdks():
+    code = (
+        "import sys, src.main; "
+        "print(','.join(m for m in ('langchain_google_genai', 'langchain_openai', 'googlemaps') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_client_is_built_once_under_concurrent_first_use(monkeypatch):
+    calls = []
+
+    def create():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    monkeypatch.setattr(clients, "_clients", {})
+    monkeypatch.setattr(clients, "_create_llm", create)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(clients.get_llm())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_lazy_llm_delegates_to_the_built_model(monkeypatch):
+    model = type("Model", (), {"invoke": staticmethod(lambda prompt: f"echo {prompt}")})()
+    monkeypatch.setattr(clients, "_clients", {"llm": model})
+
+    assert clients.LLM.invoke("hi") == "echo hi"
+
+
+def test_missing_credentials_give_no_client(monkeypatch):
+    monkeypatch.setattr(clients, "_clients", {})
+    monkeypatch.setattr(clients, "AMADEUS_CLIENT_ID", None)
+
+    assert clients.get_amadeus_client() is None
@@ -0,0 +1,80 @@
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.agents.context_assembler import ContextAssembler, digest_text
+from src.agents.summarizer import SUMMARY_HEADER
+from src.tools import context_tools
+from src.utils.ttl_cache import TTLCache
+
+PLACES = json.dumps([
+    {"name": f"Museum {i}", "rating": 4.5, "place_id": f"p{i}", "place_details": {"reviews": ["great " * 50] * 5}}
+    for i in range(20)
+])
+
+
+def _assembler(monkeypatch, budget=10_000):
+    store = TTLCache(max_size=100, ttl=60)
+    monkeypatch.setattr(context_tools, "TOOL_OUTPUT_STORE", store)
+    return ContextAssembler(store, context_tools.store_tool_output, token_budget=budget, tool_output_max_tokens=500, digest_tokens=100)
+
+
+def _tool_exchange(call_id, content, name="get_nearby_places"):
+    return [
+        AIMessage(content="", tool_calls=[{"name": name, "args": {"lat": 1, "long": 2}, "id": call_id}]),
+        ToolMessage(content=content, tool_call_id=call_id, name=name),
+    ]
+
+
+def test_digest_keeps_list_shape_and_scalars():
+    digest = digest_text(PLACES, max_tokens=100)
+    assert digest.startswith("20 items:")
+    assert '"name": "Museum 0"' in digest and "reviews" not in digest
+    assert digest.rstrip().split("\n")[-1].startswith("... and")
+
+
+def test_large_tool_output_is_digested_and_refetchable(monkeypatch):
+    assembler = _assembler(monkeypatch)
+    messages = [SystemMessage(content="prompt"), HumanMessage(content="museums?"), *_tool_exchange("c1", PLACES)]
+    out = assembler.assemble(messages)
+    digested = out[-1]
+    assert digested.tool_call_id == "c1" and len(digested.content) < len(PLACES) / 5
+    handle = digested.artifact
+    assert f'fetch_tool_output(handle="{handle}")' in digested.content
+    assert messages[-1].content == PLACES  # state itself is untouched
+
+    page = context_tools.fetch_tool_output.invoke({"handle": handle})
+    assert PLACES.startswith(page.split("\n[...")[0])
+    offset = int(page.rsplit("next_offset=", 1)[1].rstrip("]"))
+    assert context_tools.fetch_tool_output.invoke({"handle": handle, "offset": offset}).startswith(PLACES[offset:offset + 50])
+    assert assembler.assemble(messages)[-1] is digested  # digested once per tool call
+
+
+def test_budget_drops_old_tool_exchanges_before_turns(monkeypatch):
+    assembler = _assembler(monkeypatch, budget=300)
+    medium = "x" * 800  # 200 tokens: below the digest threshold
+    messages = [
+        SystemMessage(content="prompt"),
+        HumanMessage(content="first question"),
+        *_tool_exchange("old", medium),
+        AIMessage(content="first answer"),
+        HumanMessage(content="second question"),
+        *_tool_exchange("new", medium),
+    ]
+    out = assembler.assemble(messages)
+    ids = [getattr(m, "tool_call_id", None) for m in out]
+    assert "old" not in ids and "new" in ids
+    assert [m.content for m in out if isinstance(m, (HumanMessage, SystemMessage))] == ["prompt", "first question", "second question"]
+    assert not any(isinstance(m, AIMessage) and m.tool_calls and m.tool_calls[0]["id"] == "old" for m in out)
+    assert assembler.last_report["dropped"] == 2
+
+
+def test_messages_are_kept_in_order_including_repeated_replies(monkeypatch):
+    assembler = _assembler(monkeypatch)
+    messages = [
+        SystemMessage(content="prompt"), SystemMessage(content=SUMMARY_HEADER + "earlier"),
+        HumanMessage(content="1"), *_tool_exchange("first", "2.0", name="add"), AIMessage(content="The answer is 2.0"),
+        HumanMessage(content="yes"), AIMessage(content="ok"),
+        HumanMessage(content="yes"),
+    ]
+    assert assembler.assemble(messages) == messages
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from src.agents.day_partitioner import available_hours, partition_days
+from src.models.place_models import ItineraryPlace
+from src.tools import itinerary_tools
+
+CITIES = {"Tokyo": (35.68, 139.76), "Kyoto": (35.01, 135.77), "Osaka": (34.69, 135.50)}
+
+
+def city_places(counts, restaurants=0, visit_hours=2, seed=1):
+    rng = random.Random(seed)
+    places = []
+    for city, count in counts.items():
+        lat, lng = CITIES[city]
+        places += [ItineraryPlace(name=f"{city} {i}", location=city, lat=lat + rng.gauss(0, 0.02), lng=lng + rng.gauss(0, 0.02),
+                                  visit_hours=visit_hours) for i in range(count)]
+        places += [ItineraryPlace(name=f"{city} R{i}", location=city, kind="restaurant", lat=lat + rng.gauss(0, 0.02),
+                                  lng=lng + rng.gauss(0, 0.02)) for i in range(restaurants)]
+    return places
+
+def cities_of(places, day):
+    return {places[i].location for i in day["places"]}
+
+
+def test_days_stay_within_one_city_and_capacity():
+    places = city_places({"Tokyo": 9, "Kyoto": 6, "Osaka": 3}, restaurants=2)
+
+    partition = partition_days(places, num_days=6, day_hours=6)
+
+    assert partition["unassigned"] == []
+    assert all(len(cities_of(places, day)) == 1 for day in partition["days"])
+    assert all(day["visit_hours"] <= 6 for day in partition["days"])
+    assert sorted(i for day in partition["days"] for i in day["places"]) == list(range(len(places)))
+    # Consecutive days: a city is visited in one go
+    order = [cities_of(places, day).pop() for day in partition["days"]]
+    assert sum(a != b for a, b in zip(order, order[1:])) == 2
+
+def test_places_beyond_capacity_are_left_out_rather_than_sent_across_the_country():
+    places = city_places({"Tokyo": 8, "Osaka": 2})
+
+    partition = partition_days(places, num_days=2, day_hours=6)
+
+    assert all(len(cities_of(places, day)) == 1 for day in partition["days"])
+    # 6 of the 10 places fit at most
+    assert 4 <= len(partition["unassigned"]) <= 5
+
+def test_restaurants_are_spread_evenly_and_places_without_coordinates_reported():
+    places = city_places({"Tokyo": 4}, restaurants=5)
+    places.append(ItineraryPlace(name="Somewhere", location="somewhere"))
+
+    partition = partition_days(places, num_days=2, day_hours=[4, 4])
+
+    per_day = [sum(places[i].kind == "restaurant" for i in day["places"]) for day in partition["days"]]
+    assert sorted(per_day) == [2, 3]
+    assert partition["unassigned"] == [len(places) - 1]
+
+def test_partition_is_deterministic():
+    places = city_places({"Tokyo": 12, "Kyoto": 5}, restaurants=3)
+    assert partition_days(places, 5) == partition_days(places, 5)
+
+def test_day_hours_must_cover_every_day():
+    with pytest.raises(ValueError):
+        partition_days(city_places({"Tokyo": 2}), num_days=3, day_hours=[4, 4])
+
+def test_available_hours_are_the_tour_slots():
+    assert available_hours() == 9
+    assert available_hours(fill=0.5) == 4.5
+
+
+def test_itinerary_is_planned_day_by_day_on_small_matrices(monkeypatch):
+    requested = []
+
+    def fake_matrix(locations, mode="driving"):
+        requested.append(list(locations))
+        return {"duration_seconds": [[0 if a == b else 600 for b in locations] for a in locations]}
+
+    monkeypatch.setattr(itinerary_tools, "travel_time_matrix", fake_matrix)
+    places = city_places({"Tokyo": 4, "Kyoto": 4}, restaurants=2, visit_hours=1.5)
+
+    plan = itinerary_tools.plan_itinerary.invoke({"places": [p.model_dump() for p in places], "num_days": 2,
+                                                  "start_date": "2026-05-01"})
+
+    assert len(requested) == 2 and all(len(set(locations)) == 1 for locations in requested)
+    assert [(day["day"], day["date"]) for day in plan["days"]] == [(1, "2026-05-01"), (2, "2026-05-02")]
+    assert plan["unscheduled"] == []
+
+def test_group_places_by_day_tool():
+    places = city_places({"Kyoto": 3, "Osaka": 3})
+
+    groups = itinerary_tools.group_places_by_day.invoke({"places": [p.model_dump() for p in places], "num_days": 2})
+
+    assert sorted(sorted(day["places"]) for day in groups["days"]) == [
+        ["Kyoto 0", "Kyoto 1", "Kyoto 2"], ["Osaka 0", "Osaka 1", "Osaka 2"]]
+    assert all(day["visit_hours"] == 6 for day in groups["days"])
+    assert abs(groups["days"][0]["center"]["lat"] - CITIES["Kyoto"][0]) < 0.1
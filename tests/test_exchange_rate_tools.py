@@ -0,0 +1,56 @@
+import time
+from src.tools import exchange_rate_tools
+from src.tools.exchange_rate_tools import RateTableCache
+
+
+def make_cache(monkeypatch, now, tables):
+    monkeypatch.setattr(exchange_rate_tools.time, "monotonic", lambda: now[0])
+    calls = []
+    def fetch():
+        calls.append(1)
+        return tables[min(len(calls), len(tables)) - 1]
+    return RateTableCache(fetch, ttl=60, stale_ttl=600), calls
+
+def test_cross_rates_come_from_one_table(monkeypatch):
+    cache, calls = make_cache(monkeypatch, [0.0], [{"USD": 1.0, "JPY": 150.0, "EUR": 0.9}])
+    assert cache.rate("USD", "JPY") == 150.0
+    assert round(cache.rate("eur", "jpy"), 4) == round(150.0 / 0.9, 4)
+    assert cache.rate("JPY", "USD") == 1 / 150.0
+    assert len(calls) == 1
+
+def test_stale_table_is_served_while_refreshing(monkeypatch):
+    now = [0.0]
+    cache, calls = make_cache(monkeypatch, now, [{"USD": 1.0, "JPY": 150.0}, {"USD": 1.0, "JPY": 155.0}])
+    cache.get_rates()
+    now[0] = 120.0
+    assert cache.rate("USD", "JPY") == 150.0
+    for _ in range(100):
+        if cache.get_rates()["JPY"] == 155.0:
+            break
+        time.sleep(0.01)
+    assert cache.rate("USD", "JPY") == 155.0
+    now[0] = 10_000.0
+    cache.get_rates()
+    assert len(calls) == 3
+
+def test_convert_currency_batch(monkeypatch):
+    cache = RateTableCache(lambda: {"USD": 1.0, "JPY": 150.0, "EUR": 0.9}, ttl=60, stale_ttl=600)
+    monkeypatch.setattr(exchange_rate_tools, "RATE_TABLE", cache)
+    result = exchange_rate_tools.convert_currency_batch.invoke({"conversions": [
+        {"amount": 100, "from_currency": "USD", "to_currency": "JPY"},
+        {"amount": 90, "from_currency": "EUR", "to_currency": "USD"},
+        {"amount": 1, "from_currency": "USD", "to_currency": "XXX"},
+    ]})
+    assert result[0]["converted_amount"] == 15000.0
+    assert result[1]["converted_amount"] == 100.0
+    assert "error" in result[2]
+
+def test_small_rates_keep_their_precision(monkeypatch):
+    cache = RateTableCache(lambda: {"USD": 1.0, "VND": 25_000.0, "BTC": 0.0000155}, ttl=60, stale_ttl=600)
+    monkeypatch.setattr(exchange_rate_tools, "RATE_TABLE", cache)
+    assert exchange_rate_tools.get_exchange_rate.invoke({"base_currency": "VND", "target_currency": "BTC"}) == 0.0000155 / 25_000.0
+    result = exchange_rate_tools.convert_currency_batch.invoke({"conversions": [
+        {"amount": 1_000_000, "from_currency": "VND", "to_currency": "USD"},
+    ]})
+    assert result[0]["rate"] == 1 / 25_000.0
+    assert result[0]["converted_amount"] == 40.0
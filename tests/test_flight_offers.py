@@ -0,0 +1,78 @@
+import numpy as np
+
+from src.tools import amadeus_tools
+from src.utils.flight_offers import FlightOfferTable, parse_iso8601_duration
+from src.utils.ttl_cache import TTLCache
+
+
+def _offer(offer_id, price, duration, stops, departs="2025-07-01T08:00:00", carrier="JL"):
+    segments = [
+        {"departure": {"iataCode": "DFW", "at": departs}, "arrival": {"iataCode": "HND", "at": departs},
+         "carrierCode": carrier, "number": str(n), "duration": duration, "id": str(n)}
+        for n in range(stops + 1)
+    ]
+    return {
+        "id": offer_id,
+        "validatingAirlineCodes": [carrier],
+        "itineraries": [{"duration": duration, "segments": segments}],
+        "price": {"currency": "USD", "grandTotal": price},
+        "travelerPricings": [{"travelerId": "1", "fareDetailsBySegment": [{"segmentId": "0", "cabin": "ECONOMY"}]}],
+    }
+
+OFFERS = [
+    _offer("1", "900.00", "PT20H", 1),                      # cheapest
+    _offer("2", "1500.00", "PT13H", 0, carrier="AA"),       # fastest, non-stop
+    _offer("3", "1600.00", "PT21H", 2),                     # dominated by 1
+    _offer("4", "1100.00", "PT15H", 0, departs="2025-07-01T18:30:00", carrier="NH"),  # balanced
+    _offer("5", "1100.00", "PT16H", 0, carrier="NH"),       # dominated by 4
+]
+
+
+def test_iso8601_duration():
+    assert parse_iso8601_duration("PT14H35M") == 875
+    assert parse_iso8601_duration("P1DT2H") == 1560
+    assert parse_iso8601_duration("PT45M") == 45
+    assert parse_iso8601_duration("bogus") == 0
+
+
+def test_columns_filter_and_sort():
+    table = FlightOfferTable.from_offers(OFFERS)
+    assert table["price"].dtype == np.float64
+    assert list(table["stops"]) == [1, 0, 2, 0, 0]
+    assert list(table.filter(max_stops=0, max_price=1200)["flight_id"]) == ["4", "5"]
+    assert list(table.filter(carriers=["nh"], depart_after="12:00")["flight_id"]) == ["4"]
+    assert list(table.sort_by("duration_minutes")["flight_id"]) == ["2", "4", "5", "1", "3"]
+
+
+def test_pareto_front_and_top_k():
+    table = FlightOfferTable.from_offers(OFFERS)
+    assert sorted(table.pareto_front()["flight_id"]) == ["1", "2", "4"]
+    top = table.top_k(2)
+    assert list(top["flight_id"]) == ["4", "2"]
+    assert top.offer("2")["price"]["grandTotal"] == "1500.00"
+    assert top.offer("1") is None
+    assert top.to_records()[0] == {
+        "flight_id": "4", "price": 1100.0, "currency": "USD", "duration_minutes": 900,
+        "stops": 0, "departure": "2025-07-01T18:30", "carrier": "NH",
+    }
+
+
+def test_best_flights_tools_share_cached_search(monkeypatch):
+    calls = []
+    class Response:
+        data = OFFERS
+    class Search:
+        def get(self, **params):
+            calls.append(params)
+            return Response()
+    client = type("Amadeus", (), {"shopping": type("Shopping", (), {"flight_offers_search": Search()})()})()
+    monkeypatch.setattr(amadeus_tools, "AMADEUS_CLIENT", client)
+    monkeypatch.setattr(amadeus_tools, "FLIGHT_CACHE", TTLCache(ttl=60))
+
+    search = {"origin": "DFW", "destination": "HND", "departure_date": "2025-07-01"}
+    best = amadeus_tools.find_best_flights.invoke({**search, "max_price": 1200, "top_k": 1})
+    assert [offer["flight_id"] for offer in best] == ["4"]
+    detail = amadeus_tools.get_flight_offer_details.invoke({**search, "flight_id": "4"})
+    assert detail.flight_id == "4" and detail.grandTotal == "1100.00"
+    assert amadeus_tools.get_flight_offer_details.invoke({**search, "flight_id": "99"}) is None
+    assert len(calls) == 1
@@ -0,0 +1,150 @@
+import random
+import time
+
+from src.agents import itinerary_scheduler
+from src.agents.itinerary_scheduler import format_timetable, plan_days, to_minutes
+from src.agents.travel_agent import draft_itinerary
+from src.models.place_models import ItineraryPlace
+from src.tools import itinerary_tools
+
+
+def line_matrix(positions, seconds_per_unit=60):
+    """Places on a line: travel time is proportional to their distance."""
+    return [[abs(a - b) * seconds_per_unit for b in positions] for a in positions]
+
+def stops(day, kind=None):
+    return [stop for slot in day["slots"] for stop in slot["stops"] if kind is None or stop["kind"] == kind]
+
+def assert_feasible(plan, places):
+    by_name = {place.name: place for place in places}
+    for day in plan["days"]:
+        for slot in day["slots"]:
+            for stop in slot["stops"]:
+                place = by_name[stop["name"]]
+                assert to_minutes(slot["start"]) <= to_minutes(stop["start"]) <= to_minutes(stop["end"]) <= to_minutes(slot["end"])
+                assert to_minutes(stop["arrive"]) <= to_minutes(stop["start"])
+                if place.opens:
+                    assert to_minutes(stop["start"]) >= to_minutes(place.opens)
+                if place.closes:
+                    assert to_minutes(stop["end"]) <= to_minutes(place.closes)
+        times = [(to_minutes(s["start"]), to_minutes(s["end"])) for s in stops(day)]
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(times, times[1:]))
+
+
+def test_day_follows_the_timetable_and_keeps_travel_short():
+    # Attractions given out of order along a line; the plan should walk the line
+    positions = [5, 1, 4, 2, 3]
+    places = [ItineraryPlace(name=f"A{p}", location=f"Place {p}", visit_hours=1.5) for p in positions]
+    places += [ItineraryPlace(name="Lunch", location="Place 3", kind="restaurant"),
+               ItineraryPlace(name="Dinner", location="Place 5", kind="restaurant")]
+
+    plan = plan_days(places, line_matrix(positions + [3, 5], seconds_per_unit=600), num_days=1)
+
+    day = plan["days"][0]
+    names = [stop["name"] for stop in stops(day, "attraction")]
+    assert names in (["A1", "A2", "A3", "A4", "A5"], ["A5", "A4", "A3", "A2", "A1"])
+    assert plan["unscheduled"] == []
+    assert {stop["name"] for stop in stops(day, "restaurant")} == {"Lunch", "Dinner"}
+    assert [slot["slot_name"] for slot in day["slots"]][2] == "Morning Tour"
+    assert_feasible(plan, places)
+
+def test_opening_hours_are_respected():
+    places = [
+        ItineraryPlace(name="Night Market", location="a", opens="18:00", closes="22:00", visit_hours=1.5),
+        ItineraryPlace(name="Temple", location="b", opens="09:00", closes="12:00", visit_hours=2),
+        ItineraryPlace(name="Museum", location="c", opens="10:00", closes="19:00", visit_hours=3),
+    ]
+
+    plan = plan_days(places, line_matrix([0, 1, 2]), num_days=1)
+
+    names = [stop["name"] for stop in stops(plan["days"][0])]
+    assert names == ["Temple", "Museum", "Night Market"]
+    assert_feasible(plan, places)
+
+def test_places_that_never_fit_are_reported():
+    places = [ItineraryPlace(name="Closed", location="a", opens="01:00", closes="02:00"),
+              ItineraryPlace(name="Long", location="b", visit_hours=6),
+              ItineraryPlace(name="Fine", location="c")]
+
+    plan = plan_days(places, line_matrix([0, 1, 2]), num_days=2)
+
+    assert sorted(plan["unscheduled"]) == ["Closed", "Long"]
+    assert [stop["name"] for day in plan["days"] for stop in stops(day)] == ["Fine"]
+
+def test_days_start_from_the_hotel_and_are_dated():
+    positions = [0, 2, 4, 6]
+    places = [ItineraryPlace(name=f"A{p}", location=f"Place {p}", visit_hours=3) for p in positions]
+
+    plan = plan_days(places, line_matrix([0] + positions), num_days=2, start_date="2026-05-01", has_start=True)
+
+    assert [(day["date"], day["weekday"]) for day in plan["days"]] == [("2026-05-01", "Friday"), ("2026-05-02", "Saturday")]
+    first = stops(plan["days"][0])
+    assert first[0]["name"] == "A0" and first[0]["travel_minutes"] == 0
+    assert sorted(stop["name"] for day in plan["days"] for stop in stops(day)) == ["A0", "A2", "A4", "A6"]
+    assert_feasible(plan, places)
+
+def test_restaurants_are_not_repeated_across_days():
+    places = [ItineraryPlace(name=f"A{i}", location=str(i)) for i in range(4)]
+    places += [ItineraryPlace(name=f"R{i}", location=str(i), kind="restaurant") for i in range(3)]
+
+    plan = plan_days(places, line_matrix(list(range(4)) + list(range(3))), num_days=2)
+
+    restaurants = [stop["name"] for day in plan["days"] for stop in stops(day, "restaurant")]
+    assert len(restaurants) == 3 and len(set(restaurants)) == 3
+
+def test_unknown_travel_times_are_assumed_long():
+    places = [ItineraryPlace(name=f"A{i}", location=str(i), visit_hours=1) for i in range(3)]
+    matrix = [[0, None, 60], [None, 0, 60], [60, 60, 0]]
+
+    plan = plan_days(places, matrix, num_days=1)
+
+    names = [stop["name"] for stop in stops(plan["days"][0])]
+    assert names[1] == "A2"  # A0 and A1 are only known to be near A2
+
+def test_large_trip_stays_within_the_time_budget():
+    rng = random.Random(7)
+    points = [(rng.random(), rng.random()) for _ in range(95)]
+    matrix = [[int(((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5 * 3600) for bx, by in points] for ax, ay in points]
+    places = [ItineraryPlace(name=f"A{i}", location=str(i), visit_hours=rng.choice([1, 1.5, 2])) for i in range(60)]
+    places += [ItineraryPlace(name=f"R{i}", location=str(60 + i), kind="restaurant") for i in range(35)]
+
+    started = time.perf_counter()
+    plan = plan_days(places, matrix, num_days=15, time_budget=0.3)
+
+    assert time.perf_counter() - started < 2
+    assert len(plan["days"]) == 15
+    assert_feasible(plan, places)
+
+def test_timetable_is_rendered_for_the_prompt():
+    lines = format_timetable().split("\n")
+    assert len(lines) == len(itinerary_scheduler.DAILY_TIMETABLE)
+    assert lines[2] == '{"time": "9:00 AM - 1:00 PM", "slot_name": "Morning Tour", "duration_hours": 4}'
+    assert lines[-1] == '{"time": "11:00 PM", "slot_name": "Sleep", "duration_hours": 0}'
+
+
+def test_agent_node_drafts_the_itinerary_from_the_state(monkeypatch):
+    requested = []
+
+    def fake_matrix(locations, mode="driving"):
+        requested.append((list(locations), mode))
+        return {"duration_seconds": [[0 if a == b else 600 for b in locations] for a in locations]}
+
+    monkeypatch.setattr(itinerary_tools, "travel_time_matrix", fake_matrix)
+    state = {
+        "start_date": "2026-05-01",
+        "end_date": "2026-05-02",
+        "selected_hotel": {"name": "Hotel", "address": "1 Hotel St, Tokyo, Japan"},
+        "attractions": [{"name": "Museum", "latitude": 35.7, "longitude": 139.7, "place_id": "m",
+                         "place_details": {"address": "Museum Rd, Tokyo, Japan"}}],
+        "activities": [{"name": "Park", "latitude": 35.6, "longitude": 139.8, "place_id": "p"}],
+        "restaurants": [{"name": "Sushi", "latitude": 35.7, "longitude": 139.7, "place_id": "s"}],
+    }
+
+    draft = draft_itinerary(state)["itinerary_draft"]
+
+    # One matrix per day, each from the hotel
+    assert all(locations[0] == "1 Hotel St, Tokyo, Japan" and mode == "transit" for locations, mode in requested)
+    assert sorted(location for locations, _ in requested for location in locations[1:]) == [
+        "35.6,139.8", "35.7,139.7", "Museum Rd, Tokyo, Japan"]
+    assert len(draft) == 2
+    assert sorted(stop["name"] for day in draft for stop in stops(day)) == ["Museum", "Park", "Sushi"]
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+from langchain_core.messages import AIMessage
+
+from src.tools import maps_tools, util_tools
+from src.utils.llm_cache import LLMCache, model_id, response_text
+from src.utils.response_cache import ResponseCache
+
+
+class CountingLLM:
+    def __init__(self, answer, model="model-a"):
+        self.answer = answer
+        self.model = model
+        self.calls = []
+
+    def invoke(self, prompt):
+        self.calls.append(prompt)
+        return AIMessage(content=self.answer)
+
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
+
+def test_repeated_prompt_is_answered_from_the_cache(isolated_llm_cache, monkeypatch):
+    llm = CountingLLM("2.5")
+    monkeypatch.setattr(util_tools, "LLM", llm)
+
+    assert util_tools.calculate_average_time_spent_at_an_address.invoke({"address": "Louvre Museum"}) == 2.5
+    assert util_tools.calculate_average_time_spent_at_an_address.invoke({"address": "LOUVRE   museum"}) == 2.5
+    assert asyncio.run(util_tools.calculate_average_time_spent_at_an_address.ainvoke({"address": "Louvre Museum"})) == 2.5
+
+    assert len(llm.calls) == 1
+    stats = isolated_llm_cache.stats()["average_time"]
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+
+def test_answers_are_cached_per_model(isolated_llm_cache):
+    first, second = CountingLLM("1.0", model="model-a"), CountingLLM("2.0", model="model-b")
+    assert isolated_llm_cache.invoke("average_time", first, "prompt") == "1.0"
+    assert isolated_llm_cache.invoke("average_time", second, "prompt") == "2.0"
+    assert isolated_llm_cache.invoke("average_time", first, "prompt") == "1.0"
+    assert (len(first.calls), len(second.calls)) == (1, 1)
+
+def test_rejected_answers_are_not_cached(isolated_llm_cache, monkeypatch):
+    llm = CountingLLM("about two hours")
+    monkeypatch.setattr(util_tools, "LLM", llm)
+    assert util_tools.calculate_average_time_spent_at_an_address.invoke({"address": "museum"}) == 3.0
+    assert util_tools.calculate_average_time_spent_at_an_address.invoke({"address": "museum"}) == 3.0
+    assert len(llm.calls) == 2
+
+def test_expiry_and_size_bound(tmp_path, monkeypatch):
+    import src.utils.response_cache as response_cache
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = LLMCache(ResponseCache(str(tmp_path / "llm.sqlite3")), ttl=60, max_entries=2)
+    llm = CountingLLM("1.0")
+
+    for prompt in ("a", "b", "c"):
+        cache.invoke("average_time", llm, prompt)
+        now[0] += 1
+    assert cache.stats()["average_time"]["entries"] == 2
+    assert cache.stats()["average_time"]["evictions"] == 1
+    cache.invoke("average_time", llm, "a")  # Evicted, asked again
+    assert len(llm.calls) == 4
+
+    now[0] += 61
+    cache.invoke("average_time", llm, "c")  # Expired
+    assert len(llm.calls) == 5
+
+def test_llm_route_price_fallback_is_memoized(monkeypatch):
+    llm = CountingLLM('```json\n{"estimated_price": "18", "currency": "USD"}\n```')
+    monkeypatch.setattr(maps_tools, "LLM", llm)
+    args = {"origin": "A", "destination": "B", "directions": [], "total_duration": "20 mins", "total_distance": "5 mi"}
+
+    first = maps_tools.calculate_estimated_route_price.invoke(args)
+    second = maps_tools.calculate_estimated_route_price.invoke(args)
+    assert json.loads(first) == json.loads(second) == {"estimated_price": "18", "currency": "USD", "source": "llm"}
+    assert len(llm.calls) == 1
+
+def test_model_id_and_response_text():
+    assert model_id(CountingLLM("", model="gemini-2.5-flash")) == "gemini-2.5-flash"
+    assert model_id(object()) == "object"
+    assert response_text(AIMessage(content=[{"type": "text", "text": "2."}, "5"])) == "2.5"
+    assert response_text("3") == "3"
+
+def test_cache_hit_through_the_lazy_model_never_builds_it(isolated_llm_cache, monkeypatch):
+    from src.config import clients
+
+    def no_model():
+        raise AssertionError("get_llm() was called")
+
+    monkeypatch.setattr(clients, "get_llm", no_model)
+    assert model_id(clients.LLM) == clients.LLM_MODEL
+
+    isolated_llm_cache.store_answer("average_time", clients.LLM, "prompt", "2.5")
+    assert isolated_llm_cache.invoke("average_time", clients.LLM, "prompt") == "2.5"
+    assert asyncio.run(isolated_llm_cache.ainvoke("average_time", clients.LLM, "prompt")) == "2.5"
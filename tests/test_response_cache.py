@@ -0,0 +1,42 @@
+from src.tools import maps_tools
+from src.utils.response_cache import ResponseCache, make_cache_key
+
+
+def test_make_cache_key_normalizes_arguments():
+    assert make_cache_key(("  Tokyo   Tower ",)) == make_cache_key(("Tokyo Tower",))
+    assert make_cache_key(("Tokyo Tower",)) != make_cache_key(("tokyo tower",))
+    assert make_cache_key(("Tokyo Tower",), casefold=True) == make_cache_key(("tokyo tower",), casefold=True)
+    assert make_cache_key(kwargs={"a": 1, "b": 2}) == make_cache_key(kwargs={"b": 2, "a": 1})
+
+def test_get_or_set_hits_misses_and_expiry(tmp_path, monkeypatch):
+    import src.utils.response_cache as response_cache
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    calls = []
+    fetch = lambda: calls.append(1) or {"value": len(calls)}
+
+    assert cache.get_or_set("geocode", "k", fetch, ttl=60) == {"value": 1}
+    assert cache.get_or_set("geocode", "k", fetch, ttl=60) == {"value": 1}
+    now[0] += 61
+    assert cache.get_or_set("geocode", "k", fetch, ttl=60) == {"value": 2}
+    assert cache.get_or_set("geocode", "k", fetch, ttl=60, bypass=True) == {"value": 3}
+    assert cache.stats()["geocode"] == {"hits": 1, "misses": 2, "hit_rate": 1 / 3, "entries": 1}
+
+def test_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path)
+    cache.set("directions", "k", [{"legs": []}], ttl=60)
+    cache.close()
+    assert ResponseCache(path).get("directions", "k") == (True, [{"legs": []}])
+
+def test_geocode_tool_uses_cache(monkeypatch):
+    calls = []
+    def geocode(address):
+        calls.append(address)
+        return [{"geometry": {"location": {"lat": 35.68, "lng": 139.76}}, "formatted_address": "Tokyo, Japan"}]
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: type("GMAPS", (), {"geocode": staticmethod(geocode)})())
+    first = maps_tools.get_geocode_tool.invoke({"address": "Tokyo"})
+    second = maps_tools.get_geocode_tool.invoke({"address": "  tokyo "})
+    assert first == second == {"address": "Tokyo, Japan", "lat": 35.68, "lng": 139.76}
+    assert calls == ["Tokyo"]
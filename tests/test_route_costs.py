@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from src.config.settings import ROUTE_TARIFFS_PATH
+from src.tools import maps_tools
+from src.utils.route_costs import RouteCostModel, parse_distance_meters, parse_duration_seconds
+
+
+@pytest.fixture
+def costs():
+    return RouteCostModel(ROUTE_TARIFFS_PATH)
+
+def test_parse_distance_and_duration():
+    assert parse_distance_meters("12 km") == 12000
+    assert parse_distance_meters("1,200 m") == 1200
+    assert parse_distance_meters("5 mi") == pytest.approx(8046.72)
+    assert parse_distance_meters("n/a") is None
+    assert parse_duration_seconds("1 hour 20 mins") == 4800
+    assert parse_duration_seconds("2 days 3 hours") == 2 * 86400 + 3 * 3600
+    assert parse_duration_seconds("0 hours") == 0
+
+def test_region_is_taken_from_the_address(costs):
+    assert costs.region("4 Chome-2-8 Shibakoen, Minato City, Tokyo 105-0011, Japan") == "japan"
+    assert costs.region("Somewhere, Atlantis", "10 Downing St, London SW1A 2AA, UK") == "united kingdom"
+    assert costs.region("A") is None
+
+def test_taxi_transit_and_walking_tariffs(costs):
+    taxi = costs.estimate("driving", 10000, 1200, "japan")
+    assert taxi == {"estimated_price": 500 + 390 * 9 + 40 * 20, "currency": "JPY", "source": "tariff", "region": "japan", "mode": "driving"}
+    assert costs.estimate("driving", 800, 0, "jp")["estimated_price"] == 500  # Within the base fare
+    assert costs.estimate("driving", 100, 0, "default")["estimated_price"] == 5.0  # Minimum fare
+    assert costs.estimate("transit", 8000, 900, "japan", transit_rides=2)["estimated_price"] == 500
+    assert costs.estimate("walking", 800, 600, "france")["estimated_price"] == 0
+    assert costs.estimate("driving", 10000, 1200, "atlantis") is None
+    assert costs.estimate("driving", None, 1200, "japan") is None
+
+def test_walking_is_free_in_a_region_without_a_tariff(costs):
+    assert costs.estimate("walking", 800, 600, "atlantis") == {"estimated_price": 0, "currency": None, "source": "tariff", "region": None, "mode": "walking"}
+    assert costs.estimate("bicycling", None, None, None)["estimated_price"] == 0
+    assert costs.estimate("transit", 8000, 900, "atlantis") is None
+
+def test_google_fare_wins(costs):
+    estimate = costs.estimate("transit", 8000, 900, "japan", fare={"currency": "JPY", "value": 210, "text": "¥210"})
+    assert (estimate["estimated_price"], estimate["source"]) == (210, "google_fare")
+
+def test_tool_prices_locally_without_the_model(monkeypatch):
+    monkeypatch.setattr(maps_tools, "LLM", None)  # Any model call would fail
+    result = maps_tools.calculate_estimated_route_price.invoke({
+        "origin": "Tokyo Station, Tokyo, Japan",
+        "destination": "Tokyo Tower, 4 Chome-2-8 Shibakoen, Minato City, Tokyo 105-0011, Japan",
+        "directions": [
+            {"distance": "0.3 km", "duration": "4 mins", "instruction": "Walk to Otemachi", "travel_mode": "WALKING"},
+            {"distance": "4 km", "duration": "12 mins", "instruction": "Subway towards Meguro", "travel_mode": "TRANSIT"},
+        ],
+        "total_duration": "20 mins",
+        "total_distance": "4.5 km",
+    })
+    assert json.loads(result) == {"estimated_price": 250, "currency": "JPY", "source": "tariff", "region": "japan", "mode": "transit"}
+
+def test_get_directions_builds_a_route_with_fare(monkeypatch):
+    leg = {
+        "distance": {"text": "4.5 km", "value": 4500},
+        "duration": {"text": "20 mins", "value": 1200},
+        "start_address": "Tokyo Station, Japan",
+        "end_address": "Tokyo Tower, Japan",
+        "steps": [{"html_instructions": "Subway", "distance": {"text": "4 km"}, "duration": {"text": "12 mins"}, "travel_mode": "TRANSIT"}],
+    }
+    routes = [{"legs": [leg], "fare": {"currency": "JPY", "value": 210, "text": "¥210"}}]
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: type("GMAPS", (), {"directions": staticmethod(lambda *args, **kwargs: routes)})())
+
+    route = maps_tools.get_directions.invoke({"origin": "Tokyo Station", "destination": "Tokyo Tower", "mode": "transit"})
+    assert (route.total_distance, route.total_duration, route.travel_mode) == ("4.5 km", "20 mins", "transit")
+    assert route.fare["value"] == 210
@@ -0,0 +1,109 @@
+import threading
+import zlib
+
+import numpy as np
+import pytest
+
+from src.utils.llm_cache import LLMCache
+from src.utils.response_cache import ResponseCache
+from src.utils.semantic_cache import BatchingEmbedder, SemanticCache
+
+
+class BagOfWordsModel:
+    """Stands in for a sentence-transformers model: word order does not matter, shared words do."""
+
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True):
+        self.batches.append(list(texts))
+        vectors = np.zeros((len(texts), 64), dtype="float32")
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % 64] += 1
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+
+def test_concurrent_requests_are_embedded_in_one_batch():
+    model = BagOfWordsModel()
+    embedder = BatchingEmbedder("bag-of-words", batch_window=0.2, model=model)
+    start = threading.Barrier(4)
+    results = {}
+
+    def embed(text):
+        start.wait()
+        results[text] = embedder.embed([text])
+
+    threads = [threading.Thread(target=embed, args=(f"museum {i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(model.batches) == 1
+    assert sorted(model.batches[0]) == [f"museum {i}" for i in range(4)]
+    assert all(vectors.shape == (1, 64) for vectors in results.values())
+
+def test_embedding_errors_reach_the_caller():
+    class Broken:
+        def encode(self, texts, **kwargs):
+            raise RuntimeError("no model")
+
+    with pytest.raises(RuntimeError, match="no model"):
+        BatchingEmbedder("broken", model=Broken()).embed(["museum"])
+
+
+class CountingLLM:
+    model = "model-a"
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return self.answer
+
+
+def make_cache(directory, **kwargs):
+    pytest.importorskip("faiss")
+    return SemanticCache(str(directory), BatchingEmbedder("bag-of-words", batch_window=0, model=BagOfWordsModel()), **kwargs)
+
+def test_similar_questions_share_an_answer(tmp_path):
+    cache = make_cache(tmp_path, threshold=0.9)
+    cache.add("average_time", "model-a", "Tokyo National Museum", "2.5")
+
+    assert cache.lookup("average_time", "model-a", "National Museum Tokyo") == "2.5"
+    assert cache.lookup("average_time", "model-a", "Shibuya Crossing") is None
+    assert cache.lookup("average_time", "model-b", "Tokyo National Museum") is None  # Other model
+    assert cache.lookup("route_price", "model-a", "Tokyo National Museum") is None   # Other tool
+    assert cache.stats()["average_time"]["hits"] == 1
+
+def test_index_is_persisted(tmp_path):
+    make_cache(tmp_path).add_many("average_time", "model-a", ["Louvre Museum", "Eiffel Tower"], ["3.0", "2.0"])
+    reopened = make_cache(tmp_path)
+    assert reopened.lookup_many("average_time", "model-a", ["museum louvre", "tower eiffel"]) == ["3.0", "2.0"]
+
+def test_expiry_and_size_bound(tmp_path, monkeypatch):
+    import src.utils.semantic_cache as semantic_cache
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "time", lambda: now[0])
+    cache = make_cache(tmp_path, ttl=60, max_entries=2)
+
+    cache.add_many("average_time", "model-a", ["Louvre", "Orsay", "Pompidou"], ["3.0", "2.0", "1.5"])
+    assert cache.lookup("average_time", "model-a", "Louvre") is None
+    assert cache.lookup("average_time", "model-a", "Pompidou") == "1.5"
+    now[0] += 61
+    assert cache.lookup("average_time", "model-a", "Pompidou") is None
+    assert cache.stats()["average_time"]["entries"] == 0
+
+def test_llm_cache_asks_the_semantic_cache_before_the_model(tmp_path):
+    cache = LLMCache(ResponseCache(str(tmp_path / "llm.sqlite3")), semantic=make_cache(tmp_path / "semantic"))
+    llm = CountingLLM("2.5")
+
+    cache.invoke("average_time", llm, "How long at 'Tokyo National Museum'?", semantic_key="Tokyo National Museum")
+    answer = cache.invoke("average_time", llm, "How long at 'National Museum Tokyo'?", semantic_key="National Museum Tokyo")
+
+    assert answer == "2.5"
+    assert llm.calls == 1
+    assert cache.stats()["average_time"]["semantic"]["hits"] == 1
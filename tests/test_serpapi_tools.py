@@ -0,0 +1,29 @@
+import pytest
+from src.tools import maps_tools, serpapi_tools
+
+PROPERTIES = [
+    {"name": "Hotel A", "gps_coordinates": {"latitude": 35.68, "longitude": 139.76}, "overall_rating": 4.5, "address": "1 Chome, Tokyo"},
+    {"name": "Hotel B", "gps_coordinates": {"latitude": 35.69, "longitude": 139.70}, "overall_rating": 4.8},
+]
+
+
+@pytest.fixture
+def fake_serpapi(monkeypatch):
+    monkeypatch.setattr(serpapi_tools, "SERP_API_KEY", "test-key")
+    monkeypatch.setattr(serpapi_tools, "GoogleSearch", lambda params: type("Search", (), {"get_dict": lambda self: {"properties": PROPERTIES}})())
+
+def test_hotel_search_uses_serpapi_addresses_without_geocoding(fake_serpapi, monkeypatch):
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: pytest.fail("unexpected Google call"))
+    hotels = serpapi_tools.hotel_search_tool.invoke({"location": "Tokyo", "checkin": "2025-08-15", "checkout": "2025-08-20"})
+    assert [h["hotel_name"] for h in hotels] == ["Hotel B", "Hotel A"]
+    assert [h["address"] for h in hotels] == [None, "1 Chome, Tokyo"]
+
+def test_hotel_search_geocode_mode_resolves_addresses_in_batch(fake_serpapi, monkeypatch):
+    calls = []
+    def reverse_geocode(latlng):
+        calls.append(tuple(latlng))
+        return [{"formatted_address": f"addr {latlng[0]}"}]
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: type("GMAPS", (), {"reverse_geocode": staticmethod(reverse_geocode)})())
+    hotels = serpapi_tools.hotel_search_tool.invoke({"location": "Tokyo", "checkin": "2025-08-15", "address_source": "geocode"})
+    assert [h["address"] for h in hotels] == ["addr 35.69", "addr 35.68"]
+    assert sorted(calls) == [(35.68, 139.76), (35.69, 139.70)]
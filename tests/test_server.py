@@ -0,0 +1,201 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
+
+from src import main
+from src.main import build_agent
+from src.server import create_app
+from src.utils.transcript import TranscriptWriter, read_transcript
+
+
+class StubChatModel(BaseChatModel):
+    """Calls the add tool once per turn, then answers with its result."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        last_human = max(i for i, m in enumerate(messages) if isinstance(m, HumanMessage))
+        results = [m for m in messages[last_human:] if isinstance(m, ToolMessage)]
+        if results:
+            message = AIMessage(content=f"The answer is {results[-1].content}")
+        else:
+            number = float(messages[last_human].content)
+            message = AIMessage(content="", tool_calls=[{"id": f"call-{number}", "name": "add", "args": {"a": number, "b": 1}}])
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def parse_events(body: str):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def transcripts(tmp_path, monkeypatch):
+    writer = TranscriptWriter(str(tmp_path), flush_interval=0.01)
+    monkeypatch.setattr(main, "TRANSCRIPTS", writer)
+    yield writer
+    writer.close()
+
+
+@pytest.fixture
+def client(transcripts):
+    checkpointer = InMemorySaver()
+    app = create_app(agent=build_agent(llm=StubChatModel(), checkpointer=checkpointer), checkpointer=checkpointer, max_sessions=2)
+    with TestClient(app) as client:
+        yield client
+
+
+def start_session(client) -> str:
+    response = client.post("/sessions")
+    assert response.status_code == 201
+    return response.json()["session_id"]
+
+
+def send(client, session_id: str, content: str):
+    response = client.post(f"/sessions/{session_id}/messages", json={"content": content})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return parse_events(response.text)
+
+
+def test_turn_streams_tool_progress_then_reply(client):
+    session_id = start_session(client)
+
+    events = send(client, session_id, "41")
+    names = [name for name, _ in events]
+
+    assert names.index("tool_start") < names.index("tool_end") < names.index("done") == len(names) - 1
+    tool_start = dict(events)["tool_start"]
+    assert tool_start["name"] == "add" and tool_start["args"] == {"a": 41.0, "b": 1}
+    assert dict(events)["tool_end"]["status"] == "success"
+    assert dict(events)["done"]["reply"] == "The answer is 42.0"
+    assert "".join(data["text"] for name, data in events if name == "token") == "The answer is 42.0"
+    assert dict(events)["done"]["turn"] == 1
+
+
+def test_sessions_keep_separate_histories(client):
+    first, second = start_session(client), start_session(client)
+
+    send(client, first, "1")
+    send(client, second, "10")
+    send(client, first, "2")
+
+    first_state = client.get(f"/sessions/{first}").json()
+    second_state = client.get(f"/sessions/{second}").json()
+    assert first_state["turns"] == 2 and second_state["turns"] == 1
+    assert [m["content"] for m in first_state["messages"]] == ["1", "The answer is 2.0", "2", "The answer is 3.0"]
+    assert [m["content"] for m in second_state["messages"]] == ["10", "The answer is 11.0"]
+
+
+def test_unknown_and_deleted_sessions_return_404(client):
+    session_id = start_session(client)
+
+    assert client.delete(f"/sessions/{session_id}").status_code == 204
+    assert client.get(f"/sessions/{session_id}").status_code == 404
+    response = client.post(f"/sessions/{session_id}/messages", json={"content": "1"})
+    assert response.status_code == 404
+
+
+def test_least_recently_used_session_is_evicted(client):
+    oldest = start_session(client)
+    start_session(client)
+    start_session(client)
+
+    assert client.get(f"/sessions/{oldest}").status_code == 404
+    assert client.get("/health").json()["sessions"] == 2
+
+
+def test_turns_are_written_to_the_session_transcript(client, transcripts):
+    session_id = start_session(client)
+
+    send(client, session_id, "1")
+    transcripts.flush()
+
+    records = list(read_transcript(transcripts.directory, session_id))
+    assert [(r["role"], r["content"]) for r in records] == [("user", "1"), ("assistant", "The answer is 2.0")]
+    assert records[1]["tools"] == ["add"]
+
+
+class SilentAgent:
+    """An agent graph whose stream ends without producing an assistant message."""
+
+    async def astream(self, state, config, stream_mode=None):
+        yield "updates", {"tools": {"messages": []}}
+
+
+def test_turn_without_an_assistant_message_reports_an_error(transcripts):
+    checkpointer = InMemorySaver()
+    app = create_app(agent=SilentAgent(), checkpointer=checkpointer)
+    with TestClient(app) as client:
+        session_id = start_session(client)
+        events = send(client, session_id, "1")
+
+        assert events == [("error", {"detail": "The agent finished the turn without an assistant message."})]
+        assert client.get(f"/sessions/{session_id}").json()["turns"] == 0
+    transcripts.flush()
+    assert [r["role"] for r in read_transcript(transcripts.directory, session_id)] == ["user", "event"]
+
+
+def test_checkpointed_history_grows_by_one_exchange_per_turn(transcripts):
+    import asyncio
+
+    from langchain_core.messages import SystemMessage
+
+    inputs = []
+
+    class RecordingChatModel(StubChatModel):
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            inputs.append(messages)
+            return super()._generate(messages, stop, run_manager, **kwargs)
+
+    checkpointer = InMemorySaver()
+    agent = build_agent(llm=RecordingChatModel(), checkpointer=checkpointer)
+    config = {"configurable": {"thread_id": "linear"}}
+
+    async def converse():
+        messages, sizes = main.new_messages(), []
+        for turn in range(10):
+            async for event, payload in main.astream_turn(messages, str(turn), config, agent=agent):
+                if event == "done":
+                    messages = payload["messages"]
+            sizes.append(len((await checkpointer.aget_tuple(config)).checkpoint["channel_values"]["messages"]))
+        return sizes
+
+    # Human, AI tool call, tool result, reply
+    assert asyncio.run(converse()) == [4 * turn for turn in range(1, 11)]
+    last_input = inputs[-1]
+    assert sum(isinstance(m, SystemMessage) for m in last_input) == 1 and isinstance(last_input[0], SystemMessage)
+    assert [m.content for m in last_input if isinstance(m, HumanMessage)] == [str(turn) for turn in range(10)]
+
+
+def test_resumed_session_continues_its_checkpointed_history(transcripts):
+    checkpointer = InMemorySaver()
+    agent = build_agent(llm=StubChatModel(), checkpointer=checkpointer)
+    with TestClient(create_app(agent=agent, checkpointer=checkpointer)) as client:
+        session_id = start_session(client)
+        send(client, session_id, "1")
+    # A restarted server keeps only the checkpoints
+    with TestClient(create_app(agent=agent, checkpointer=checkpointer)) as client:
+        assert client.post("/sessions", json={"session_id": "never-seen"}).status_code == 404
+        assert client.post("/sessions", json={"session_id": session_id}).status_code == 201
+        session = client.get(f"/sessions/{session_id}").json()
+        assert session["turns"] == 1
+        assert session["messages"] == [{"role": "user", "content": "1"}, {"role": "assistant", "content": "The answer is 2.0"}]
+
+        send(client, session_id, "5")
+        session = client.get(f"/sessions/{session_id}").json()
+        assert session["turns"] == 2
+        assert [m["content"] for m in session["messages"]] == ["1", "The answer is 2.0", "5", "The answer is 6.0"]
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from src.utils.sqlite_checkpointer import SqliteCheckpointSaver
+
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+    turns: int
+
+
+def _graph(saver):
+    def reply(state):
+        return {"messages": [("ai", "x" * 2000 + str(len(state["messages"])))], "turns": state.get("turns", 0) + 1}
+    builder = StateGraph(State)
+    builder.add_node("reply", reply)
+    builder.add_edge(START, "reply")
+    builder.add_edge("reply", END)
+    return builder.compile(checkpointer=saver)
+
+
+def test_conversation_resumes_from_a_new_saver(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    config = {"configurable": {"thread_id": "trip-1"}}
+    saver = SqliteCheckpointSaver(path)
+    _graph(saver).invoke({"messages": [("user", "hi")]}, config)
+    saver.close()
+
+    # A fresh process would build a new saver on the same file
+    resumed = SqliteCheckpointSaver(path)
+    state = _graph(resumed).invoke({"messages": [("user", "again")]}, config)
+    assert state["turns"] == 2
+    assert [m.type for m in state["messages"]] == ["human", "ai", "human", "ai"]
+    assert resumed.get_tuple({"configurable": {"thread_id": "other"}}) is None
+
+
+def test_retention_compacts_old_checkpoints_and_blobs(tmp_path):
+    saver = SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite3"), keep_last=2, compress_min_bytes=256)
+    graph = _graph(saver)
+    config = {"configurable": {"thread_id": "trip-1"}}
+    for turn in range(5):
+        graph.invoke({"messages": [("user", f"turn {turn}")]}, config)
+
+    assert len(list(saver.list(config))) == 2
+    stats = saver.stats()
+    # Only blobs referenced by the two kept checkpoints remain
+    assert stats["blobs"] <= 2 * 4
+    assert graph.get_state(config).values["turns"] == 5
+    assert saver._connect().execute("SELECT COUNT(*) FROM blobs WHERE type LIKE 'zlib:%'").fetchone()[0] > 0
+
+    saver.set_retention("trip-2", keep_last=1)
+    graph.invoke({"messages": [("user", "a")]}, {"configurable": {"thread_id": "trip-2"}})
+    graph.invoke({"messages": [("user", "b")]}, {"configurable": {"thread_id": "trip-2"}})
+    assert len(list(saver.list({"configurable": {"thread_id": "trip-2"}}))) == 1
+
+
+def test_idle_threads_expire_and_async_api_works(tmp_path):
+    saver = SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite3"), ttl_seconds=3600)
+    graph = _graph(saver)
+
+    async def run():
+        await graph.ainvoke({"messages": [("user", "hi")]}, {"configurable": {"thread_id": "old"}})
+        await graph.ainvoke({"messages": [("user", "hi")]}, {"configurable": {"thread_id": "new"}})
+        return [t async for t in saver.alist({"configurable": {"thread_id": "old"}}, limit=1)]
+
+    assert len(asyncio.run(run())) == 1
+    saver._connect().execute("UPDATE threads SET updated_at = 0 WHERE thread_id = 'old'")
+    assert saver.purge_expired() == 1
+    assert saver.get_tuple({"configurable": {"thread_id": "old"}}) is None
+    assert saver.get_tuple({"configurable": {"thread_id": "new"}}) is not None
+
+
+def test_messages_channel_grows_linearly_over_app_turns(tmp_path, monkeypatch):
+    from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+    from langchain_core.messages import AIMessage
+
+    from src import main
+    from src.utils.transcript import TranscriptWriter
+
+    class Replies(FakeMessagesListChatModel):
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+    writer = TranscriptWriter(str(tmp_path / "transcripts"), flush_interval=0.01)
+    monkeypatch.setattr(main, "TRANSCRIPTS", writer)
+    # Uncompressed, so blob sizes are the serialized history
+    saver = SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite3"), keep_last=2, compress_min_bytes=10 ** 9)
+    agent = main.build_agent(llm=Replies(responses=[AIMessage(content="y" * 500)] * 12), checkpointer=saver)
+    config = {"configurable": {"thread_id": "trip-1"}}
+
+    async def converse():
+        messages, sizes = main.new_messages(), []
+        for turn in range(12):
+            async for event, payload in main.astream_turn(messages, "x" * 500, config, agent=agent):
+                if event == "done":
+                    messages = payload["messages"]
+            sizes.append(saver._connect().execute(
+                "SELECT length(data) FROM blobs WHERE thread_id = 'trip-1' AND channel = 'messages' ORDER BY version DESC LIMIT 1"
+            ).fetchone()[0])
+        return sizes
+
+    sizes = asyncio.run(converse())
+    writer.close()
+    growth = [after - before for before, after in zip(sizes, sizes[1:])]
+    # Every turn adds the same two messages, whatever came before
+    assert max(growth) - min(growth) < 0.1 * min(growth)
+    assert sizes[-1] < 13 * sizes[0]
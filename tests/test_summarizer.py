@@ -0,0 +1,122 @@
+import asyncio
+import threading
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.summarizer import RollingSummarizer, SUMMARY_HEADER, to_langchain_message
+
+
+class FakeLLM:
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+
+    def invoke(self, messages):
+        if self.gate is not None:
+            self.gate.wait()
+        self.calls.append(messages)
+        return AIMessage(content=f"summary {len(self.calls)}")
+
+    async def ainvoke(self, messages):
+        self.calls.append(messages)
+        return AIMessage(content=f"summary {len(self.calls)}")
+
+
+def _conversation(turns):
+    messages = [{"role": "system", "content": "planner prompt " * 100}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"question {i} " + "x" * 40})
+        messages.append({"role": "assistant", "content": f"answer {i} " + "y" * 40})
+    return messages
+
+
+def test_below_threshold_is_untouched():
+    llm = FakeLLM()
+    summarizer = RollingSummarizer(llm, token_threshold=1000, keep_recent_messages=2)
+    messages = _conversation(3)
+    assert summarizer.compact_in_background("t", messages) is None
+    assert summarizer.context("t", messages) == messages
+    assert llm.calls == []
+
+
+def test_only_new_messages_are_folded_into_the_summary():
+    llm = FakeLLM()
+    summarizer = RollingSummarizer(llm, token_threshold=50, keep_recent_messages=2)
+    messages = _conversation(3)
+    summarizer.compact_in_background("t", messages).result()
+
+    # System prompt is never summarized; the two newest messages stay verbatim
+    assert len(llm.calls[0]) == 4 + 1
+    assert isinstance(llm.calls[0][-1], HumanMessage) and "(nothing yet)" in llm.calls[0][-1].content
+    context = summarizer.context("t", messages)
+    assert context[0] == messages[0]
+    assert context[1] == {"role": "system", "content": SUMMARY_HEADER + "summary 1"}
+    assert context[2:] == messages[-2:]
+
+    messages += _conversation(2)[1:]
+    summarizer.compact_in_background("t", messages).result()
+    # Second pass sees the previous summary plus only the messages added since
+    assert len(llm.calls[1]) == 4 + 1
+    assert llm.calls[1][0].content.startswith("question 2")
+    assert "summary 1" in llm.calls[1][-1].content
+    assert summarizer.context("t", messages)[1]["content"].endswith("summary 2")
+
+
+def test_turns_do_not_wait_for_a_running_compaction():
+    gate = threading.Event()
+    summarizer = RollingSummarizer(FakeLLM(gate), token_threshold=50, keep_recent_messages=2)
+    messages = _conversation(3)
+    future = summarizer.compact_in_background("t", messages)
+    # Still compacting: the next turn gets the full history, and no second compaction starts
+    assert summarizer.context("t", messages) == messages
+    assert summarizer.compact_in_background("t", messages) is None
+    gate.set()
+    future.result()
+    assert summarizer.stats() == {"sessions": 1, "summarized_sessions": 1, "pending": 0}
+
+
+def test_async_compaction_and_sessions_are_independent():
+    llm = FakeLLM()
+    summarizer = RollingSummarizer(llm, token_threshold=50, keep_recent_messages=2)
+
+    async def run():
+        await summarizer.acompact_in_background("a", _conversation(3))
+
+    asyncio.run(run())
+    assert summarizer.summary("a") == "summary 1"
+    assert summarizer.summary("b") is None
+    assert summarizer.context("b", _conversation(3)) == _conversation(3)
+
+
+def test_resent_system_prompt_keeps_its_message_id():
+    prompt = {"role": "system", "content": "You are a planner."}
+
+    first, again = to_langchain_message(prompt), to_langchain_message(dict(prompt))
+
+    assert first.id == again.id
+    assert to_langchain_message({"role": "system", "content": "Other"}).id != first.id
+    assert to_langchain_message({"role": "user", "content": "hi"}).id is None
+
+
+def test_model_context_cuts_the_checkpointed_history_at_the_summary():
+    from langchain_core.messages import SystemMessage, ToolMessage
+
+    llm = FakeLLM()
+    summarizer = RollingSummarizer(llm, token_threshold=50, keep_recent_messages=2)
+    messages = _conversation(3)
+    prompt = messages[:1]
+    history = []
+    for i in range(3):
+        history += [HumanMessage(content=messages[1 + 2 * i]["content"]),
+                    AIMessage(content="", tool_calls=[{"id": f"call-{i}", "name": "add", "args": {}}]),
+                    ToolMessage(content="2", tool_call_id=f"call-{i}"),
+                    AIMessage(content=messages[2 + 2 * i]["content"])]
+
+    assert summarizer.model_context("t", prompt, history)[1:] == history
+    summarizer.compact_in_background("t", messages).result()
+
+    context = summarizer.model_context("t", prompt, history)
+    assert [type(m) for m in context[:2]] == [SystemMessage, SystemMessage]
+    assert context[1].content == SUMMARY_HEADER + "summary 1"
+    # The newest turn stays whole, tool exchange included
+    assert context[2:] == history[-4:]
@@ -0,0 +1,63 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from src.config import settings
+from src.tools import maps_tools
+from src.tools.registry import MANIFEST_PATH, TOOL_MODULES, build_manifest, load_tools, prune_tool_docs, select_tools
+
+
+def test_manifest_matches_the_tool_implementations():
+    with open(MANIFEST_PATH, encoding="utf-8") as file:
+        manifest = json.load(file)
+    # If this fails, regenerate the manifest: python -m src.tools.registry
+    assert manifest == json.loads(json.dumps(build_manifest()))
+
+
+def test_tool_modules_load_on_first_call():
+    code = (
+        "import sys; from src.tools.registry import load_tools; "
+        "tools = {t.name: t for t in load_tools()}; "
+        "before = 'src.tools.arithmetic_tools' in sys.modules or 'src.tools.amadeus_tools' in sys.modules; "
+        "result = tools['add'].invoke({'a': 1, 'b': 2}); "
+        "print(before, result, 'src.tools.arithmetic_tools' in sys.modules, 'src.tools.amadeus_tools' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split()[-4:] == ["False", "3.0", "True", "False"]
+
+
+def test_select_tools_by_name_and_group():
+    assert select_tools(["weather", "add"]) == ["get_weather_and_forecast", "add"]
+    assert select_tools(None, disabled=["amadeus", "serpapi"]) == [
+        name for name in TOOL_MODULES if TOOL_MODULES[name] not in ("src.tools.amadeus_tools", "src.tools.serpapi_tools")
+    ]
+    assert select_tools([" "]) == list(TOOL_MODULES)
+
+def test_select_tools_rejects_unknown_names():
+    with pytest.raises(ValueError, match="no_such_tool"):
+        select_tools(["no_such_tool"])
+    with pytest.raises(ValueError, match="wether"):
+        select_tools(["add"], disabled=["wether"])
+
+
+def test_lazy_tool_keeps_schema_and_runnable_config(monkeypatch):
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: type("GMAPS", (), {
+        "places_nearby": staticmethod(lambda **kwargs: {"results": [{"place_id": "p1", "name": "Museum", "geometry": {"location": {"lat": 1.0, "lng": 2.0}}}]}),
+        "place": staticmethod(lambda place_id: {"result": {"name": "Museum"}}),
+    })())
+    settings.VISITED_PLACES.clear_session("registry-test")
+    nearby = {t.name: t for t in load_tools(["maps"])}["get_nearby_places"]
+
+    assert nearby.args == maps_tools.get_nearby_places.args
+    places = nearby.invoke({"lat": 1.0, "long": 2.0}, config={"configurable": {"thread_id": "registry-test"}})
+
+    assert [p["place_id"] for p in places] == ["p1"]
+    assert settings.VISITED_PLACES.session_places("registry-test") == ["p1"]
+
+
+def test_prune_tool_docs_drops_lines_for_tools_not_offered():
+    prompt = "Tools:\n  * add(num1, num2): Adds.\n  * get_weather_and_forecast(lat, long): Weather.\n  * something_else(x): Kept."
+
+    assert prune_tool_docs(prompt, ["add"]) == "Tools:\n  * add(num1, num2): Adds.\n  * something_else(x): Kept."
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+from src.agents.tool_scheduler import ProviderLimitedToolNode
+
+_lock = threading.Lock()
+_in_flight = {"google": 0, "amadeus": 0}
+_peak = {"google": 0, "amadeus": 0}
+
+
+def _enter(provider):
+    with _lock:
+        _in_flight[provider] += 1
+        _peak[provider] = max(_peak[provider], _in_flight[provider])
+
+
+def _leave(provider):
+    with _lock:
+        _in_flight[provider] -= 1
+
+
+@tool
+def slow_google(query: str) -> str:
+    """Pretend Google call."""
+    _enter("google")
+    time.sleep(0.05)
+    _leave("google")
+    return f"google:{query}"
+
+
+@tool
+def slow_amadeus(query: str) -> str:
+    """Pretend Amadeus call."""
+    _enter("amadeus")
+    time.sleep(0.05)
+    _leave("amadeus")
+    return f"amadeus:{query}"
+
+
+@tool
+def local_math(x: int) -> int:
+    """Pure computation."""
+    return x * 2
+
+
+def _node():
+    for provider in _peak:
+        _peak[provider] = 0
+    return ProviderLimitedToolNode(
+        [slow_google, slow_amadeus, local_math],
+        provider_limits={"google": 3, "amadeus": 1},
+        tool_providers={"slow_google": "google", "slow_amadeus": "amadeus"},
+    )
+
+
+def _calls():
+    calls = [{"name": "slow_google", "args": {"query": str(i)}, "id": f"g{i}"} for i in range(6)]
+    calls += [{"name": "slow_amadeus", "args": {"query": str(i)}, "id": f"a{i}"} for i in range(3)]
+    calls.append({"name": "local_math", "args": {"x": 21}, "id": "m"})
+    return {"messages": [AIMessage(content="", tool_calls=calls)]}
+
+
+def _check(result, node):
+    messages = result["messages"]
+    assert [m.tool_call_id for m in messages] == [f"g{i}" for i in range(6)] + [f"a{i}" for i in range(3)] + ["m"]
+    assert messages[0].content == "google:0"
+    assert messages[-1].content == "42"
+    assert _peak["google"] <= 3 and _peak["amadeus"] == 1
+    timing = messages[-2].response_metadata["timing"]
+    assert timing["provider"] == "amadeus" and timing["duration_ms"] >= 40
+    assert messages[-1].response_metadata["timing"]["provider"] is None
+
+
+def test_sync_calls_run_concurrently_within_provider_limits():
+    node = _node()
+    start = time.perf_counter()
+    result = node.invoke(_calls(), config={"configurable": {}, "max_concurrency": 16})
+    elapsed = time.perf_counter() - start
+    _check(result, node)
+    # Serial execution would take ~0.45s; google needs 2 waves, amadeus 3
+    assert elapsed < 0.35
+
+
+def test_async_calls_respect_provider_limits():
+    node = _node()
+    result = asyncio.run(node.ainvoke(_calls()))
+    _check(result, node)
+    # At least two amadeus calls queued behind the single slot
+    assert max(m.response_metadata["timing"]["queued_ms"] for m in result["messages"][6:9]) >= 80
+
+
+def test_every_google_maps_tool_is_throttled():
+    from src.agents.tool_scheduler import TOOL_PROVIDERS
+    from src.config.settings import PROVIDER_CONCURRENCY_LIMITS
+
+    # Update together with TOOL_PROVIDERS when a tool starts or stops calling Google Maps.
+    # hotel_search_tool also resolves addresses but counts as serpapi, its main cost.
+    assert {name for name, provider in TOOL_PROVIDERS.items() if provider == "google"} == {
+        "get_nearby_places",
+        "get_directions",
+        "get_travel_time_matrix",
+        "get_place_details",
+        "get_geocode_tool",
+        "reverse_geocode_tool",
+        "reverse_geocode_batch",
+        "plan_itinerary",
+    }
+    assert "google" in PROVIDER_CONCURRENCY_LIMITS
+
+def test_every_registered_tool_has_a_provider():
+    from src.agents.tool_scheduler import TOOL_PROVIDERS
+    from src.tools.registry import TOOL_MODULES
+
+    assert sorted(set(TOOL_MODULES) - set(TOOL_PROVIDERS)) == []
+    assert "local" not in ProviderLimitedToolNode([slow_google]).provider_limits
@@ -1,6 +1,7 @@
 import pytest
 from src.tools import util_tools, maps_tools
 from src.models.travel_models import Route, Direction
+from src.utils.visited_places import VisitedPlacesRegistry
 
 # Mocking external dependencies for isolated unit tests
 
@@ -118,4 +119,75 @@ def test_estimate_hotel_cost(monkeypatch):
     monkeypatch.setattr(maps_tools, "estimate_hotel_cost", staticmethod(lambda hotel_name, checkin, checkout, num_adults: 2000))
     result = maps_tools.estimate_hotel_cost("Hotel Luxury", "2025-07-15", "2025-07-19", 2)
     assert isinstance(result, int) or isinstance(result, float)
-    assert result
\ No newline at end of file
+    assert result
+def test_get_nearby_places_returns_partial_rows_when_details_fail(monkeypatch):
+    mock_places = {
+        "results": [
+            {"place_id": "ok", "name": "Good Place", "geometry": {"location": {"lat": 1, "lng": 2}}, "rating": 4.0},
+            {"place_id": "boom", "name": "Bad Place", "geometry": {"location": {"lat": 1, "lng": 2}}, "rating": 3.0},
+        ]
+    }
+
+    def place(place_id):
+        if place_id == "boom":
+            raise RuntimeError("upstream error")
+        return {"result": {"name": "Good Place", "formatted_address": "1 Main St"}}
+
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: type("GMAPS", (), {"places_nearby": staticmethod(lambda **kwargs: mock_places), "place": staticmethod(place)})())
+    monkeypatch.setattr(maps_tools, "VISITED_PLACES", VisitedPlacesRegistry())
+    result = maps_tools.get_nearby_places.invoke({"lat": 1.0, "long": 2.0, "place_type": "museum"})
+    assert [p["place_id"] for p in result] == ["ok", "boom"]
+    assert result[0]["place_details"]["address"] == "1 Main St"
+    assert result[1]["place_details"] == {}
+
+def test_map_concurrently_times_out_slow_lookups(monkeypatch):
+    import time
+
+    def place(place_id):
+        if place_id == "slow":
+            time.sleep(0.5)
+        return {"result": {"name": place_id}}
+
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: type("GMAPS", (), {"place": staticmethod(place)})())
+    result = maps_tools.map_concurrently(maps_tools._fetch_place_details, {"fast": ("fast",), "slow": ("slow",)}, default={}, timeout=0.1)
+    assert result["fast"]["name"] == "fast"
+    assert result["slow"] == {}
+
+def test_map_concurrently_times_each_call_separately(monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    def lookup(place_id):
+        time.sleep(0.5 if place_id == "slow" else 0.05)
+        return place_id
+
+    # One worker is held by the slow call while the fast ones queue up on the other
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(maps_tools, "_GMAPS_EXECUTOR", executor)
+    calls = {"slow": ("slow",), **{f"fast{i}": (f"fast{i}",) for i in range(6)}}
+    result = maps_tools.map_concurrently(lookup, calls, default=None, timeout=0.15)
+    executor.shutdown(wait=False)
+    assert result["slow"] is None
+    assert all(result[f"fast{i}"] == f"fast{i}" for i in range(6))
+
+def test_get_nearby_places_dedupes_per_thread(monkeypatch):
+    mock_places = {
+        "results": [
+            {"place_id": "1", "name": "Place 1", "geometry": {"location": {"lat": 1, "lng": 2}}, "rating": 4.5}
+        ]
+    }
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: type("GMAPS", (), {"places_nearby": staticmethod(lambda **kwargs: mock_places), "place": staticmethod(lambda place_id: {})})())
+    monkeypatch.setattr(maps_tools, "VISITED_PLACES", VisitedPlacesRegistry())
+    args = {"lat": 1.0, "long": 2.0, "place_type": "museum"}
+    assert len(maps_tools.get_nearby_places.invoke(args, {"configurable": {"thread_id": "a"}})) == 1
+    assert maps_tools.get_nearby_places.invoke(args, {"configurable": {"thread_id": "a"}}) == []
+    assert len(maps_tools.get_nearby_places.invoke(args, {"configurable": {"thread_id": "b"}})) == 1
+
+def test_reverse_geocode_batch_keeps_order_and_partial_failures(monkeypatch):
+    def reverse_geocode(latlng):
+        if latlng[0] == 0:
+            raise RuntimeError("upstream error")
+        return [{"formatted_address": f"addr {latlng[0]}"}]
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: type("GMAPS", (), {"reverse_geocode": staticmethod(reverse_geocode)})())
+    result = maps_tools.reverse_geocode_batch.invoke({"coordinates": [{"lat": 2, "lng": 1}, {"lat": 0, "lng": 0}, {"lat": 1, "lng": 1}]})
+    assert [r["address"] for r in result] == ["addr 2.0", None, "addr 1.0"]
@@ -0,0 +1,56 @@
+import gzip
+import os
+import time
+
+from src.utils.transcript import TranscriptWriter, read_transcript, rotated_transcripts
+
+
+def test_records_are_written_per_thread_in_order(tmp_path):
+    writer = TranscriptWriter(str(tmp_path), flush_interval=60)
+    for i in range(3):
+        writer.record("a", "user", f"a{i}")
+        writer.record("b/../c", "user", f"b{i}")
+    writer.flush()
+
+    assert [r["content"] for r in read_transcript(str(tmp_path), "a")] == ["a0", "a1", "a2"]
+    assert [r["content"] for r in read_transcript(str(tmp_path), "b/../c")] == ["b0", "b1", "b2"]
+    assert sorted(os.listdir(tmp_path)) == ["a.jsonl", "b_.._c.jsonl"]
+    writer.close()
+
+
+def test_size_rotation_compresses_and_keeps_backup_count(tmp_path):
+    writer = TranscriptWriter(str(tmp_path), max_bytes=300, backup_count=2, compress=True)
+    for i in range(20):
+        writer.record("t", "user", f"message {i} " + "x" * 100)
+        writer.flush()
+    writer.close()
+
+    rotated = rotated_transcripts(str(tmp_path), "t")
+    assert len(rotated) == 2 and all(path.endswith(".jsonl.gz") for path in rotated)
+    with gzip.open(rotated[0], "rt", encoding="utf-8") as file:
+        assert file.readline()
+    contents = [r["content"] for r in read_transcript(str(tmp_path), "t")]
+    # Only the newest records survive, still in order
+    assert contents == sorted(contents, key=lambda c: int(c.split()[1])) and contents[-1].startswith("message 19 ")
+    assert os.path.getsize(tmp_path / "t.jsonl") <= 300
+
+
+def test_age_rotation(tmp_path):
+    writer = TranscriptWriter(str(tmp_path), max_age_seconds=0.05, compress=False)
+    writer.record("t", "user", "old")
+    writer.flush()
+    time.sleep(0.1)
+    writer.record("t", "user", "new")
+    writer.close()
+
+    assert len(rotated_transcripts(str(tmp_path), "t")) == 1
+    assert [r["content"] for r in read_transcript(str(tmp_path), "t")] == ["old", "new"]
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    writer = TranscriptWriter(str(tmp_path), max_queue=1)
+    writer._ensure_started = lambda: None  # Writer thread never drains the queue
+
+    assert writer.record("t", "user", "kept") is True
+    assert writer.record("t", "user", "dropped") is False
+    assert writer.stats()["dropped"] == 1
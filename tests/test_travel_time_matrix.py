@@ -0,0 +1,59 @@
+import numpy as np
+
+from src.tools import maps_tools
+
+
+class MatrixClient:
+    """Distance Matrix stand-in: every pair is |i - j| km apart at 2 minutes per km; 'Island' is unreachable."""
+
+    def __init__(self):
+        self.requests = []
+
+    def distance_matrix(self, origins, destinations, mode=None, units=None):
+        self.requests.append((list(origins), list(destinations), mode))
+
+        def element(origin, destination):
+            if "Island" in (origin, destination):
+                return {"status": "ZERO_RESULTS"}
+            km = abs(int(origin[-1]) - int(destination[-1]))
+            return {"status": "OK", "distance": {"value": km * 1000}, "duration": {"value": km * 120}}
+
+        return {"rows": [{"elements": [element(o, d) for d in destinations]} for o in origins]}
+
+
+def test_matrix_is_split_within_the_api_limits(monkeypatch):
+    client = MatrixClient()
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: client)
+    monkeypatch.setattr(maps_tools, "DISTANCE_MATRIX_MAX_ELEMENTS", 12)
+    places = [f"Place {i}" for i in range(6)]
+
+    matrix = maps_tools.travel_time_matrix(places, mode="walking")
+
+    assert all(len(o) * len(d) <= 12 for o, d, _ in client.requests)
+    assert len(client.requests) == 3
+    durations = np.array(matrix["duration_seconds"], dtype=float)
+    assert durations.shape == (6, 6)
+    assert durations[1, 4] == 360 and durations[2, 2] == 0
+    assert matrix["distance_meters"][0][5] == 5000
+
+def test_cells_are_cached_individually(monkeypatch):
+    client = MatrixClient()
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: client)
+    maps_tools.travel_time_matrix(["Place 1", "Place 2"], mode="driving")
+    client.requests.clear()
+
+    matrix = maps_tools.travel_time_matrix(["Place 1", "Place 2", "Place 3"], mode="driving")
+
+    # Only the pairs involving the new place are requested
+    assert sorted(client.requests) == [(["Place 1", "Place 2"], ["Place 3"], "driving"), (["Place 3"], ["Place 1", "Place 2"], "driving")]
+    assert matrix["duration_seconds"][0][2] == 240
+
+def test_tool_returns_one_matrix_per_mode_with_gaps(monkeypatch):
+    client = MatrixClient()
+    monkeypatch.setattr(maps_tools, "get_gmaps_client", lambda: client)
+
+    result = maps_tools.get_travel_time_matrix.invoke({"places": ["Place 1", "Island"], "destinations": ["Place 3"], "modes": ["walking", "transit"]})
+
+    assert set(result["modes"]) == {"walking", "transit"}
+    assert result["modes"]["walking"]["duration_seconds"] == [[240], [None]]
+    assert np.isnan(np.array(result["modes"]["transit"]["distance_meters"], dtype=float)[1, 0])
@@ -0,0 +1,39 @@
+from src.utils.visited_places import VisitedPlacesRegistry
+
+
+def test_mark_if_new_is_scoped_per_session():
+    registry = VisitedPlacesRegistry()
+    assert registry.mark_if_new("s1", "p1")
+    assert not registry.mark_if_new("s1", "p1")
+    assert registry.mark_if_new("s2", "p1")
+    assert registry.contains("s1", "p1")
+    assert not registry.contains("s3", "p1")
+
+def test_per_session_and_global_caps_evict_oldest():
+    registry = VisitedPlacesRegistry(max_places_per_session=2, max_sessions=2)
+    for place_id in ["p1", "p2", "p3"]:
+        registry.mark_if_new("s1", place_id)
+    assert registry.session_places("s1") == ["p2", "p3"]
+
+    registry.mark_if_new("s2", "p1")
+    registry.mark_if_new("s3", "p1")
+    assert registry.stats()["sessions"] == 2
+    assert registry.session_places("s1") == []
+
+def test_expired_places_are_new_again_and_purged(monkeypatch):
+    import src.utils.visited_places as visited_places
+    now = [1000.0]
+    monkeypatch.setattr(visited_places.time, "monotonic", lambda: now[0])
+    registry = VisitedPlacesRegistry(ttl_seconds=60)
+    registry.mark_if_new("s1", "p1")
+    now[0] += 61
+    assert not registry.contains("s1", "p1")
+    assert registry.purge_expired() == 1
+    assert registry.stats() == {"sessions": 0, "places": 0}
+    assert registry.mark_if_new("s1", "p1")
+
+def test_clear_session():
+    registry = VisitedPlacesRegistry()
+    registry.mark_if_new("s1", "p1")
+    registry.clear_session("s1")
+    assert registry.mark_if_new("s1", "p1")
@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from src.tools import weather_tools
+from src.utils.ttl_cache import TTLCache
+
+WEATHER_PAYLOAD = {"lat": 35.7, "lon": 139.7, "timezone": "Asia/Tokyo"}
+
+
+@pytest.fixture
+def fake_openweather(monkeypatch):
+    calls = []
+    def fake_get_json(url, params=None):
+        calls.append(params)
+        return WEATHER_PAYLOAD
+    async def fake_async_get_json(url, params=None):
+        return fake_get_json(url, params)
+    monkeypatch.setattr(weather_tools, "OPENWEATHER_BASEURL", "https://example.test/onecall")
+    monkeypatch.setattr(weather_tools, "get_json", fake_get_json)
+    monkeypatch.setattr(weather_tools, "async_get_json", fake_async_get_json)
+    monkeypatch.setattr(weather_tools, "WEATHER_CACHE", TTLCache())
+    return calls
+
+def test_nearby_coordinates_share_one_forecast(fake_openweather):
+    hotel = weather_tools.get_weather_and_forecast.invoke({"lat": 35.6812, "long": 139.7671, "metric": "METRIC"})
+    museum = weather_tools.get_weather_and_forecast.invoke({"lat": 35.7188, "long": 139.7765, "metric": "METRIC"})
+    assert hotel is museum
+    assert len(fake_openweather) == 1
+    assert fake_openweather[0]["lat"] == 35.7
+
+def test_units_are_part_of_the_key(fake_openweather):
+    weather_tools.get_weather_and_forecast.invoke({"lat": 35.68, "long": 139.76, "metric": "METRIC"})
+    weather_tools.get_weather_and_forecast.invoke({"lat": 35.68, "long": 139.76, "metric": "IMPERIAL"})
+    assert len(fake_openweather) == 2
+
+def test_mixed_case_units_are_sent_normalised(fake_openweather):
+    first = weather_tools.get_weather_and_forecast.invoke({"lat": 35.68, "long": 139.76, "metric": "Metric"})
+    second = weather_tools.get_weather_and_forecast.invoke({"lat": 35.68, "long": 139.76, "metric": "metric"})
+    asyncio.run(weather_tools.get_weather_and_forecast.ainvoke({"lat": 48.85, "long": 2.35, "metric": "IMPERIAL"}))
+    assert first is second
+    assert [call["units"] for call in fake_openweather] == ["metric", "imperial"]
+
+def test_entries_expire_at_next_update_boundary():
+    assert weather_tools.next_weather_update(1200.0) == 1800.0
+    assert weather_tools.next_weather_update(1799.0) == 1800.0
+
+def test_async_variant_shares_the_cache(fake_openweather):
+    first = asyncio.run(weather_tools.get_weather_and_forecast.ainvoke({"lat": 35.68, "long": 139.76, "metric": "METRIC"}))
+    second = weather_tools.get_weather_and_forecast.invoke({"lat": 35.68, "long": 139.76, "metric": "METRIC"})
+    assert first is second
+    assert len(fake_openweather) == 1